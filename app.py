@@ -3,6 +3,7 @@ import openai
 import sys
 import os
 import time
+from typing import Callable, Optional
 
 # Setup
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,6 +12,11 @@ sys.path.append(current_dir)
 try:
     from src.ski_expert import SkiExpert
     from src.working_voice_with_tts import WorkingVoiceWithTTS, handle_voice_message_data
+    from src.ui_components import render_catalog_explorer
+    from src.link_checker import start_link_monitor
+    from src.canned_responses import CANNED_RESPONSES, canned_prompts
+    from src.reply_stream import TokenStream
+    from data.ski_database import get_loaded_catalogs
     from config.settings import Config
 except ImportError as e:
     st.error(f"Setup Error: {e}")
@@ -23,6 +29,21 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def start_background_services():
+    """Start server-wide background work once, shared by every session"""
+    services = {}
+    if Config.LINK_CHECK_ENABLED:
+        services['link_monitor'] = start_link_monitor(get_loaded_catalogs)
+    
+    # Answer the example prompts (text and speech) up front so a first click is instant
+    api_key = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY")
+    if Config.CANNED_RESPONSE_WARMUP and api_key:
+        services['canned_warmup'] = CANNED_RESPONSES.warm_in_background(
+            canned_prompts(), SkiExpert, openai.OpenAI(api_key=api_key)
+        )
+    return services
+
 def initialize_session_state():
     """Initialize session state"""
     defaults = {
@@ -42,14 +63,24 @@ def initialize_session_state():
         if api_key:
             st.session_state.openai_client = openai.OpenAI(api_key=api_key)
 
-def handle_voice_input(user_speech: str) -> str:
-    """Handle voice input and return AI response"""
+def handle_voice_input(user_speech: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Handle voice input and return AI response, showing the reply as it streams in.
+    on_token (e.g. speech synthesis) receives the same tokens.
+    """
+    reply_area = st.empty()
+    reply_area.info("🧠 Processing your message...")
+    
+    stream = TokenStream(on_token)
+    stream.subscribe(lambda token: reply_area.success(f"🎿 **Ski Expert:** {stream.text}▌"))
     try:
         # Get AI response
         ai_response, recommendations = st.session_state.ski_expert.generate_response(
             user_speech,
-            st.session_state.openai_client
+            st.session_state.openai_client,
+            on_token=stream
         )
+        reply_area.success(f"🎿 **Ski Expert:** {ai_response}")
         
         # Store conversation
         st.session_state.conversation_history.append({
@@ -63,9 +94,12 @@ def handle_voice_input(user_speech: str) -> str:
         return ai_response
         
     except Exception as e:
-        return f"I apologize, there was an error: {str(e)}. Please try again."
+        ai_response = f"I apologize, there was an error: {str(e)}. Please try again."
+        reply_area.success(f"🎿 **Ski Expert:** {ai_response}")
+        return ai_response
 
 def main():
+    start_background_services()
     initialize_session_state()
     
     # Header
@@ -105,7 +139,13 @@ def main():
     if st.session_state.current_recommendations:
         st.markdown("## 🎿 Current Recommendations")
         for i, ski in enumerate(st.session_state.current_recommendations, 1):
-            st.write(f"**{i}. {ski['name']}** - {ski['price_range']}")
+            st.write(f"**{i}. {ski.name}** - {ski.price_range}")
+    
+    # Let users browse and narrow the catalog themselves
+    with st.expander("🔎 Browse the catalog"):
+        expert = st.session_state.ski_expert
+        region = expert.user_profile.get('region')
+        render_catalog_explorer(region if region != 'unknown' else None, expert.tenant)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+Benchmarks for the recommendation path on synthetic catalogs
+
+Measures catalog build and snapshot load time, memory, single-query latency
+percentiles and batch throughput at each catalog size, and writes the results
+as JSON so runs can be compared.
+
+Usage: python benchmarks/bench_recommendations.py --sizes 1000 100000 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.batch_recommend import batch_top_k
+from data.catalog_engine import SkiCatalog
+from data.catalog_snapshot import open_snapshot, write_snapshot
+from data.keyword_matcher import get_keyword_matcher
+from data.parsing import parse_budget
+from data.ranking import rank_skis
+from data.ski_database import RECOMMENDATION_CACHE, get_catalog_manager, get_ski_recommendations
+from data.synthetic_catalog import generate_profiles, generate_skis
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc isn't available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _timed(fn: Callable[[], Any]):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    """Percentiles of per-query latencies, in milliseconds"""
+    millis = np.array(samples) * 1000
+    return {
+        'count': len(samples),
+        'mean_ms': float(millis.mean()),
+        'p50_ms': float(np.percentile(millis, 50)),
+        'p90_ms': float(np.percentile(millis, 90)),
+        'p99_ms': float(np.percentile(millis, 99)),
+        'max_ms': float(millis.max()),
+    }
+
+
+def _measure_queries(run_query: Callable[[Dict[str, Any]], Any], profiles: List[Dict[str, Any]],
+                     before_each: Callable[[], None] = None) -> Dict[str, float]:
+    samples = []
+    for profile in profiles:
+        if before_each:
+            before_each()
+        _, elapsed = _timed(lambda: run_query(profile))
+        samples.append(elapsed)
+    return _latency_summary(samples)
+
+
+def bench_size(size: int, seed: int, queries: int, batch: int, workdir: str) -> Dict[str, Any]:
+    """Run every benchmark against one synthetic catalog size"""
+    result = {'size': size}
+    profiles = generate_profiles(queries, seed)
+
+    gc.collect()
+    rss_before = _rss_bytes()
+    skis, result['generate_s'] = _timed(lambda: generate_skis(size, seed))
+    catalog, result['build_s'] = _timed(lambda: SkiCatalog(skis))
+    gc.collect()
+    result['in_memory_rss_bytes'] = _rss_bytes() - rss_before
+
+    # Compiled snapshot: write once, then time the memory-mapped load the server does
+    snapshot_path = os.path.join(workdir, f"catalog-{size}.snap")
+    _, result['snapshot_write_s'] = _timed(lambda: write_snapshot(catalog, snapshot_path))
+    result['snapshot_bytes'] = os.path.getsize(snapshot_path)
+    mapped, result['snapshot_load_s'] = _timed(lambda: open_snapshot(snapshot_path))
+
+    # Engine only: canonical codes and parsed budgets, as the full path passes them
+    matcher = get_keyword_matcher()
+    canonical = [
+        {
+            'skill_level': matcher.match_field(profile['skill_level'], "skill"),
+            'terrain': matcher.match_field(profile['terrain_preference'], "terrain") or "all_mountain",
+            'budget': parse_budget(profile['budget']),
+        }
+        for profile in profiles
+    ]
+
+    def engine_query(target):
+        return lambda query: rank_skis(target, query['skill_level'], query['terrain'], query['budget'], k=3)
+
+    result['rank_latency'] = _measure_queries(engine_query(catalog), canonical)
+    result['rank_latency_snapshot'] = _measure_queries(engine_query(mapped), canonical)
+
+    # Full path: keyword normalization, budget parsing, ranking and the result cache
+    get_catalog_manager().publish(catalog)
+
+    def full_query(profile):
+        return get_ski_recommendations(
+            profile['skill_level'], profile['terrain_preference'], profile['budget'], profile['gender']
+        )
+
+    result['recommend_latency_cold'] = _measure_queries(full_query, profiles, RECOMMENDATION_CACHE.clear)
+    for profile in profiles:
+        full_query(profile)
+    result['recommend_latency_cached'] = _measure_queries(full_query, profiles)
+
+    batch_profiles = generate_profiles(batch, seed + 1)
+    _, elapsed = _timed(lambda: batch_top_k(catalog, batch_profiles, k=3))
+    result['batch'] = {
+        'profiles': batch,
+        'seconds': elapsed,
+        'profiles_per_s': batch / elapsed if elapsed else None,
+    }
+
+    del skis, catalog, mapped
+    os.unlink(snapshot_path)
+    return result
+
+
+def _print_summary(result: Dict[str, Any]):
+    print(
+        f"{result['size']:>9,} skis | build {result['build_s']:.2f}s"
+        f" | load {result['snapshot_load_s'] * 1000:.1f}ms"
+        f" | rss {result['in_memory_rss_bytes'] / 2**20:.0f}MB"
+        f" | p50/p99 {result['recommend_latency_cold']['p50_ms']:.2f}/"
+        f"{result['recommend_latency_cold']['p99_ms']:.2f}ms"
+        f" | batch {result['batch']['profiles_per_s']:,.0f}/s"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ski recommendation path")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="catalog sizes to test")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--queries", type=int, default=300, help="single queries timed per size")
+    parser.add_argument("--batch", type=int, default=1000, help="profiles in the batch throughput run")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    started = datetime.now()
+    output = args.output or os.path.join(RESULTS_DIR, f"recommendations-{started:%Y%m%d-%H%M%S}.json")
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            result = bench_size(size, args.seed, args.queries, args.batch, workdir)
+            _print_summary(result)
+            results.append(result)
+
+    report = {
+        'benchmark': "recommendations",
+        'started_at': started.isoformat(timespec="seconds"),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'parameters': {'seed': args.seed, 'queries': args.queries, 'batch': args.batch},
+        'results': results,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,15 @@ except:
 class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     MODEL_NAME = "gpt-4-turbo-preview"
+    # "single": one completion returns profile and reply; "two_call": analyze, then reply;
+    # "speculative": draft the reply while analyzing, keeping it if the profile is unchanged
+    TURN_MODE = os.getenv("SKI_TURN_MODE", "single")
+    # Plain turns are read by the local profile extractor; the model only analyzes uncertain ones
+    LOCAL_PROFILE_EXTRACTION = os.getenv("SKI_LOCAL_PROFILE_EXTRACTION", "true").lower() == "true"
+    PROFILE_CONFIDENCE_THRESHOLD = 0.75
+    # Pre-compute replies and speech for the interfaces' example prompts at server start
+    CANNED_RESPONSE_WARMUP = os.getenv("SKI_CANNED_RESPONSE_WARMUP", "true").lower() == "true"
+    CANNED_REWARM_DELAY = 30  # seconds the catalog must stay unchanged before canned replies are warmed again
     VOICE_MODEL = "whisper-1"
     TTS_MODEL = "tts-1"
     TTS_VOICE = "alloy"
@@ -21,4 +30,60 @@ class Config:
     # Audio settings
     AUDIO_SAMPLE_RATE = 16000
     AUDIO_CHANNELS = 1
-    MAX_RECORDING_DURATION = 60  # seconds
\ No newline at end of file
+    MAX_RECORDING_DURATION = 60  # seconds
+    
+    # Catalog settings - without a catalog file the built-in SKI_DATABASE is used
+    CATALOG_PATH = os.getenv("SKI_CATALOG_PATH")  # .json or .csv
+    CATALOG_SNAPSHOT_PATH = os.getenv("SKI_CATALOG_SNAPSHOT_PATH")  # defaults to <catalog>.snap
+    CATALOG_RELOAD_INTERVAL = float(os.getenv("SKI_CATALOG_RELOAD_INTERVAL", "5"))  # seconds, 0 disables
+    # Regional catalog shards: one catalog file per shard (e.g. us.json, eu.csv) in this directory
+    CATALOG_SHARD_DIR = os.getenv("SKI_CATALOG_SHARD_DIR")
+    CATALOG_SHARD_IDLE_SECONDS = 1800  # evict shards unused this long
+    DEFAULT_REGION = os.getenv("SKI_DEFAULT_REGION", "us")
+    # Shards each region reads from; regions not listed use the shard with their own name
+    REGION_SHARDS = {
+        "us": ["us"],
+        "canada": ["canada"],
+        "europe": ["europe"],
+    }
+    # Shop overlays (<tenant>.json: prices, exclusions, links) on the shared catalog
+    TENANT_DIR = os.getenv("SKI_TENANT_DIR")
+    TENANT_ID = os.getenv("SKI_TENANT")  # tenant served by this process; None uses the base catalog
+    RECOMMENDATION_CACHE_SIZE = int(os.getenv("SKI_RECOMMENDATION_CACHE_SIZE", "1024"))  # queries
+    
+    # Retailer link health checks
+    LINK_CHECK_ENABLED = os.getenv("SKI_LINK_CHECK_ENABLED", "true").lower() == "true"
+    LINK_CHECK_INTERVAL = 300  # seconds between sweeps
+    LINK_CHECK_TTL = 6 * 3600  # seconds a result stays valid
+    LINK_CHECK_MAX_CONNECTIONS = 20
+    LINK_CHECK_PER_HOST = 2
+    
+    # Free-text synonyms mapped to canonical terrain and skill codes.
+    # Longer phrases win over shorter ones ("double black" before "black").
+    TERRAIN_SYNONYMS = {
+        "all_mountain": ["all-mountain", "all mountain", "whole mountain", "everything", "mixed conditions",
+                         "versatile", "one ski quiver", "trees", "tree skiing", "glades"],
+        "powder": ["powder", "pow", "deep snow", "deep", "fresh snow", "freeride", "float", "storm days"],
+        "carving": ["carving", "carve", "carver", "groomed", "groomers", "groomer", "hardpack", "hard pack",
+                    "corduroy", "piste", "on-piste", "frontside", "icy", "ice", "race", "racing"],
+        "park": ["park", "terrain park", "freestyle", "jumps", "rails", "tricks", "halfpipe", "pipe", "twin tip"],
+        "backcountry": ["backcountry", "touring", "ski touring", "skinning", "uphill", "sidecountry",
+                        "off-piste", "slackcountry", "randonee", "skimo"],
+    }
+    SKILL_SYNONYMS = {
+        "beginner": ["beginner", "novice", "first time", "first timer", "new to skiing", "learning",
+                     "never skied", "green runs", "greens", "just started"],
+        "intermediate": ["intermediate", "blue runs", "blues", "progressing", "improving", "some experience",
+                         "comfortable on blues"],
+        "advanced": ["advanced", "black runs", "blacks", "black diamond", "black diamonds", "strong skier",
+                     "aggressive", "experienced"],
+        "expert": ["expert", "double black", "double blacks", "pro", "professional", "racer", "ripper",
+                   "very advanced"],
+    }
+    REGION_SYNONYMS = {
+        "us": ["usa", "united states", "america", "colorado", "utah", "vermont", "east coast", "west coast",
+               "tahoe", "montana", "wyoming", "jackson hole", "new england", "pacific northwest", "rockies"],
+        "canada": ["canadian", "british columbia", "bc", "whistler", "alberta", "banff", "quebec"],
+        "europe": ["european", "alps", "france", "switzerland", "austria", "italy", "chamonix",
+                   "zermatt", "st anton", "dolomites", "scandinavia", "norway"],
+    }
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Batch recommendations: score many saved profiles against the whole catalog at once
+"""
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from data.catalog_engine import GENDER_CODES, SKILL_CODES, TERRAIN_CODES, UNKNOWN_CODE, SkiCatalog
+from data.catalog_manager import RecommendationList
+from data.keyword_matcher import get_keyword_matcher
+from data.parsing import parse_budget, parse_gender
+from data.ranking import DEFAULT_WEIGHTS, RankingWeights, candidate_matrix, score_skis
+from data.ski_database import get_catalog_manager
+
+# Upper bound on profile x catalog cells held in memory per block (~16MB of float32)
+MAX_BLOCK_CELLS = 4_000_000
+
+
+def profile_arrays(profiles: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Normalize profile dicts (skill_level, terrain_preference, budget, gender,
+    target_length) into query columns, with NaN/unknown codes for missing values
+    """
+    matcher = get_keyword_matcher()
+    count = len(profiles)
+
+    arrays = {
+        'skill': np.full(count, UNKNOWN_CODE, dtype=np.float32),
+        'terrain': np.full(count, TERRAIN_CODES["all_mountain"], dtype=np.int8),
+        'budget_low': np.full(count, np.nan, dtype=np.float32),
+        'budget_high': np.full(count, np.nan, dtype=np.float32),
+        'target_length': np.full(count, np.nan, dtype=np.float32),
+        'gender': np.full(count, GENDER_CODES["unisex"], dtype=np.int8),
+    }
+
+    for i, profile in enumerate(profiles):
+        skill = matcher.match_field(str(profile.get('skill_level', '')), 'skill')
+        arrays['skill'][i] = SKILL_CODES.get(skill, UNKNOWN_CODE)
+
+        terrain = matcher.match_field(str(profile.get('terrain_preference', '')), 'terrain')
+        arrays['terrain'][i] = TERRAIN_CODES.get(terrain or "all_mountain")
+
+        budget = parse_budget(profile.get('budget'))
+        if budget:
+            arrays['budget_low'][i], arrays['budget_high'][i] = budget
+
+        if profile.get('target_length'):
+            arrays['target_length'][i] = float(profile['target_length'])
+
+        gender = parse_gender(profile.get('gender'))
+        if gender:
+            arrays['gender'][i] = GENDER_CODES[gender]
+
+    return arrays
+
+
+def _block_top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-row top k of a score block, ties broken by catalog order as in
+    ranking.top_k_scored. A partition finds each row's kth best score; every
+    cell above it is kept, and ties at it are filled in column order.
+    """
+    k = min(k, scores.shape[1])
+    kth_score = -np.partition(-scores, k - 1, axis=1)[:, k - 1:k]
+
+    above = scores > kth_score
+    at_kth = scores == kth_score
+    needed = k - above.sum(axis=1, keepdims=True)
+    chosen = above | (at_kth & (np.cumsum(at_kth, axis=1) <= needed))
+
+    # Exactly k cells per row are chosen; nonzero lists them row by row in column order
+    best = np.nonzero(chosen)[1].reshape(len(scores), k)
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.lexsort((best, -best_scores), axis=1)
+    return np.take_along_axis(best, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def batch_top_k(catalog: SkiCatalog, profiles: Sequence[Dict[str, Any]], k: int = 3,
+                block_size: Optional[int] = None,
+                weights: RankingWeights = DEFAULT_WEIGHTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every profile against the whole catalog, one block of profiles at a time.
+    Returns (rows, scores), both shaped (len(profiles), k); slots without a
+    candidate have row -1 and score -inf.
+    """
+    queries = profile_arrays(profiles)
+    count, catalog_size = len(profiles), len(catalog)
+
+    rows_out = np.full((count, k), -1, dtype=np.int64)
+    scores_out = np.full((count, k), -np.inf, dtype=np.float32)
+    if not count or not catalog_size or k <= 0:
+        return rows_out, scores_out
+
+    if block_size is None:
+        block_size = max(1, MAX_BLOCK_CELLS // catalog_size)
+
+    all_rows = np.arange(catalog_size)
+    for start in range(0, count, block_size):
+        block = slice(start, min(start + block_size, count))
+        query = {name: values[block, None] for name, values in queries.items()}
+
+        scores = score_skis(catalog, all_rows, weights=weights, **query).astype(np.float32)
+        candidates = candidate_matrix(
+            catalog, query['skill'], query['terrain'], query['budget_low'], query['budget_high']
+        )
+        scores[~candidates] = -np.inf
+
+        best_rows, best_scores = _block_top_k(scores, k)
+        best_rows[~np.isfinite(best_scores)] = -1
+
+        width = best_rows.shape[1]
+        rows_out[block, :width] = best_rows
+        scores_out[block, :width] = best_scores
+
+    return rows_out, scores_out
+
+
+def batch_recommend(profiles: Sequence[Dict[str, Any]], k: int = 3,
+                    block_size: Optional[int] = None) -> List[RecommendationList]:
+    """
+    Top k recommendations for each profile against the live catalog, in one
+    vectorized pass per block. Results are tagged with the catalog version.
+    """
+    published = get_catalog_manager().current()
+    catalog = published.catalog
+
+    rows, _ = batch_top_k(catalog, profiles, k=k, block_size=block_size)
+    return [
+        RecommendationList(catalog.rows_at(profile_rows[profile_rows >= 0]), catalog_version=published.version)
+        for profile_rows in rows
+    ]
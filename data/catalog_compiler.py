@@ -0,0 +1,286 @@
+"""
+Catalog compiler: validates and normalizes catalog sources into a pre-indexed snapshot
+
+Usage: python -m data.catalog_compiler catalog.json [catalog.snap] [--strict]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from data.catalog_engine import SKILL_CODES, TERRAIN_CODES, SkiCatalog
+from data.catalog_snapshot import write_snapshot
+from data.keyword_matcher import get_keyword_matcher
+from data.parsing import SPEC_UNITS, parse_range
+from data.ski_model import RetailerLink, SkiModel
+
+# Plausible (low, high) bounds for each spec in its canonical unit
+SPEC_LIMITS = {"length": (60, 230), "waist": (50, 160), "radius": (3, 50)}
+
+# Other units sources use for each spec, with the factor to the canonical unit
+_UNIT_FACTORS = {
+    "length": {"cm": 1.0, "in": 2.54, "inch": 2.54, "inches": 2.54, '"': 2.54, "mm": 0.1},
+    "waist": {"mm": 1.0, "cm": 10.0, "in": 25.4, '"': 25.4},
+    "radius": {"m": 1.0, "meters": 1.0, "metres": 1.0, "ft": 0.3048},
+}
+_UNIT_PATTERN = re.compile(r'(?<=\d)\s*(inches|inch|metres|meters|cm|mm|in|ft|m|")\s*$', re.IGNORECASE)
+_URL_PATTERN = re.compile(r"^https?://[^\s/]+\.[^\s]+$", re.IGNORECASE)
+
+
+class CatalogIssue(NamedTuple):
+    """A problem found in one source row. Errors drop the row; warnings keep it."""
+    row: int
+    name: str
+    field: str
+    message: str
+    severity: str = "error"
+
+    def __str__(self) -> str:
+        return f"row {self.row} ({self.name or 'unnamed'}) {self.field}: {self.message} [{self.severity}]"
+
+
+class CatalogValidationError(ValueError):
+    """Raised by a strict compile when any source row has errors"""
+
+    def __init__(self, issues: List[CatalogIssue]):
+        self.issues = issues
+        errors = [issue for issue in issues if issue.severity == "error"]
+        super().__init__(f"{len(errors)} catalog errors, first: {errors[0] if errors else 'none'}")
+
+
+def flatten_database(database: Dict[str, Dict[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """Flat source rows from a nested SKI_DATABASE-style dict"""
+    return [
+        dict(ski, terrain=terrain, skill_level=skill_level)
+        for terrain, levels in database.items()
+        for skill_level, entries in levels.items()
+        for ski in entries
+    ]
+
+
+def read_source_rows(path: str) -> List[Dict[str, Any]]:
+    """
+    Raw, unvalidated rows from a .json or .csv catalog file.
+    JSON may use the nested SKI_DATABASE layout or a flat list of rows.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return flatten_database(data) if isinstance(data, dict) else list(data)
+
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    raise ValueError(f"Unsupported catalog format: {path}")
+
+
+def source_fingerprint(path: str) -> tuple:
+    """(size, mtime_ns) of a source file, used to tell whether a snapshot is stale"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _clean_text(value) -> str:
+    """Strip and collapse runs of whitespace"""
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def _normalize_code(value, codes: Dict[str, int], field: str) -> Optional[str]:
+    """Canonical terrain/skill code from an exact code or any synonym"""
+    text = _clean_text(value).lower()
+    code = text.replace("-", "_").replace(" ", "_")
+    if code in codes:
+        return code
+    return get_keyword_matcher().match_field(text, field)
+
+
+def _format_number(value: float) -> str:
+    return "%g" % round(value, 1)
+
+
+def normalize_price(value) -> Optional[str]:
+    """Canonical "$400-500" / "$450" price text, or None if no price can be read"""
+    bounds = parse_range(value)
+    if not bounds or bounds[0] <= 0:
+        return None
+    low, high = (_format_number(bound) for bound in bounds)
+    return f"${low}" if low == high else f"${low}-{high}"
+
+
+def normalize_spec(field: str, value) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Canonical spec text in the field's unit ("150-180cm", "80mm", "16m"), converting
+    other units. Returns (text, None) or (None, reason).
+    """
+    text = _clean_text(value).lower()
+    bounds = parse_range(text)
+    if not bounds:
+        return None, f"no number in {value!r}"
+
+    unit = _UNIT_PATTERN.search(text)
+    factor = _UNIT_FACTORS[field].get(unit.group(1).lower() if unit else SPEC_UNITS[field])
+    if factor is None:
+        return None, f"unexpected unit in {value!r}"
+
+    low, high = bounds[0] * factor, bounds[1] * factor
+    min_allowed, max_allowed = SPEC_LIMITS[field]
+    if low < min_allowed or high > max_allowed:
+        return None, f"{value!r} is outside {min_allowed}-{max_allowed}{SPEC_UNITS[field]}"
+
+    low, high = _format_number(low), _format_number(high)
+    return (f"{low}{SPEC_UNITS[field]}" if low == high else f"{low}-{high}{SPEC_UNITS[field]}"), None
+
+
+def _source_retailers(row: Dict[str, Any]) -> Dict[str, str]:
+    retailers = row.get('retailers') or {}
+    if isinstance(retailers, str):
+        # CSV layout: "REI=https://...;Evo=https://..."
+        retailers = dict(item.split("=", 1) for item in retailers.split(";") if "=" in item)
+    return retailers if isinstance(retailers, dict) else {}
+
+
+def _source_specs(row: Dict[str, Any]) -> Dict[str, Any]:
+    specs = row.get('specs')
+    if specs is None:
+        specs = {field: row[field] for field in SPEC_UNITS if row.get(field)}
+    return specs if isinstance(specs, dict) else {}
+
+
+def compile_row(row: Dict[str, Any], index: int) -> Tuple[Optional[SkiModel], List[CatalogIssue]]:
+    """
+    Validate and normalize one source row. Returns the record (None when the
+    row has errors) and every issue found.
+    """
+    issues = []
+    name = _clean_text(row.get('name'))
+
+    def issue(field, message, severity="error"):
+        issues.append(CatalogIssue(index, name, field, message, severity))
+
+    if not name:
+        issue('name', "missing")
+
+    terrain = _normalize_code(row.get('terrain'), TERRAIN_CODES, 'terrain')
+    if not terrain:
+        issue('terrain', f"unknown terrain {row.get('terrain')!r}")
+
+    skill_level = _normalize_code(row.get('skill_level'), SKILL_CODES, 'skill')
+    if not skill_level:
+        issue('skill_level', f"unknown skill level {row.get('skill_level')!r}")
+
+    price_range = normalize_price(row.get('price_range'))
+    if not price_range:
+        issue('price_range', f"no price in {row.get('price_range')!r}")
+
+    spec_text = []
+    source_specs = _source_specs(row)
+    for field in SPEC_UNITS:
+        if not source_specs.get(field):
+            issue(f"specs.{field}", "missing", "warning")
+            continue
+        text, problem = normalize_spec(field, source_specs[field])
+        if problem:
+            issue(f"specs.{field}", problem, "warning")
+        else:
+            spec_text.append((field, text))
+
+    links = []
+    for retailer, url in _source_retailers(row).items():
+        retailer, url = _clean_text(retailer), _clean_text(url)
+        if retailer and _URL_PATTERN.match(url):
+            links.append(RetailerLink.from_url(retailer, url))
+        else:
+            issue('retailers', f"dropped invalid link {retailer!r}: {url!r}", "warning")
+    if not links:
+        issue('retailers', "no retailer links", "warning")
+
+    if any(found.severity == "error" for found in issues):
+        return None, issues
+
+    ski = SkiModel(
+        name=name,
+        terrain=terrain,
+        skill_level=skill_level,
+        price_range=price_range,
+        description=_clean_text(row.get('description')),
+        links=tuple(links),
+        spec_text=tuple(spec_text),
+    )
+    return ski, issues
+
+
+def compile_rows(rows: List[Dict[str, Any]]) -> Tuple[List[SkiModel], List[CatalogIssue]]:
+    """Compile every source row, dropping rows with errors and repeated entries"""
+    skis, issues = [], []
+    seen = set()
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            issues.append(CatalogIssue(index, "", "row", "not an object"))
+            continue
+
+        ski, row_issues = compile_row(row, index)
+        issues.extend(row_issues)
+        if ski is None:
+            continue
+
+        key = (ski.name.lower(), ski.terrain, ski.skill_level)
+        if key in seen:
+            issues.append(CatalogIssue(index, ski.name, "name", "duplicate entry dropped", "warning"))
+            continue
+        seen.add(key)
+        skis.append(ski)
+
+    return skis, issues
+
+
+def compile_catalog(source_path: str, index_path: Optional[str] = None,
+                    strict: bool = False) -> Tuple[SkiCatalog, List[CatalogIssue]]:
+    """
+    Compile a catalog source into a validated catalog and, when index_path is
+    given, write it as a snapshot with prebuilt indexes for the server to map.
+    Strict compiles raise CatalogValidationError instead of dropping bad rows.
+    """
+    fingerprint = source_fingerprint(source_path)
+    skis, issues = compile_rows(read_source_rows(source_path))
+
+    if strict and any(issue.severity == "error" for issue in issues):
+        raise CatalogValidationError(issues)
+
+    catalog = SkiCatalog(skis)
+    if index_path:
+        write_snapshot(catalog, index_path, fingerprint)
+    return catalog, issues
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate a ski catalog and build its runtime index")
+    parser.add_argument("source", help="catalog .json or .csv")
+    parser.add_argument("output", nargs="?", help="snapshot path (default: <source>.snap)")
+    parser.add_argument("--strict", action="store_true", help="fail on any row with errors")
+    args = parser.parse_args(argv)
+
+    try:
+        catalog, issues = compile_catalog(args.source, args.output or args.source + ".snap", args.strict)
+    except CatalogValidationError as e:
+        for issue in e.issues:
+            print(issue)
+        print(f"Catalog compile failed: {e}")
+        return 1
+
+    for issue in issues:
+        print(issue)
+    dropped = len({issue.row for issue in issues if issue.severity == "error"})
+    warnings = sum(issue.severity == "warning" for issue in issues)
+    print(f"Compiled {len(catalog)} skis ({dropped} rows dropped, {warnings} warnings)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Columnar catalog engine backing the ski recommendation queries
+"""
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from collections.abc import Sequence as SequenceABC
+
+from data.interval_index import IntervalIndex
+from data.parsing import parse_gender
+from data.ski_model import SkiModel
+
+TERRAIN_CODES = {"all_mountain": 0, "powder": 1, "carving": 2, "park": 3, "backcountry": 4}
+SKILL_CODES = {"beginner": 0, "intermediate": 1, "advanced": 2, "expert": 3}
+GENDER_CODES = {"unisex": 0, "womens": 1, "mens": 2}
+
+# Code used for terrain/skill values the catalog doesn't know about
+UNKNOWN_CODE = -1
+
+# A spec filter is either a single value ("available at 178cm") or a (low, high) window
+SpecFilter = Union[float, Tuple[Optional[float], Optional[float]]]
+
+
+# Numeric columns held for every catalog row, with their storage types
+COLUMN_DTYPES = {
+    'terrain': np.int8,
+    'skill': np.int8,
+    'gender': np.int8,
+    'price_low': np.float32,
+    'price_high': np.float32,
+    'waist': np.float32,
+    'waist_min': np.float32,
+    'waist_max': np.float32,
+    'length_min': np.float32,
+    'length_max': np.float32,
+    'radius_min': np.float32,
+    'radius_max': np.float32,
+}
+
+
+def build_columns(skis: Sequence[SkiModel]) -> Dict[str, np.ndarray]:
+    """Extract the typed column arrays from a list of SkiModel records"""
+    count = len(skis)
+    columns = {name: np.full(count, np.nan, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()
+               if np.issubdtype(dtype, np.floating)}
+
+    columns['terrain'] = np.array([TERRAIN_CODES.get(ski.terrain, UNKNOWN_CODE) for ski in skis], dtype=np.int8)
+    columns['skill'] = np.array([SKILL_CODES.get(ski.skill_level, UNKNOWN_CODE) for ski in skis], dtype=np.int8)
+    columns['gender'] = np.array(
+        [GENDER_CODES[parse_gender(f"{ski.name} {ski.description}") or "unisex"] for ski in skis], dtype=np.int8
+    )
+
+    for row, ski in enumerate(skis):
+        if ski.price:
+            columns['price_low'][row], columns['price_high'][row] = ski.price
+
+        if ski.waist:
+            columns['waist_min'][row], columns['waist_max'][row] = ski.waist
+            columns['waist'][row] = sum(ski.waist) / 2
+
+        if ski.length:
+            columns['length_min'][row], columns['length_max'][row] = ski.length
+
+        if ski.radius:
+            columns['radius_min'][row], columns['radius_max'][row] = ski.radius
+
+    return columns
+
+
+class PatchedRows(SequenceABC):
+    """
+    Row sequence that overrides a few rows of a base sequence without copying it,
+    so a handful of changed records never forces lazy (snapshot) rows to load
+    """
+
+    def __init__(self, base: Sequence[SkiModel], patches: Dict[int, SkiModel]):
+        # Flatten chains of patches so lookups stay one level deep
+        if isinstance(base, PatchedRows):
+            patches = {**base.patches, **patches}
+            base = base.base
+        self.base = base
+        self.patches = patches
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        row = int(row)
+        if row < 0:
+            row += len(self)
+        ski = self.patches.get(row)
+        return ski if ski is not None else self.base[row]
+
+    def names(self) -> List[str]:
+        names = row_names(self.base)
+        for row, ski in self.patches.items():
+            names[row] = ski.name
+        return names
+
+    def link_urls(self) -> List[str]:
+        urls = dict.fromkeys(row_link_urls(self.base, skip_rows=self.patches))
+        for ski in self.patches.values():
+            urls.update(dict.fromkeys(link.url for link in ski.links))
+        return list(urls)
+
+
+def row_names(skis: Sequence[SkiModel]) -> List[str]:
+    """Names of a row sequence, without decoding lazy rows when it can list them directly"""
+    names = getattr(skis, 'names', None)
+    return names() if names is not None else [ski.name for ski in skis]
+
+
+def row_link_urls(skis: Sequence[SkiModel], skip_rows: Iterable[int] = ()) -> List[str]:
+    """Distinct retailer URLs of a row sequence, without decoding lazy rows when it can list them directly"""
+    link_urls = getattr(skis, 'link_urls', None)
+    if link_urls is not None:
+        return link_urls(skip_rows) if skip_rows else link_urls()
+    skip_rows = set(skip_rows)
+    return list(dict.fromkeys(
+        link.url for row, ski in enumerate(skis) if row not in skip_rows for link in ski.links
+    ))
+
+
+class SkiCatalog:
+    """
+    The ski catalog loaded once into typed column arrays, one row per ski.
+    Queries are answered as vectorized boolean masks over the columns.
+
+    Columns are normally extracted from the records, but a loader can pass
+    prebuilt (e.g. memory-mapped) columns together with a lazy row sequence.
+    """
+
+    def __init__(self, skis: Sequence[SkiModel], columns: Optional[Dict[str, np.ndarray]] = None,
+                 spec_indexes: Optional[Dict[str, IntervalIndex]] = None,
+                 price_index: Optional[IntervalIndex] = None):
+        if columns is None:
+            skis = list(skis)
+            columns = build_columns(skis)
+
+        self.skis = skis
+        for name in COLUMN_DTYPES:
+            setattr(self, name, columns[name])
+
+        self.price_index = price_index or IntervalIndex(self.price_low, self.price_high)
+        self.spec_indexes = spec_indexes or {
+            'length': IntervalIndex(self.length_min, self.length_max),
+            'waist': IntervalIndex(self.waist_min, self.waist_max),
+            'radius': IntervalIndex(self.radius_min, self.radius_max),
+        }
+
+    def with_updates(self, updates: Dict[int, SkiModel]) -> "SkiCatalog":
+        """
+        A new catalog with some rows replaced. Only the changed rows are
+        re-extracted; columns and indexes the updates don't touch are shared,
+        and the rest are patched rather than rebuilt.
+        """
+        if not updates:
+            return self
+
+        changed_rows = np.fromiter(updates, dtype=np.intp, count=len(updates))
+        changed = build_columns([updates[row] for row in changed_rows])
+
+        columns = {}
+        for name, values in self.columns().items():
+            if np.array_equal(values[changed_rows], changed[name], equal_nan=True):
+                columns[name] = values
+                continue
+            values = np.array(values, copy=True)
+            values[changed_rows] = changed[name]
+            columns[name] = values
+
+        def patched(index: IntervalIndex, low: str, high: str) -> IntervalIndex:
+            if columns[low] is getattr(self, low) and columns[high] is getattr(self, high):
+                return index
+            return index.with_updates(columns[low], columns[high], changed_rows)
+
+        return SkiCatalog(
+            PatchedRows(self.skis, updates),
+            columns=columns,
+            spec_indexes={
+                field: patched(index, f"{field}_min", f"{field}_max")
+                for field, index in self.spec_indexes.items()
+            },
+            price_index=patched(self.price_index, 'price_low', 'price_high'),
+        )
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The typed column arrays, keyed by name"""
+        return {name: getattr(self, name) for name in COLUMN_DTYPES}
+
+    def names(self) -> List[str]:
+        """Every ski's name in row order"""
+        return row_names(self.skis)
+
+    def link_urls(self) -> List[str]:
+        """Every distinct retailer URL in row order"""
+        return row_link_urls(self.skis)
+
+    def __len__(self) -> int:
+        return len(self.skis)
+
+    def mask(self, terrain: Optional[str] = None, skill_level: Optional[str] = None,
+             budget: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """
+        Build a boolean row mask for the given filters. Filters left as None match every row.
+        A budget is a (low, high) window; skis whose price band overlaps it match.
+        """
+        if budget is not None:
+            mask = self.price_index.overlap_mask(*budget)
+        else:
+            mask = np.ones(len(self), dtype=bool)
+
+        if terrain is not None:
+            mask &= self.terrain == TERRAIN_CODES.get(terrain, UNKNOWN_CODE)
+
+        if skill_level is not None:
+            mask &= self.skill == SKILL_CODES.get(skill_level, UNKNOWN_CODE)
+
+        return mask
+
+    def spec_mask(self, **filters: SpecFilter) -> np.ndarray:
+        """
+        Boolean row mask for numeric spec filters, e.g.
+        spec_mask(waist=(95, 105), length=178) for "waist 95-105mm, available at 178cm".
+        Tuple filters may leave either side as None.
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        for field, value in filters.items():
+            if value is None:
+                continue
+            if field not in self.spec_indexes:
+                raise ValueError(f"Unknown spec field: {field}")
+
+            if isinstance(value, tuple):
+                mask &= self.spec_indexes[field].overlap_mask(*value)
+            else:
+                mask &= self.spec_indexes[field].stabbing_mask(value)
+
+        return mask
+
+    def rows(self, mask: np.ndarray, limit: Optional[int] = None) -> List[SkiModel]:
+        """Return the skis selected by a mask, in catalog order"""
+        indices = np.flatnonzero(mask)
+        if limit is not None:
+            indices = indices[:limit]
+        return self.rows_at(indices)
+
+    def rows_at(self, indices: Sequence[int]) -> List[SkiModel]:
+        """Return the skis at the given row indices, in that order"""
+        return [self.skis[i] for i in indices]
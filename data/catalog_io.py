@@ -0,0 +1,69 @@
+"""
+Loading the ski catalog from external JSON or CSV files
+"""
+import csv
+import os
+from typing import List, Optional
+
+from data.catalog_compiler import CatalogIssue, compile_catalog, source_fingerprint
+from data.catalog_engine import SkiCatalog
+from data.catalog_snapshot import open_snapshot, snapshot_fingerprint
+from data.ski_model import SkiModel
+
+# CSV columns; retailers are written as "REI=https://...;Evo=https://..."
+CSV_FIELDS = ['name', 'terrain', 'skill_level', 'price_range', 'description',
+              'length', 'waist', 'radius', 'retailers']
+
+
+def _report_issues(path: str, issues: List[CatalogIssue]):
+    errors = [issue for issue in issues if issue.severity == "error"]
+    if errors:
+        print(f"Dropped {len(errors)} invalid catalog rows from {path}, first: {errors[0]}")
+
+
+def write_catalog_csv(skis: List[SkiModel], path: str):
+    """Write records to a CSV file in the format load_catalog reads"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for ski in skis:
+            specs = ski.specs
+            writer.writerow({
+                'name': ski.name,
+                'terrain': ski.terrain,
+                'skill_level': ski.skill_level,
+                'price_range': ski.price_range,
+                'description': ski.description,
+                'length': specs.get('length', ''),
+                'waist': specs.get('waist', ''),
+                'radius': specs.get('radius', ''),
+                'retailers': ";".join(f"{link.retailer}={link.url}" for link in ski.links),
+            })
+
+
+def load_catalog(source_path: str, snapshot_path: Optional[str] = None) -> SkiCatalog:
+    """
+    Load a catalog from an external source file. When a snapshot path is given,
+    a fresh snapshot is memory-mapped instead of re-parsing the source; a missing
+    or stale snapshot is recompiled from the source, validating every row.
+    """
+    fingerprint = source_fingerprint(source_path)
+
+    if snapshot_path and os.path.exists(snapshot_path):
+        try:
+            if snapshot_fingerprint(snapshot_path) == fingerprint:
+                return open_snapshot(snapshot_path)
+        except ValueError:
+            pass  # Written by an older snapshot format; rebuild below
+
+    if snapshot_path:
+        try:
+            catalog, issues = compile_catalog(source_path, snapshot_path)
+        except OSError as e:
+            print(f"Could not write catalog snapshot: {e}")
+            catalog, issues = compile_catalog(source_path)
+    else:
+        catalog, issues = compile_catalog(source_path)
+
+    _report_issues(source_path, issues)
+    return catalog
@@ -0,0 +1,128 @@
+"""
+Versioned catalog holder with background hot-reload
+"""
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from data.catalog_engine import SkiCatalog
+from data.catalog_io import source_fingerprint
+
+
+class CatalogVersion(NamedTuple):
+    """An immutable published catalog together with its version number"""
+    version: int
+    catalog: SkiCatalog
+    loaded_at: float
+
+
+class RecommendationList(list):
+    """
+    A list of recommended skis tagged with the catalog version it was read from,
+    so downstream caches can tell when a result came from an outdated catalog.
+    """
+
+    def __init__(self, skis=(), catalog_version: Optional[int] = None):
+        super().__init__(skis)
+        self.catalog_version = catalog_version
+
+
+class CatalogManager:
+    """
+    Holds the live catalog and swaps in new versions atomically.
+
+    Readers call current() once per query and use that CatalogVersion throughout,
+    so a query that started before a reload finishes against the old catalog.
+    New catalogs are built entirely off to the side (in the watcher thread or
+    the caller of reload()) before the single reference assignment that publishes them.
+    """
+
+    def __init__(self, loader: Callable[[], SkiCatalog], source_path: Optional[str] = None,
+                 poll_interval: float = 5.0, initial_version: int = 1):
+        self._loader = loader
+        self._source_path = source_path
+        self._poll_interval = poll_interval
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self._listeners: List[Callable[[CatalogVersion], None]] = []
+
+        self._fingerprint = self._read_fingerprint()
+        self._current = CatalogVersion(initial_version, loader(), time.time())
+
+    def current(self) -> CatalogVersion:
+        """The currently published catalog version"""
+        return self._current
+
+    def publish(self, catalog: SkiCatalog, expected_version: Optional[int] = None) -> Optional[CatalogVersion]:
+        """
+        Atomically make an already-built catalog the live version. With
+        expected_version, publish only if that is still the live version
+        (compare-and-swap) and return None otherwise, so a catalog derived from
+        an older version never overwrites a newer one.
+        """
+        with self._publish_lock:
+            if expected_version is not None and self._current.version != expected_version:
+                return None
+            published = CatalogVersion(self._current.version + 1, catalog, time.time())
+            self._current = published
+
+        for listener in list(self._listeners):
+            try:
+                listener(published)
+            except Exception as e:
+                print(f"Catalog listener failed: {e}")
+
+        return published
+
+    def reload(self) -> CatalogVersion:
+        """Build a new catalog with the loader and publish it"""
+        fingerprint = self._read_fingerprint()
+        catalog = self._loader()
+        self._fingerprint = fingerprint
+        return self.publish(catalog)
+
+    def add_listener(self, listener: Callable[[CatalogVersion], None]):
+        """Call listener(version) after every new catalog version is published"""
+        self._listeners.append(listener)
+
+    def _read_fingerprint(self):
+        if not self._source_path:
+            return None
+        try:
+            return source_fingerprint(self._source_path)
+        except OSError:
+            return None
+
+    def check_for_changes(self) -> bool:
+        """Reload if the source file changed since the last load. Returns True on reload."""
+        fingerprint = self._read_fingerprint()
+        if fingerprint is None or fingerprint == self._fingerprint:
+            return False
+
+        try:
+            self.reload()
+            return True
+        except Exception as e:
+            # Keep serving the old version; a half-written file will be retried next poll
+            print(f"Catalog reload failed, keeping version {self._current.version}: {e}")
+            return False
+
+    def start_watching(self):
+        """Poll the source file in a daemon thread and hot-reload on change"""
+        if not self._source_path or (self._watcher and self._watcher.is_alive()):
+            return
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher:
+            self._watcher.join(timeout=self._poll_interval)
+            self._watcher = None
+
+    def _watch(self):
+        while not self._stop.wait(self._poll_interval):
+            self.check_for_changes()
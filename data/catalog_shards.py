@@ -0,0 +1,194 @@
+"""
+Regional catalog shards that load lazily on first use and are evicted when idle
+"""
+import heapq
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from data.catalog_engine import SkiCatalog
+from data.catalog_io import load_catalog
+from data.catalog_manager import CatalogManager, CatalogVersion, RecommendationList
+from data.ranking import rank_skis_scored
+
+CATALOG_EXTENSIONS = (".json", ".csv")
+
+
+class CatalogShard:
+    """
+    One partition of the catalog (a region or retailer group). Nothing is loaded
+    until the first query; after eviction the next query loads it again.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], SkiCatalog], source_path: Optional[str] = None,
+                 reload_interval: float = 0):
+        self.name = name
+        self._loader = loader
+        self._source_path = source_path
+        self._reload_interval = reload_interval
+        self._manager: Optional[CatalogManager] = None
+        # Versions keep counting across evictions, so a reloaded shard never reuses a version number
+        self._last_version = 0
+        self._listeners: List[Callable[[CatalogVersion], None]] = []
+        self._lock = threading.Lock()
+        self.last_used = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._manager is not None
+
+    def current(self) -> CatalogVersion:
+        """The shard's live catalog version, loading the shard if needed"""
+        self.last_used = time.time()
+        manager = self._manager
+        if manager is None:
+            with self._lock:
+                if self._manager is None:
+                    self._manager = CatalogManager(
+                        self._loader, source_path=self._source_path,
+                        poll_interval=self._reload_interval or 5.0,
+                        initial_version=self._last_version + 1
+                    )
+                    for listener in self._listeners:
+                        self._manager.add_listener(listener)
+                    if self._reload_interval > 0:
+                        self._manager.start_watching()
+                manager = self._manager
+        return manager.current()
+
+    def loaded_version(self) -> Optional[CatalogVersion]:
+        """The live catalog version if the shard is loaded, without loading it"""
+        manager = self._manager
+        return manager.current() if manager is not None else None
+
+    def add_listener(self, listener: Callable[[CatalogVersion], None]):
+        """Call listener(version) after every version this shard publishes, across evictions"""
+        with self._lock:
+            self._listeners.append(listener)
+            if self._manager is not None:
+                self._manager.add_listener(listener)
+
+    def evict(self):
+        """Drop the loaded catalog; in-flight queries keep their own reference"""
+        with self._lock:
+            if self._manager is not None:
+                self._manager.stop_watching()
+                self._last_version = self._manager.current().version
+                self._manager = None
+
+
+def recommend_from_catalogs(catalogs: Sequence[Tuple[str, CatalogVersion]], skill_level: str, terrain: str,
+                            budget: Optional[Tuple[float, float]] = None, gender: Optional[str] = None,
+                            target_length: Optional[float] = None, k: int = 3) -> RecommendationList:
+    """
+    Top k skis across already pinned (shard name, CatalogVersion) pairs, tagged
+    with the ((name, version), ...) of every catalog read
+    """
+    candidates = []
+    for position, (name, published) in enumerate(catalogs):
+        rows, scores = rank_skis_scored(
+            published.catalog, skill_level, terrain, budget, gender, target_length, k=k
+        )
+        for order, (row, score) in enumerate(zip(rows, scores)):
+            # Key ties on shard order then rank so merging is deterministic
+            candidates.append((float(score), -position, -order, published.catalog.skis[row]))
+
+    best = heapq.nlargest(k, candidates, key=lambda candidate: candidate[:3])
+    versions = tuple((name, published.version) for name, published in catalogs)
+    return RecommendationList([candidate[3] for candidate in best], catalog_version=versions)
+
+
+class ShardedCatalog:
+    """
+    A catalog partitioned into shards, with regions mapped to the shards they read.
+    A session only pays load time and memory for the shards its region uses.
+    Regions with no shard of their own read the default region's shards.
+    """
+
+    def __init__(self, shards: Sequence[CatalogShard], region_shards: Optional[Dict[str, List[str]]] = None,
+                 idle_timeout: float = 1800, default_region: Optional[str] = None):
+        self.shards = {shard.name: shard for shard in shards}
+        self.region_shards = region_shards or {}
+        self.idle_timeout = idle_timeout
+        self.default_region = default_region
+        self._janitor = None
+
+    @classmethod
+    def from_directory(cls, directory: str, region_shards: Optional[Dict[str, List[str]]] = None,
+                       idle_timeout: float = 1800, reload_interval: float = 0,
+                       default_region: Optional[str] = None) -> "ShardedCatalog":
+        """One shard per .json/.csv catalog file in a directory, named after the file"""
+        shards = []
+        for filename in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(filename)
+            if extension.lower() not in CATALOG_EXTENSIONS:
+                continue
+            path = os.path.join(directory, filename)
+            shards.append(CatalogShard(
+                name,
+                lambda path=path: load_catalog(path, path + ".snap"),
+                source_path=path,
+                reload_interval=reload_interval,
+            ))
+        return cls(shards, region_shards, idle_timeout, default_region)
+
+    def _mapped_shards(self, region: Optional[str]) -> List[CatalogShard]:
+        names = self.region_shards.get(region, [region])
+        return [self.shards[name] for name in names if name in self.shards]
+
+    def shards_for(self, region: Optional[str]) -> List[CatalogShard]:
+        """
+        Shards serving a region. A region without a mapping reads the shard of the
+        same name; one with no shards at all (e.g. "japan") reads the default
+        region's, and failing that every shard.
+        """
+        return (self._mapped_shards(region) or self._mapped_shards(self.default_region)
+                or list(self.shards.values()))
+
+    def loaded_versions(self) -> List[CatalogVersion]:
+        """Live versions of the shards currently loaded, loading nothing"""
+        versions = (shard.loaded_version() for shard in self.shards.values())
+        return [version for version in versions if version is not None]
+
+    def add_listener(self, listener: Callable[[CatalogVersion], None]):
+        """Call listener(version) whenever any shard publishes a new version"""
+        for shard in self.shards.values():
+            shard.add_listener(listener)
+
+    def recommend(self, region: str, skill_level: str, terrain: str,
+                  budget: Optional[Tuple[float, float]] = None, gender: Optional[str] = None,
+                  target_length: Optional[float] = None, k: int = 3) -> RecommendationList:
+        """
+        Top k skis across a region's shards. Each shard ranks its own top k and
+        the results are merged by score.
+        """
+        catalogs = [(shard.name, shard.current()) for shard in self.shards_for(region)]
+        return recommend_from_catalogs(catalogs, skill_level, terrain, budget, gender, target_length, k)
+
+    def loaded_shards(self) -> List[str]:
+        return [name for name, shard in self.shards.items() if shard.loaded]
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Evict shards not queried within idle_timeout; returns their names"""
+        now = now or time.time()
+        evicted = []
+        for name, shard in self.shards.items():
+            if shard.loaded and now - shard.last_used > self.idle_timeout:
+                shard.evict()
+                evicted.append(name)
+        return evicted
+
+    def start_janitor(self, interval: Optional[float] = None):
+        """Periodically evict idle shards in a daemon thread"""
+        if self._janitor and self._janitor.is_alive():
+            return
+        interval = interval or max(self.idle_timeout / 4, 1.0)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                self.evict_idle()
+
+        self._janitor = threading.Thread(target=run, name="catalog-shard-janitor", daemon=True)
+        self._janitor.start()
@@ -0,0 +1,269 @@
+"""
+Binary catalog snapshots: fixed-width columns plus a string table, memory-mapped on load
+"""
+import mmap
+import os
+import struct
+import tempfile
+import numpy as np
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Tuple
+
+from data.catalog_engine import COLUMN_DTYPES, SkiCatalog
+from data.interval_index import IntervalIndex
+from data.ski_model import RetailerLink, SkiModel
+
+MAGIC = b"SKICAT03"
+
+# magic, row count, link count, string count, source size, source mtime (ns)
+_HEADER = struct.Struct("<8sQQQQQ")
+
+# String-id columns stored per row; spec text ids use NO_STRING when absent
+_STRING_COLUMNS = ('name', 'terrain_text', 'skill_text', 'price_text', 'description',
+                   'length_text', 'waist_text', 'radius_text')
+_SPEC_TEXT_COLUMNS = {'length': 'length_text', 'waist': 'waist_text', 'radius': 'radius_text'}
+NO_STRING = np.iinfo(np.uint32).max
+
+# Interval indexes stored as precomputed sort orders, with their (low, high) columns
+_INDEX_COLUMNS = {
+    'price': ('price_low', 'price_high'),
+    'length': ('length_min', 'length_max'),
+    'waist': ('waist_min', 'waist_max'),
+    'radius': ('radius_min', 'radius_max'),
+}
+
+_ALIGNMENT = 8
+
+
+def _layout(rows: int, links: int, strings: int, blob_size: int) -> List[Tuple[str, np.dtype, int]]:
+    """Sections of the file in order, as (name, dtype, element count)"""
+    sections = [(name, np.dtype(dtype), rows) for name, dtype in COLUMN_DTYPES.items()]
+    sections += [(name, np.dtype(np.uint32), rows) for name in _STRING_COLUMNS]
+    for index in _INDEX_COLUMNS:
+        sections += [(f"{index}_by_low", np.dtype(np.uint32), rows), (f"{index}_by_high", np.dtype(np.uint32), rows)]
+    sections += [
+        ('link_start', np.dtype(np.uint32), rows + 1),
+        ('link_retailer', np.dtype(np.uint32), links),
+        ('link_template', np.dtype(np.uint32), links),
+        ('link_slug', np.dtype(np.uint32), links),
+        ('string_offsets', np.dtype(np.uint64), strings + 1),
+        ('string_blob', np.dtype(np.uint8), blob_size),
+    ]
+    return sections
+
+
+def _section_offsets(sections) -> Dict[str, int]:
+    offsets = {}
+    position = _HEADER.size
+    for name, dtype, count in sections:
+        position += -position % _ALIGNMENT
+        offsets[name] = position
+        position += dtype.itemsize * count
+    return offsets
+
+
+class _StringTable:
+    """Deduplicating string table used while writing a snapshot"""
+
+    def __init__(self):
+        self.ids = {}
+        self.encoded = []
+
+    def add(self, value: str) -> int:
+        if value not in self.ids:
+            self.ids[value] = len(self.encoded)
+            self.encoded.append(value.encode("utf-8"))
+        return self.ids[value]
+
+
+def write_snapshot(catalog: SkiCatalog, path: str, source_fingerprint: Tuple[int, int] = (0, 0)):
+    """
+    Compile a catalog into a snapshot file. The file is written to a temporary
+    name and renamed into place so concurrent readers never see a partial file.
+    """
+    strings = _StringTable()
+    rows = len(catalog)
+
+    arrays = {name: np.zeros(rows, dtype=np.uint32) for name in _STRING_COLUMNS}
+    link_start = np.zeros(rows + 1, dtype=np.uint32)
+    link_retailer, link_template, link_slug = [], [], []
+
+    for row in range(rows):
+        ski = catalog.skis[row]
+        specs = ski.specs
+
+        arrays['name'][row] = strings.add(ski.name)
+        arrays['terrain_text'][row] = strings.add(ski.terrain)
+        arrays['skill_text'][row] = strings.add(ski.skill_level)
+        arrays['price_text'][row] = strings.add(ski.price_range)
+        arrays['description'][row] = strings.add(ski.description)
+        for field, column in _SPEC_TEXT_COLUMNS.items():
+            arrays[column][row] = strings.add(specs[field]) if field in specs else NO_STRING
+
+        for link in ski.links:
+            link_retailer.append(strings.add(link.retailer))
+            link_template.append(strings.add(link.template))
+            link_slug.append(strings.add(link.slug))
+        link_start[row + 1] = len(link_slug)
+
+    string_offsets = np.zeros(len(strings.encoded) + 1, dtype=np.uint64)
+    string_offsets[1:] = np.cumsum([len(b) for b in strings.encoded])
+    blob = b"".join(strings.encoded)
+
+    arrays.update(catalog.columns())
+    indexes = dict(catalog.spec_indexes, price=catalog.price_index)
+    for index in _INDEX_COLUMNS:
+        arrays[f"{index}_by_low"], arrays[f"{index}_by_high"] = indexes[index].orders()
+    arrays.update({
+        'link_start': link_start,
+        'link_retailer': np.array(link_retailer, dtype=np.uint32),
+        'link_template': np.array(link_template, dtype=np.uint32),
+        'link_slug': np.array(link_slug, dtype=np.uint32),
+        'string_offsets': string_offsets,
+        'string_blob': np.frombuffer(blob, dtype=np.uint8),
+    })
+
+    sections = _layout(rows, len(link_slug), len(strings.encoded), len(blob))
+    offsets = _section_offsets(sections)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, rows, len(link_slug), len(strings.encoded), *source_fingerprint))
+            for name, dtype, count in sections:
+                f.write(b"\0" * (offsets[name] - f.tell()))
+                f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _read_header(buffer) -> Tuple[int, int, int, Tuple[int, int]]:
+    try:
+        magic, rows, links, strings, size, mtime = _HEADER.unpack_from(buffer, 0)
+    except struct.error:
+        raise ValueError("Truncated ski catalog snapshot")
+    if magic != MAGIC:
+        raise ValueError("Not a ski catalog snapshot")
+    return rows, links, strings, (size, mtime)
+
+
+def snapshot_fingerprint(path: str) -> Tuple[int, int]:
+    """The source fingerprint recorded when the snapshot was written"""
+    with open(path, "rb") as f:
+        return _read_header(f.read(_HEADER.size))[3]
+
+
+class _SnapshotRows(Sequence):
+    """
+    Lazy row sequence over a mapped snapshot. SkiModel records are only
+    decoded from the string table when a query actually returns them.
+    """
+
+    def __init__(self, sections: Dict[str, np.ndarray]):
+        self._sections = sections
+        self._offsets = sections['string_offsets']
+        self._blob = sections['string_blob']
+        self._cache = {}
+
+    def _string(self, string_id: int) -> str:
+        start, end = int(self._offsets[string_id]), int(self._offsets[string_id + 1])
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._sections['name'])
+
+    def names(self) -> List[str]:
+        """Every ski's name, read straight from the string table without decoding records"""
+        return [self._string(int(string_id)) for string_id in self._sections['name']]
+
+    def link_urls(self, skip_rows: Iterable[int] = ()) -> List[str]:
+        """
+        Distinct retailer URLs in row order, from the link sections without
+        decoding records. Interned templates and slugs make equal URLs share
+        id pairs, so each URL is decoded once.
+        """
+        section = self._sections
+        keep = np.ones(len(section['link_slug']), dtype=bool)
+        for row in skip_rows:
+            keep[int(section['link_start'][row]):int(section['link_start'][row + 1])] = False
+
+        pairs = np.stack((section['link_template'][keep], section['link_slug'][keep]), axis=1)
+        _, first = np.unique(pairs, axis=0, return_index=True)
+        return [
+            RetailerLink("", self._string(int(template)), self._string(int(slug))).url
+            for template, slug in pairs[np.sort(first)]
+        ]
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+
+        row = int(row)
+        if row < 0:
+            row += len(self)
+        if row in self._cache:
+            return self._cache[row]
+
+        section = self._sections
+        spec_text = tuple(
+            (field, self._string(int(section[column][row])))
+            for field, column in _SPEC_TEXT_COLUMNS.items()
+            if section[column][row] != NO_STRING
+        )
+        start, end = int(section['link_start'][row]), int(section['link_start'][row + 1])
+        links = tuple(
+            RetailerLink(
+                self._string(int(section['link_retailer'][i])),
+                self._string(int(section['link_template'][i])),
+                self._string(int(section['link_slug'][i])),
+            )
+            for i in range(start, end)
+        )
+
+        ski = SkiModel(
+            name=self._string(int(section['name'][row])),
+            terrain=self._string(int(section['terrain_text'][row])),
+            skill_level=self._string(int(section['skill_text'][row])),
+            price_range=self._string(int(section['price_text'][row])),
+            description=self._string(int(section['description'][row])),
+            links=links,
+            spec_text=spec_text,
+        )
+        self._cache[row] = ski
+        return ski
+
+
+def open_snapshot(path: str) -> SkiCatalog:
+    """
+    Memory-map a snapshot and wrap it as a catalog. Column arrays are read-only
+    views onto the mapped pages, so several processes share one copy, and the
+    interval indexes reuse the stored sort orders instead of sorting again.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    rows, links, strings, _ = _read_header(mapped)
+    blob_size = len(mapped) - _section_offsets(_layout(rows, links, strings, 0))['string_blob']
+    layout = _layout(rows, links, strings, blob_size)
+    offsets = _section_offsets(layout)
+
+    sections = {
+        name: np.frombuffer(mapped, dtype=dtype, count=count, offset=offsets[name])
+        for name, dtype, count in layout
+    }
+
+    indexes = {
+        index: IntervalIndex.from_orders(
+            sections[low], sections[high], sections[f"{index}_by_low"], sections[f"{index}_by_high"]
+        )
+        for index, (low, high) in _INDEX_COLUMNS.items()
+    }
+    price_index = indexes.pop('price')
+
+    catalog = SkiCatalog(_SnapshotRows(sections), columns=sections, spec_indexes=indexes, price_index=price_index)
+    catalog.snapshot_path = path
+    return catalog
@@ -0,0 +1,185 @@
+"""
+Precomputed facet bitmaps for live catalog counts and narrowing
+"""
+import math
+import threading
+import weakref
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Union
+
+from data.catalog_engine import SKILL_CODES, TERRAIN_CODES, SkiCatalog
+
+# Band edges; a ski falls in the band containing its waist / lowest price
+WAIST_BANDS = [("under 80mm", 0, 80), ("80-89mm", 80, 90), ("90-99mm", 90, 100),
+               ("100-109mm", 100, 110), ("110mm+", 110, math.inf)]
+PRICE_BANDS = [("under $500", 0, 500), ("$500-699", 500, 700), ("$700-899", 700, 900),
+               ("$900+", 900, math.inf)]
+
+# Set bits per byte value, for popcounts over packed bitmaps
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+FacetValue = Union[str, Iterable[str]]
+
+
+class FacetIndex:
+    """
+    One packed bitmap (np.packbits) per facet value: terrain, skill, waist band
+    and price band. Counts and candidate sets come from OR within a facet,
+    AND across facets and a byte-table popcount, never from row scans. A
+    max_price between band edges also needs the catalog's price column.
+    """
+
+    def __init__(self, catalog: SkiCatalog):
+        self.size = len(catalog)
+        self.price_low = catalog.price_low
+        self.bitmaps: Dict[str, Dict[str, np.ndarray]] = {
+            facet: {value: np.packbits(members) for value, members in values.items()}
+            for facet, values in self._memberships(catalog, slice(None)).items()
+        }
+        self._all = np.packbits(np.ones(self.size, dtype=bool))
+
+    @staticmethod
+    def _memberships(catalog: SkiCatalog, rows) -> Dict[str, Dict[str, np.ndarray]]:
+        """Boolean membership of the selected rows in every facet value"""
+        terrain, skill = catalog.terrain[rows], catalog.skill[rows]
+        waist, price_low = catalog.waist[rows], catalog.price_low[rows]
+        return {
+            'terrain': {name: terrain == code for name, code in TERRAIN_CODES.items()},
+            'skill': {name: skill == code for name, code in SKILL_CODES.items()},
+            'waist_band': {label: (waist >= low) & (waist < high) for label, low, high in WAIST_BANDS},
+            'price_band': {label: (price_low >= low) & (price_low < high) for label, low, high in PRICE_BANDS},
+        }
+
+    def updated(self, catalog: SkiCatalog, changed_rows: Iterable[int]) -> "FacetIndex":
+        """
+        Facet index for a catalog derived with SkiCatalog.with_updates, recomputing
+        only the changed rows' bits. Bitmaps whose bits don't change are shared.
+        """
+        rows = np.fromiter(changed_rows, dtype=np.intp)
+        byte, bit = rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8)
+
+        index = object.__new__(FacetIndex)
+        index.size = self.size
+        index.price_low = catalog.price_low
+        index._all = self._all
+        index.bitmaps = {}
+
+        for facet, values in self._memberships(catalog, rows).items():
+            index.bitmaps[facet] = {}
+            for value, members in values.items():
+                bitmap = self.bitmaps[facet][value]
+                current = (bitmap[byte] & bit) != 0
+                if np.array_equal(current, members):
+                    index.bitmaps[facet][value] = bitmap
+                    continue
+
+                bitmap = bitmap.copy()
+                np.bitwise_and.at(bitmap, byte[~members], ~bit[~members])
+                np.bitwise_or.at(bitmap, byte[members], bit[members])
+                index.bitmaps[facet][value] = bitmap
+
+        return index
+
+    @staticmethod
+    def price_bands_under(max_price: float) -> List[str]:
+        """Price bands with skis starting below max_price; the last may only partly qualify"""
+        return [label for label, low, _ in PRICE_BANDS if low < max_price]
+
+    @staticmethod
+    def is_band_edge(max_price: float) -> bool:
+        """Whether "under max_price" is exactly a union of price bands"""
+        return any(max_price in (low, high) for _, low, high in PRICE_BANDS)
+
+    def select(self, max_price: Optional[float] = None, **filters: Optional[FacetValue]) -> np.ndarray:
+        """
+        Packed bitmap of skis matching every filter, e.g.
+        select(terrain="powder", skill="intermediate", max_price=700).
+        A filter value may be a single facet value or a list of values (OR-ed).
+        """
+        if max_price is not None:
+            filters['price_band'] = self.price_bands_under(max_price)
+
+        bitmap = self._all.copy()
+        for facet, values in filters.items():
+            if values is None:
+                continue
+            if facet not in self.bitmaps:
+                raise ValueError(f"Unknown facet: {facet}")
+            if isinstance(values, str):
+                values = [values]
+
+            combined = np.zeros_like(bitmap)
+            for value in values:
+                if value in self.bitmaps[facet]:
+                    combined |= self.bitmaps[facet][value]
+            bitmap &= combined
+
+        # Between band edges the top band only partly qualifies, so check the prices themselves
+        if max_price is not None and not self.is_band_edge(max_price):
+            bitmap &= np.packbits(self.price_low < max_price)
+
+        return bitmap
+
+    @staticmethod
+    def popcount(bitmap: np.ndarray) -> int:
+        return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    def count(self, max_price: Optional[float] = None, **filters: Optional[FacetValue]) -> int:
+        """Number of skis matching the filters"""
+        return self.popcount(self.select(max_price=max_price, **filters))
+
+    def rows(self, max_price: Optional[float] = None, **filters: Optional[FacetValue]) -> np.ndarray:
+        """Row indices of the skis matching the filters"""
+        return self.bitmap_rows(self.select(max_price=max_price, **filters))
+
+    def bitmap_rows(self, bitmap: np.ndarray) -> np.ndarray:
+        """Row indices of the set bits of a packed bitmap"""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+
+    def counts(self, facet: str, max_price: Optional[float] = None,
+               **filters: Optional[FacetValue]) -> Dict[str, int]:
+        """
+        Count per value of one facet given the other filters, for showing how
+        many results each further narrowing step would leave
+        """
+        filters.pop(facet, None)
+        if facet == 'price_band':
+            max_price = None
+        base = self.select(max_price=max_price, **filters)
+        return {value: self.popcount(base & bitmap) for value, bitmap in self.bitmaps[facet].items()}
+
+
+_INDEXES = weakref.WeakKeyDictionary()
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_facet_index(catalog: SkiCatalog) -> FacetIndex:
+    """The facet index for a catalog, built once per catalog version"""
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(catalog)
+        if index is None:
+            index = FacetIndex(catalog)
+            _INDEXES[catalog] = index
+        return index
+
+
+def describe_count(count: int, terrain: Optional[str] = None, skill: Optional[str] = None,
+                   max_price: Optional[float] = None) -> str:
+    """Human-readable summary such as '14 powder skis under $700 for intermediate skiers'"""
+    parts = [str(count)]
+    if terrain:
+        parts.append(terrain.replace("_", "-"))
+    parts.append("ski" if count == 1 else "skis")
+    if max_price is not None:
+        parts.append(f"under ${max_price:,.0f}")
+    if skill:
+        parts.append(f"for {skill} skiers")
+    return " ".join(parts)
+
+
+def update_facet_index(old_catalog: SkiCatalog, new_catalog: SkiCatalog, changed_rows: Iterable[int]) -> FacetIndex:
+    """Derive and register the facet index for a catalog built with with_updates()"""
+    index = get_facet_index(old_catalog).updated(new_catalog, changed_rows)
+    with _INDEXES_LOCK:
+        _INDEXES[new_catalog] = index
+    return index
@@ -0,0 +1,115 @@
+"""
+Static interval index used for price bands and spec ranges
+"""
+import numpy as np
+from typing import Optional
+
+
+class IntervalIndex:
+    """
+    Index over closed [low, high] intervals, one per catalog row.
+    Overlap queries need only two binary searches: an interval misses the
+    query window exactly when it starts after the window ends or ends before
+    the window starts, and those two cases can never both hold.
+    Rows with a missing (NaN) bound never match.
+    """
+
+    def __init__(self, lows: np.ndarray, highs: np.ndarray):
+        lows = np.asarray(lows, dtype=np.float64)
+        highs = np.asarray(highs, dtype=np.float64)
+        valid = ~(np.isnan(lows) | np.isnan(highs))
+        valid_rows = np.flatnonzero(valid)
+
+        self._set_orders(
+            lows, highs, valid,
+            valid_rows[np.argsort(lows[valid_rows], kind="stable")],
+            valid_rows[np.argsort(highs[valid_rows], kind="stable")],
+        )
+
+    def _set_orders(self, lows, highs, valid, by_low, by_high):
+        self.size = len(lows)
+        self._valid = valid
+        self._by_low = by_low
+        self._sorted_lows = lows[by_low]
+        self._by_high = by_high
+        self._sorted_highs = highs[by_high]
+
+    @classmethod
+    def from_orders(cls, lows: np.ndarray, highs: np.ndarray,
+                    by_low: np.ndarray, by_high: np.ndarray) -> "IntervalIndex":
+        """
+        Rebuild an index from sort orders saved by orders(), skipping the sorts.
+        Rows with a missing bound sit at the end of the saved orders.
+        """
+        lows = np.asarray(lows, dtype=np.float64)
+        highs = np.asarray(highs, dtype=np.float64)
+        valid = ~(np.isnan(lows) | np.isnan(highs))
+        valid_count = int(np.count_nonzero(valid))
+
+        index = cls.__new__(cls)
+        index._set_orders(
+            lows, highs, valid,
+            np.asarray(by_low[:valid_count], dtype=np.intp),
+            np.asarray(by_high[:valid_count], dtype=np.intp),
+        )
+        return index
+
+    def orders(self):
+        """
+        Row permutations sorted by low and by high bound, with rows that have a
+        missing bound appended, for saving alongside the columns
+        """
+        invalid_rows = np.flatnonzero(~self._valid)
+        return (np.concatenate([self._by_low, invalid_rows]),
+                np.concatenate([self._by_high, invalid_rows]))
+
+    def with_updates(self, lows: np.ndarray, highs: np.ndarray, rows: np.ndarray) -> "IntervalIndex":
+        """
+        The index for new bounds in which only the given rows changed. Those rows
+        are dropped from the sorted orders and merged back in at their new
+        positions, so the rest of the catalog is never re-sorted.
+        """
+        lows = np.asarray(lows, dtype=np.float64)
+        highs = np.asarray(highs, dtype=np.float64)
+        valid = ~(np.isnan(lows) | np.isnan(highs))
+        changed = np.zeros(self.size, dtype=bool)
+        changed[rows] = True
+        moved = np.flatnonzero(changed & valid)
+
+        def merge(order, values):
+            kept = order[~changed[order]]
+            arrivals = moved[np.argsort(values[moved], kind="stable")]
+            positions = np.searchsorted(values[kept], values[arrivals], side="right")
+            return np.insert(kept, positions, arrivals)
+
+        index = IntervalIndex.__new__(IntervalIndex)
+        index._set_orders(lows, highs, valid, merge(self._by_low, lows), merge(self._by_high, highs))
+        return index
+
+    def _bounds(self, low: Optional[float], high: Optional[float]):
+        low = -np.inf if low is None else low
+        high = np.inf if high is None else high
+        starts_before_end = int(np.searchsorted(self._sorted_lows, high, side="right"))
+        ends_before_start = int(np.searchsorted(self._sorted_highs, low, side="left"))
+        return starts_before_end, ends_before_start
+
+    def count(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Number of intervals overlapping [low, high], in O(log n)"""
+        starts_before_end, ends_before_start = self._bounds(low, high)
+        return max(starts_before_end - ends_before_start, 0)
+
+    def overlap_mask(self, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """
+        Boolean row mask of intervals overlapping [low, high].
+        None leaves that side of the window open.
+        """
+        starts_before_end, ends_before_start = self._bounds(low, high)
+
+        mask = self._valid.copy()
+        mask[self._by_low[starts_before_end:]] = False
+        mask[self._by_high[:ends_before_start]] = False
+        return mask
+
+    def stabbing_mask(self, point: float) -> np.ndarray:
+        """Boolean row mask of intervals containing a single point"""
+        return self.overlap_mask(point, point)
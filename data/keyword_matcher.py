@@ -0,0 +1,78 @@
+"""
+Precompiled matcher that normalizes free-text terrain and skill descriptions
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import Config
+
+
+class KeywordMatcher:
+    """
+    Maps free text to canonical codes using a synonym table of the form
+    {field: {canonical_code: [phrases, ...]}}.
+
+    All phrases for all fields are compiled into a single alternation, longest
+    first, so one regex scan of the text finds every field at once.
+    """
+
+    def __init__(self, synonyms: Dict[str, Dict[str, Iterable[str]]]):
+        self._lookup: Dict[str, Tuple[str, str]] = {}
+
+        for field, codes in synonyms.items():
+            for code, phrases in codes.items():
+                for phrase in list(phrases) + [code]:
+                    self._lookup[self._normalize(phrase)] = (field, code)
+
+        # Longest phrases first so "double black" wins over "black"
+        alternatives = sorted(self._lookup, key=len, reverse=True)
+        pattern = "|".join(
+            r"[\s\-_]+".join(re.escape(word) for word in phrase.split(" "))
+            for phrase in alternatives
+        )
+        self._pattern = re.compile(r"\b(?:" + pattern + r")\b", re.IGNORECASE)
+
+    @staticmethod
+    def _normalize(phrase: str) -> str:
+        return " ".join(re.split(r"[\s\-_]+", phrase.strip().lower()))
+
+    def find_all(self, text) -> List[Tuple[str, str, str]]:
+        """Every (field, code, matched text) in order of appearance"""
+        if not text or not isinstance(text, str):
+            return []
+
+        found = []
+        for match in self._pattern.finditer(text):
+            field, code = self._lookup[self._normalize(match.group(0))]
+            found.append((field, code, match.group(0)))
+        return found
+
+    def match(self, text) -> Dict[str, str]:
+        """Canonical code per field for the first mention of each field in the text"""
+        codes = {}
+        for field, code, _ in self.find_all(text):
+            codes.setdefault(field, code)
+        return codes
+
+    def match_field(self, text, field: str) -> Optional[str]:
+        """Canonical code for a single field, or None if the text doesn't mention it"""
+        return self.match(text).get(field)
+
+
+_DEFAULT_MATCHER = None
+_DEFAULT_MATCHER_LOCK = threading.Lock()
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """The shared matcher built from the synonym tables in Config"""
+    global _DEFAULT_MATCHER
+    if _DEFAULT_MATCHER is None:
+        with _DEFAULT_MATCHER_LOCK:
+            if _DEFAULT_MATCHER is None:
+                _DEFAULT_MATCHER = KeywordMatcher({
+                    "terrain": Config.TERRAIN_SYNONYMS,
+                    "skill": Config.SKILL_SYNONYMS,
+                    "region": Config.REGION_SYNONYMS,
+                })
+    return _DEFAULT_MATCHER
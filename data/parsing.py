@@ -0,0 +1,149 @@
+"""
+Parsing helpers that turn the catalog's free-text fields into numbers
+"""
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_RANGE_PATTERN = re.compile(_NUMBER + r"\s*[a-zA-Z]*\s*(?:-|–|to)\s*\$?" + _NUMBER)
+_SINGLE_PATTERN = re.compile(_NUMBER)
+_THOUSANDS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*k\b", re.IGNORECASE)
+# "between $600 and $800" reads as the range "$600 to $800"
+_BETWEEN_PATTERN = re.compile(r"\bbetween\s+(\$?\s*\d+(?:\.\d+)?\s*[a-z]*)\s+and\b")
+
+# Ceilings are checked first: "no more than $500" and "not over $600" contain lower-bound words
+_UPPER_BOUND_PATTERN = re.compile(
+    r"\b(?:(?:no|not)\s+(?:more than|over|above|higher than|exceeding)|at most|under|below|less than|up to|"
+    r"max(?:imum)?|tops)\b"
+)
+_LOWER_BOUND_PATTERN = re.compile(
+    r"\b(?:over|above|more than|at least|min(?:imum)?|starting at|from|or (?:more|above|higher)|and (?:up|above))\b"
+    r"|\d\s*\+"
+)
+_APPROXIMATE_PATTERN = re.compile(r"\b(?:around|about|approximately|roughly)\b|~")
+
+# How far either side of an "around $X" budget we still consider a match
+_APPROXIMATE_TOLERANCE = 0.15
+
+
+def parse_range(text) -> Optional[Tuple[float, float]]:
+    """
+    Parse strings like "$400-500", "150-180cm" or "80mm" into a (low, high) tuple.
+    Returns None when the text holds no number.
+    """
+    if text is None:
+        return None
+
+    cleaned = str(text).replace(",", "")
+
+    match = _RANGE_PATTERN.search(cleaned)
+    if match:
+        low, high = float(match.group(1)), float(match.group(2))
+        return min(low, high), max(low, high)
+
+    match = _SINGLE_PATTERN.search(cleaned)
+    if match:
+        value = float(match.group(1))
+        return value, value
+
+    return None
+
+
+# Spec fields and the unit each one is expressed in
+SPEC_UNITS = {"length": "cm", "waist": "mm", "radius": "m"}
+
+
+def parse_specs(specs: Optional[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+    """
+    Convert a specs dict like {"length": "150-180cm", "waist": "80mm"} into numeric
+    (low, high) ranges. Fields that are missing or unparseable are left out.
+    """
+    parsed = {}
+    for field in SPEC_UNITS:
+        bounds = parse_range((specs or {}).get(field))
+        if bounds:
+            parsed[field] = bounds
+    return parsed
+
+
+def format_range(bounds: Optional[Tuple[float, float]], unit: str) -> str:
+    """Format a numeric (low, high) range for display, e.g. 150-180 cm or 80 mm"""
+    if not bounds:
+        return "N/A"
+
+    low, high = ("%g" % value for value in bounds)
+    if low == high:
+        return f"{low} {unit}"
+    return f"{low}-{high} {unit}"
+
+
+_WOMENS_PATTERN = re.compile(r"\b(?:female|women'?s?|woman|ladies|lady|girls?)\b", re.IGNORECASE)
+_MENS_PATTERN = re.compile(r"\b(?:male|men'?s?|man|guys?|boys?)\b", re.IGNORECASE)
+
+
+def parse_gender(text) -> Optional[str]:
+    """
+    Read "womens" or "mens" from free text such as a user's gender or a ski's
+    description ("Female-specific powder ski"). Returns None when neither is clear.
+    """
+    if not text or not isinstance(text, str):
+        return None
+
+    womens = bool(_WOMENS_PATTERN.search(text))
+    mens = bool(_MENS_PATTERN.search(text))
+    if womens == mens:
+        return None
+    return "womens" if womens else "mens"
+
+
+def parse_budget(budget) -> Optional[Tuple[float, float]]:
+    """
+    Parse a user budget such as "under $500", "$600-800" or "around $700" into
+    a (low, high) window. Open-ended budgets use 0 or infinity for the missing side.
+    Returns None when there is no usable budget.
+    """
+    if budget is None or isinstance(budget, bool):
+        return None
+
+    if isinstance(budget, (int, float)):
+        return (0.0, float(budget)) if budget > 0 else None
+
+    if isinstance(budget, dict):
+        low = parse_range(budget.get('min'))
+        high = parse_range(budget.get('max'))
+        if not low and not high:
+            return None
+        return (low[0] if low else 0.0), (high[1] if high else math.inf)
+
+    return _parse_budget_text(str(budget).strip().lower())
+
+
+@lru_cache(maxsize=1024)
+def _parse_budget_text(text: str) -> Optional[Tuple[float, float]]:
+    if not text or text == "unknown":
+        return None
+
+    text = _THOUSANDS_PATTERN.sub(lambda m: str(float(m.group(1)) * 1000), text.replace(",", ""))
+    text = _BETWEEN_PATTERN.sub(r"\1 to", text)
+
+    bounds = parse_range(text)
+    if not bounds:
+        return None
+
+    low, high = bounds
+    if low != high:
+        return low, high
+
+    if _UPPER_BOUND_PATTERN.search(text):
+        return 0.0, high
+
+    if _LOWER_BOUND_PATTERN.search(text):
+        return low, math.inf
+
+    if _APPROXIMATE_PATTERN.search(text):
+        return low * (1 - _APPROXIMATE_TOLERANCE), high * (1 + _APPROXIMATE_TOLERANCE)
+
+    # "under $500", "$500 max" and a bare "$500" all read as a ceiling
+    return 0.0, high
@@ -0,0 +1,233 @@
+"""
+Streaming ingestion of retailer price/stock feeds into the live catalog
+"""
+import csv
+import io
+import json
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from data.catalog_manager import CatalogManager
+from data.facets import update_facet_index
+from data.parsing import parse_range
+from data.similarity import carry_similarity_index, refresh_similarity_index
+from data.ski_model import RetailerLink, SkiModel
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Times a batch is rebuilt when another publish (e.g. a hot reload) lands first
+MAX_PUBLISH_ATTEMPTS = 3
+
+
+def _iter_lines(source: str) -> Iterator[str]:
+    """Text lines from a local file or an http(s) URL, read lazily"""
+    if source.startswith(("http://", "https://")):
+        with requests.get(source, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield line
+    else:
+        with open(source, encoding="utf-8") as f:
+            yield from f
+
+
+def iter_feed(source: str, format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream feed rows as dicts from JSON lines or CSV. The format is taken from
+    the file extension unless given. Lines that aren't valid JSON come through as
+    None so the ingestor can count and skip them.
+    """
+    format = format or ("csv" if source.split("?")[0].lower().endswith(".csv") else "jsonl")
+    lines = _iter_lines(source)
+
+    if format == "csv":
+        header = next(lines, None)
+        if header is None:
+            return
+        fields = next(csv.reader([header]))
+        for line in lines:
+            values = next(csv.reader(io.StringIO(line)), None)
+            if values:
+                yield dict(zip(fields, values))
+    else:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def _format_price(low: float, high: float) -> str:
+    return f"${low:.0f}" if low == high else f"${low:.0f}-{high:.0f}"
+
+
+def _feed_price(value) -> float:
+    """A feed price such as 499, "499.00", "$499" or "1,299"; raises ValueError otherwise"""
+    bounds = parse_range(value)
+    if not bounds or bounds[0] != bounds[1] or bounds[0] <= 0:
+        raise ValueError(f"invalid price {value!r}")
+    return bounds[0]
+
+
+def _is_false(value) -> bool:
+    return str(value).strip().lower() in ("false", "0", "no", "n", "out", "out of stock")
+
+
+def apply_feed_row(ski: SkiModel, row: Dict[str, Any]) -> SkiModel:
+    """
+    The record after applying one feed row: a new price band and/or a retailer
+    link added, updated or (when out of stock) removed. Returns the same object
+    when nothing changes. Raises ValueError for a row with an unreadable price.
+    """
+    changes = {}
+
+    if row.get('price_low') not in (None, "") or row.get('price') not in (None, ""):
+        if row.get('price_low') not in (None, ""):
+            low = _feed_price(row['price_low'])
+            high = _feed_price(row['price_high']) if row.get('price_high') not in (None, "") else low
+            bounds = (min(low, high), max(low, high))
+        else:
+            bounds = parse_range(row['price'])
+            if not bounds:
+                raise ValueError(f"invalid price {row['price']!r}")
+        if bounds and bounds != ski.price:
+            changes['price_range'] = _format_price(*bounds)
+
+    retailer = row.get('retailer')
+    if retailer:
+        links = [link for link in ski.links if link.retailer != retailer]
+        if not _is_false(row.get('in_stock', True)):
+            existing = next((link for link in ski.links if link.retailer == retailer), None)
+            url = row.get('url') or (existing.url if existing else None)
+            if url:
+                links.append(RetailerLink.from_url(retailer, url))
+        if tuple(links) != ski.links:
+            changes['links'] = tuple(links)
+
+    return ski.replace(**changes) if changes else ski
+
+
+class FeedIngestor:
+    """
+    Applies a price/stock feed to the live catalog in bounded batches. Each batch
+    only touches the rows that actually changed, is built off the request path,
+    and is published as a new catalog version with one atomic compare-and-swap.
+    Malformed rows are counted and skipped rather than stopping the feed.
+    """
+
+    def __init__(self, manager: CatalogManager, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.manager = manager
+        self.batch_size = batch_size
+        self.stats = {'rows_read': 0, 'rows_changed': 0, 'rows_unchanged': 0,
+                      'rows_unknown': 0, 'rows_invalid': 0, 'versions_published': 0, 'batches_dropped': 0}
+        self._indexed_catalog = None
+        self._rows_by_name: Dict[str, List[int]] = {}
+
+    def _row_lookup(self, catalog) -> Dict[str, List[int]]:
+        # Feed deltas never rename or move rows, so the lookup stays valid for every
+        # version this ingestor publishes; any other catalog (e.g. a hot reload) gets a fresh one.
+        # A model listed under several terrains or skill levels has several rows.
+        if catalog is not self._indexed_catalog:
+            self._rows_by_name = {}
+            for row, name in enumerate(catalog.names()):
+                self._rows_by_name.setdefault(name.lower(), []).append(row)
+            self._indexed_catalog = catalog
+        return self._rows_by_name
+
+    def _build_updates(self, catalog, rows: List[Any], counts: Dict[str, int]) -> Dict[int, SkiModel]:
+        """The changed records for a batch against one catalog version"""
+        lookup = self._row_lookup(catalog)
+        updates: Dict[int, SkiModel] = {}
+        for feed_row in rows:
+            counts['rows_read'] += 1
+            if not isinstance(feed_row, dict):
+                counts['rows_invalid'] += 1
+                continue
+
+            catalog_rows = lookup.get(str(feed_row.get('name', '')).strip().lower())
+            if not catalog_rows:
+                counts['rows_unknown'] += 1
+                continue
+
+            try:
+                changed = {}
+                for row in catalog_rows:
+                    current = updates.get(row) or catalog.skis[row]
+                    updated = apply_feed_row(current, feed_row)
+                    if updated is not current:
+                        changed[row] = updated
+            except (ValueError, TypeError):
+                counts['rows_invalid'] += 1
+                continue
+
+            if changed:
+                updates.update(changed)
+            else:
+                counts['rows_unchanged'] += 1
+        return updates
+
+    def apply_batch(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Apply one batch of feed rows; returns how many catalog rows changed"""
+        rows = list(rows)
+        for _ in range(MAX_PUBLISH_ATTEMPTS):
+            published = self.manager.current()
+            catalog = published.catalog
+            counts = dict.fromkeys(('rows_read', 'rows_unchanged', 'rows_unknown', 'rows_invalid'), 0)
+            updates = self._build_updates(catalog, rows, counts)
+
+            if updates:
+                new_catalog = catalog.with_updates(updates)
+                update_facet_index(catalog, new_catalog, updates)
+                carry_similarity_index(catalog, new_catalog)
+
+                # Someone else published since this batch read the catalog; rebuild on theirs
+                if self.manager.publish(new_catalog, expected_version=published.version) is None:
+                    continue
+                self._indexed_catalog = new_catalog
+                self.stats['versions_published'] += 1
+
+            for key, value in counts.items():
+                self.stats[key] += value
+            self.stats['rows_changed'] += len(updates)
+            return len(updates)
+
+        print(f"Dropping a price feed batch of {len(rows)} rows: the catalog kept changing underneath it")
+        self.stats['batches_dropped'] += 1
+        return 0
+
+    def ingest(self, feed: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Consume a feed stream batch by batch, then refresh derived indexes once"""
+        feed = iter(feed)
+        changed = 0
+        while True:
+            batch = list(islice(feed, self.batch_size))
+            if not batch:
+                break
+            changed += self.apply_batch(batch)
+
+        if changed:
+            refresh_similarity_index(self.manager.current().catalog)
+        return dict(self.stats)
+
+
+def start_feed_ingestion(source: str, manager: CatalogManager, batch_size: int = DEFAULT_BATCH_SIZE,
+                         format: Optional[str] = None) -> threading.Thread:
+    """Ingest a feed file or URL in a daemon thread so request threads never wait on it"""
+
+    def run():
+        try:
+            stats = FeedIngestor(manager, batch_size).ingest(iter_feed(source, format))
+            print(f"Price feed {source} ingested: {stats}")
+        except Exception as e:
+            print(f"Price feed {source} failed: {e}")
+
+    thread = threading.Thread(target=run, name="price-feed", daemon=True)
+    thread.start()
+    return thread
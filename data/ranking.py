@@ -0,0 +1,219 @@
+"""
+Multi-factor scoring and top-k selection for ski recommendations
+"""
+import numpy as np
+from typing import NamedTuple, Optional, Tuple
+
+from data.catalog_engine import GENDER_CODES, SKILL_CODES, TERRAIN_CODES, UNKNOWN_CODE, SkiCatalog
+
+
+class RankingWeights(NamedTuple):
+    skill: float = 3.0
+    terrain: float = 2.0
+    budget: float = 1.5
+    waist: float = 1.0
+    length: float = 1.0
+    gender: float = 0.5
+
+
+DEFAULT_WEIGHTS = RankingWeights()
+
+# Waist widths (mm) that suit each terrain; wider or narrower skis lose points
+IDEAL_WAIST = {
+    "all_mountain": (78, 95),
+    "powder": (98, 120),
+    "carving": (64, 78),
+    "park": (82, 98),
+    "backcountry": (95, 112),
+}
+
+# How quickly fit decays outside the ideal window
+WAIST_FALLOFF_MM = 20.0
+LENGTH_FALLOFF_CM = 10.0
+BUDGET_FALLOFF_FRACTION = 0.25
+
+# Skis for a skill level one step away still rank, just lower
+MAX_SKILL_DISTANCE = 1
+
+
+def _code_table(mapping, values, default):
+    """Lookup array indexed by code (offset by one so UNKNOWN_CODE maps to index 0)"""
+    table = np.full(max(mapping.values()) + 2, default, dtype=np.float32)
+    for key, code in mapping.items():
+        if key in values:
+            table[code + 1] = values[key]
+    return table
+
+
+_IDEAL_WAIST_LOW = _code_table(TERRAIN_CODES, {k: v[0] for k, v in IDEAL_WAIST.items()}, np.nan)
+_IDEAL_WAIST_HIGH = _code_table(TERRAIN_CODES, {k: v[1] for k, v in IDEAL_WAIST.items()}, np.nan)
+
+
+def _window_fit(values_low, values_high, target_low, target_high, falloff):
+    """
+    1.0 when [values_low, values_high] overlaps the target window, decaying linearly
+    to 0 with the gap. NaN targets mean "no preference" and score 1.0.
+    """
+    gap = np.maximum(np.maximum(values_low - target_high, target_low - values_high), 0)
+    fit = np.clip(1 - gap / falloff, 0, 1)
+    fit = np.where(np.isnan(fit), 0.0, fit)
+    no_preference = np.isnan(target_low) & np.isnan(target_high)
+    return np.where(no_preference, 1.0, fit)
+
+
+def score_skis(catalog: SkiCatalog, rows: np.ndarray, skill: np.ndarray, terrain: np.ndarray,
+               budget_low: np.ndarray, budget_high: np.ndarray, target_length: np.ndarray,
+               gender: np.ndarray, weights: RankingWeights = DEFAULT_WEIGHTS) -> np.ndarray:
+    """
+    Score catalog rows against a query. Query values are codes/numbers (NaN for
+    "not specified") and broadcast against the selected rows, so passing (B, 1)
+    arrays scores B profiles at once and returns a (B, len(rows)) matrix.
+    """
+    row_skill = catalog.skill[rows].astype(np.float32)
+    row_terrain = catalog.terrain[rows]
+    row_gender = catalog.gender[rows]
+
+    # Skill: exact level 1.0, one step away 0.5
+    skill_fit = np.where(
+        (skill == UNKNOWN_CODE) | (row_skill == UNKNOWN_CODE),
+        0.0,
+        np.clip(1 - np.abs(row_skill - skill) / (MAX_SKILL_DISTANCE + 1), 0, 1),
+    )
+
+    # Terrain: exact match 1.0, all-mountain skis are a reasonable fallback anywhere
+    all_mountain = TERRAIN_CODES["all_mountain"]
+    terrain_fit = np.where(row_terrain == terrain, 1.0, np.where(row_terrain == all_mountain, 0.5, 0.0))
+
+    # Budget: price band overlapping the budget window scores 1.0
+    budget_scale = np.where(np.isfinite(budget_high), budget_high, budget_low) * BUDGET_FALLOFF_FRACTION
+    budget_gap = np.maximum(
+        np.maximum(catalog.price_low[rows] - budget_high, budget_low - catalog.price_high[rows]), 0
+    )
+    budget_fit = np.where(
+        np.isnan(budget_low) & np.isnan(budget_high),
+        1.0,
+        np.nan_to_num(np.clip(1 - budget_gap / np.maximum(budget_scale, 1.0), 0, 1)),
+    )
+
+    # Waist: how close the ski's waist is to what suits the requested terrain
+    waist_fit = _window_fit(
+        catalog.waist_min[rows], catalog.waist_max[rows],
+        _IDEAL_WAIST_LOW[terrain + 1], _IDEAL_WAIST_HIGH[terrain + 1], WAIST_FALLOFF_MM,
+    )
+
+    # Length: whether the ski comes in the skier's target length
+    length_fit = _window_fit(
+        catalog.length_min[rows], catalog.length_max[rows], target_length, target_length, LENGTH_FALLOFF_CM,
+    )
+
+    # Gender: unisex skis suit everyone, gender-specific skis mostly suit their target
+    gender_fit = np.where(
+        (gender == GENDER_CODES["unisex"]) | (row_gender == gender),
+        1.0,
+        np.where(row_gender == GENDER_CODES["unisex"], 0.8, 0.2),
+    )
+
+    total = (
+        weights.skill * skill_fit
+        + weights.terrain * terrain_fit
+        + weights.budget * budget_fit
+        + weights.waist * waist_fit
+        + weights.length * length_fit
+        + weights.gender * gender_fit
+    )
+    return total / sum(weights)
+
+
+def candidate_mask(catalog: SkiCatalog, skill: int, terrain: int,
+                   budget: Optional[Tuple[float, float]] = None) -> np.ndarray:
+    """
+    Rows worth scoring: within one skill level, on the requested terrain or
+    all-mountain, and inside the budget when one is given
+    """
+    mask = catalog.price_index.overlap_mask(*budget) if budget else np.ones(len(catalog), dtype=bool)
+    mask &= np.abs(catalog.skill.astype(np.int16) - skill) <= MAX_SKILL_DISTANCE
+    mask &= catalog.skill != UNKNOWN_CODE
+    mask &= (catalog.terrain == terrain) | (catalog.terrain == TERRAIN_CODES["all_mountain"])
+    return mask
+
+
+def candidate_matrix(catalog: SkiCatalog, skill: np.ndarray, terrain: np.ndarray,
+                     budget_low: np.ndarray, budget_high: np.ndarray) -> np.ndarray:
+    """
+    Broadcasting form of candidate_mask for (B, 1) query arrays, returning a
+    (B, len(catalog)) mask. NaN budgets match every price.
+    """
+    row_skill = catalog.skill.astype(np.int16)
+    mask = (np.abs(row_skill - skill) <= MAX_SKILL_DISTANCE) & (row_skill != UNKNOWN_CODE) & (skill != UNKNOWN_CODE)
+    mask &= (catalog.terrain == terrain) | (catalog.terrain == TERRAIN_CODES["all_mountain"])
+
+    no_budget = np.isnan(budget_low) & np.isnan(budget_high)
+    in_budget = (catalog.price_low <= np.nan_to_num(budget_high, nan=np.inf)) & \
+                (catalog.price_high >= np.nan_to_num(budget_low, nan=-np.inf))
+    mask &= no_budget | in_budget
+    return mask
+
+
+def top_k_scored(scores: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pick the k best-scoring rows, ties broken by catalog order. rows must be
+    ascending, as candidate_mask and the tenant views produce them. A partition
+    finds the kth best score; every row above it is kept and ties at it are
+    filled in row order, so exactly k rows are sorted however many tie.
+    Returns the chosen rows and their scores, best first.
+    """
+    if len(rows) > k:
+        kth_score = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth_score)
+        at_kth = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        chosen = np.concatenate((above, at_kth))
+        scores, rows = scores[chosen], rows[chosen]
+
+    order = np.lexsort((rows, -scores))[:k]
+    return rows[order], scores[order]
+
+
+def top_k(scores: np.ndarray, rows: np.ndarray, k: int) -> np.ndarray:
+    """The k best-scoring rows, best first"""
+    return top_k_scored(scores, rows, k)[0]
+
+
+def rank_skis_scored(catalog: SkiCatalog, skill_level: str, terrain: str,
+                     budget: Optional[Tuple[float, float]] = None, gender: Optional[str] = None,
+                     target_length: Optional[float] = None, k: int = 3,
+                     weights: RankingWeights = DEFAULT_WEIGHTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row indices and scores of the k best skis for a profile, best first.
+    Scores are comparable across catalogs, so results from several shards can be merged.
+    """
+    skill = SKILL_CODES.get(skill_level, UNKNOWN_CODE)
+    terrain_code = TERRAIN_CODES.get(terrain, UNKNOWN_CODE)
+    if skill == UNKNOWN_CODE or k <= 0:
+        return np.array([], dtype=np.intp), np.array([], dtype=np.float32)
+
+    rows = np.flatnonzero(candidate_mask(catalog, skill, terrain_code, budget))
+    if not len(rows):
+        return rows, np.array([], dtype=np.float32)
+
+    budget_low, budget_high = budget if budget else (np.nan, np.nan)
+    scores = score_skis(
+        catalog, rows,
+        skill=np.float32(skill),
+        terrain=np.int8(terrain_code),
+        budget_low=np.float32(budget_low),
+        budget_high=np.float32(budget_high),
+        target_length=np.float32(np.nan if target_length is None else target_length),
+        gender=np.int8(GENDER_CODES.get(gender or "unisex", GENDER_CODES["unisex"])),
+        weights=weights,
+    )
+    return top_k_scored(scores, rows, k)
+
+
+def rank_skis(catalog: SkiCatalog, skill_level: str, terrain: str,
+              budget: Optional[Tuple[float, float]] = None, gender: Optional[str] = None,
+              target_length: Optional[float] = None, k: int = 3,
+              weights: RankingWeights = DEFAULT_WEIGHTS) -> np.ndarray:
+    """
+    Return the row indices of the k best skis for a profile, best first
+    """
+    return rank_skis_scored(catalog, skill_level, terrain, budget, gender, target_length, k, weights)[0]
@@ -0,0 +1,239 @@
+"""
+"Skis like my current skis" nearest-neighbour search over normalized spec vectors
+"""
+import heapq
+import re
+import threading
+import unicodedata
+import weakref
+import numpy as np
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from data.catalog_engine import TERRAIN_CODES, SkiCatalog
+
+# Relative importance of each feature once numeric columns are standardized
+FEATURE_WEIGHTS = {"waist": 1.5, "radius": 1.0, "length": 0.75, "price": 0.75}
+CATEGORY_WEIGHT = 1.0
+
+# Minimum name similarity before a mentioned ski counts as resolved
+MIN_NAME_SCORE = 0.55
+
+# Candidates with the most shared tokens that get a full SequenceMatcher comparison
+NAME_SHORTLIST = 8
+
+# Resolved mentions remembered per index
+RESOLVE_MEMO_SIZE = 1024
+
+
+def _midpoint(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    return (low.astype(np.float64) + high.astype(np.float64)) / 2
+
+
+def spec_vectors(catalog: SkiCatalog) -> np.ndarray:
+    """
+    One row per ski: standardized waist, radius, length and price midpoints
+    (missing values sit at the catalog mean) followed by a one-hot terrain category
+    """
+    numeric = {
+        "waist": catalog.waist.astype(np.float64),
+        "radius": _midpoint(catalog.radius_min, catalog.radius_max),
+        "length": _midpoint(catalog.length_min, catalog.length_max),
+        "price": _midpoint(catalog.price_low, catalog.price_high),
+    }
+
+    columns = []
+    for name, values in numeric.items():
+        mean = np.nanmean(values) if np.isfinite(values).any() else 0.0
+        std = np.nanstd(values) if np.isfinite(values).any() else 0.0
+        standardized = (values - mean) / (std if std > 0 else 1.0)
+        columns.append(np.nan_to_num(standardized) * FEATURE_WEIGHTS[name])
+
+    category = np.zeros((len(catalog), len(TERRAIN_CODES)))
+    known = catalog.terrain >= 0
+    category[np.flatnonzero(known), catalog.terrain[known]] = CATEGORY_WEIGHT
+
+    return np.column_stack(columns + [category]) if len(catalog) else np.zeros((0, 4 + len(TERRAIN_CODES)))
+
+
+class KDTree:
+    """
+    Static k-d tree over a point matrix. Splits on the widest dimension at the
+    median; leaves hold small blocks that are scanned with NumPy.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.leaf_size = leaf_size
+        self._order = np.arange(len(self.points))
+
+        # Parallel node arrays; leaves have split_dim == -1 and cover _order[start:end]
+        self._split_dim: List[int] = []
+        self._split_value: List[float] = []
+        self._children: List[Tuple[int, int]] = []
+        self._range: List[Tuple[int, int]] = []
+
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def _new_node(self, start: int, end: int) -> int:
+        self._split_dim.append(-1)
+        self._split_value.append(0.0)
+        self._children.append((-1, -1))
+        self._range.append((start, end))
+        return len(self._range) - 1
+
+    def _build(self, start: int, end: int) -> int:
+        node = self._new_node(start, end)
+        if end - start <= self.leaf_size:
+            return node
+
+        block = self.points[self._order[start:end]]
+        spread = block.max(axis=0) - block.min(axis=0)
+        dim = int(np.argmax(spread))
+        if spread[dim] == 0:
+            return node
+
+        middle = (end - start) // 2
+        partition = np.argpartition(block[:, dim], middle)
+        self._order[start:end] = self._order[start:end][partition]
+
+        self._split_dim[node] = dim
+        self._split_value[node] = float(self.points[self._order[start + middle], dim])
+        self._children[node] = (self._build(start, start + middle), self._build(start + middle, end))
+        return node
+
+    def query(self, point: np.ndarray, k: int = 5, exclude: Optional[int] = None) -> List[Tuple[float, int]]:
+        """The k nearest points as (distance, row) pairs, nearest first"""
+        if not len(self.points) or k <= 0:
+            return []
+
+        point = np.asarray(point, dtype=np.float64)
+        best: List[Tuple[float, int]] = []  # max-heap via negated squared distances
+
+        def worst() -> float:
+            return -best[0][0] if len(best) == k else np.inf
+
+        def visit(node: int):
+            dim = self._split_dim[node]
+            if dim < 0:
+                start, end = self._range[node]
+                rows = self._order[start:end]
+                distances = ((self.points[rows] - point) ** 2).sum(axis=1)
+                closer = distances < worst()
+                for distance, row in zip(distances[closer], rows[closer]):
+                    if row == exclude:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, int(row)))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, int(row)))
+                return
+
+            diff = point[dim] - self._split_value[node]
+            near, far = self._children[node] if diff < 0 else self._children[node][::-1]
+            visit(near)
+            if diff * diff < worst():
+                visit(far)
+
+        visit(0)
+        return [(float(np.sqrt(-d)), row) for d, row in sorted(best, reverse=True)]
+
+
+def _normalize_name(name: str) -> str:
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+class SimilarityIndex:
+    """Spec-space k-d tree plus a token index for resolving ski names mentioned in conversation"""
+
+    def __init__(self, catalog: SkiCatalog):
+        self.catalog = catalog
+        self.vectors = spec_vectors(catalog)
+        self.tree = KDTree(self.vectors)
+
+        self._names = [_normalize_name(name) for name in catalog.names()]
+        self._name_sizes = np.array([len(set(name.split())) for name in self._names], dtype=np.float64)
+        postings: Dict[str, List[int]] = {}
+        for row, name in enumerate(self._names):
+            for token in set(name.split()):
+                postings.setdefault(token, []).append(row)
+        self._tokens = {token: np.array(rows, dtype=np.intp) for token, rows in postings.items()}
+
+        self._resolved: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self._resolved_lock = threading.Lock()
+
+    def resolve(self, text: str) -> Optional[int]:
+        """Row of the catalog ski best matching a free-text mention, or None"""
+        query = _normalize_name(text or "")
+        with self._resolved_lock:
+            if query in self._resolved:
+                self._resolved.move_to_end(query)
+                return self._resolved[query]
+
+        row = self._resolve(query)
+        with self._resolved_lock:
+            self._resolved[query] = row
+            if len(self._resolved) > RESOLVE_MEMO_SIZE:
+                self._resolved.popitem(last=False)
+        return row
+
+    def _resolve(self, query: str) -> Optional[int]:
+        tokens = set(query.split())
+        postings = [self._tokens[token] for token in tokens if token in self._tokens]
+        if not postings:
+            return None
+
+        # Token overlap comes straight from the posting lists; only the rows
+        # sharing the most tokens are worth a character-level comparison
+        candidates, shared = np.unique(np.concatenate(postings), return_counts=True)
+        overlap = shared / self._name_sizes[candidates]
+        shortlist = np.lexsort((candidates, -overlap))[:NAME_SHORTLIST]
+
+        best_row, best_score = None, MIN_NAME_SCORE
+        for position in shortlist:
+            row = int(candidates[position])
+            score = 0.6 * overlap[position] + 0.4 * SequenceMatcher(None, query, self._names[row]).ratio()
+            if score > best_score or (score == best_score and best_row is not None and row < best_row):
+                best_row, best_score = row, score
+        return best_row
+
+    def nearest(self, row: int, k: int = 3) -> List[int]:
+        """Rows of the k skis closest to a catalog row, excluding the row itself"""
+        return [neighbour for _, neighbour in self.tree.query(self.vectors[row], k=k, exclude=row)]
+
+
+_INDEXES = weakref.WeakKeyDictionary()
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_similarity_index(catalog: SkiCatalog) -> SimilarityIndex:
+    """The similarity index for a catalog, built once per catalog version"""
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(catalog)
+        if index is None:
+            index = SimilarityIndex(catalog)
+            _INDEXES[catalog] = index
+        return index
+
+
+def carry_similarity_index(old_catalog: SkiCatalog, new_catalog: SkiCatalog):
+    """
+    Reuse an existing similarity index for a catalog derived with with_updates().
+    Rows keep their positions, so neighbours stay valid; price features may lag
+    until the index is rebuilt with refresh_similarity_index().
+    """
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(old_catalog)
+        if index is not None:
+            _INDEXES[new_catalog] = index
+
+
+def refresh_similarity_index(catalog: SkiCatalog) -> SimilarityIndex:
+    """Rebuild a catalog's similarity index from its current columns"""
+    index = SimilarityIndex(catalog)
+    with _INDEXES_LOCK:
+        _INDEXES[catalog] = index
+    return index
@@ -0,0 +1,162 @@
+"""
+Ski length sizing from height, weight and skill, intersected with the catalog's length ranges
+"""
+import re
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Target length relative to height (cm) per skill: shorter skis turn easier,
+# longer skis are more stable at speed
+SKILL_LENGTH_OFFSETS = {
+    "beginner": (-20, -10),
+    "intermediate": (-12, -2),
+    "advanced": (-6, 5),
+    "expert": (-2, 10),
+}
+
+# Powder and touring skis are usually sized longer, carving and park skis shorter
+TERRAIN_LENGTH_ADJUSTMENTS = {"powder": 5, "backcountry": 3, "carving": -3, "park": -3}
+
+# Skiers heavier or lighter than typical for their height size up or down
+HEAVY_ADJUSTMENT_CM = 5
+LIGHT_ADJUSTMENT_CM = -5
+WEIGHT_TOLERANCE_KG = 12
+
+# Catalogs only list a length range; models are assumed to come in this step from the shortest size
+SIZE_STEP_CM = 7
+
+_CM_PATTERN = re.compile(r"(\d{3}(?:\.\d+)?)\s*cm\b|(1\.\d{1,2})\s*m\b", re.IGNORECASE)
+_FEET_PATTERN = re.compile(r"\b(\d)\s*(?:'|’|ft|foot|feet)\s*(?:(\d{1,2}(?:\.\d+)?)(?!\d)\s*(?:\"|”|''|in|inch|inches)?)?", re.IGNORECASE)
+_KG_PATTERN = re.compile(r"(\d{2,3}(?:\.\d+)?)\s*(?:kg|kgs|kilos?|kilograms?)\b", re.IGNORECASE)
+_LBS_PATTERN = re.compile(r"(\d{2,3}(?:\.\d+)?)\s*(?:lb|lbs|pounds?)\b", re.IGNORECASE)
+
+
+def height_mention(text: str) -> Optional[Tuple[float, int, int]]:
+    """The first height in text, in cm, with the (start, end) of where it was read"""
+    match = _CM_PATTERN.search(text)
+    if match:
+        height = float(match.group(1)) if match.group(1) else float(match.group(2)) * 100
+        return height, match.start(), match.end()
+
+    match = _FEET_PATTERN.search(text)
+    if match:
+        inches = int(match.group(1)) * 12 + float(match.group(2) or 0)
+        return inches * 2.54, match.start(), match.end()
+    return None
+
+
+def parse_physical_stats(stats: Any) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Read (height_cm, weight_kg) from free text such as 5'10" and 170 lbs or
+    178cm, 75kg, or from a dict with height/weight entries
+    """
+    if isinstance(stats, dict):
+        text = " ".join(str(value) for value in stats.values())
+    elif isinstance(stats, str):
+        text = stats
+    else:
+        return None, None
+
+    mention = height_mention(text)
+    height = mention[0] if mention else None
+
+    weight = None
+    match = _KG_PATTERN.search(text)
+    if match:
+        weight = float(match.group(1))
+    else:
+        match = _LBS_PATTERN.search(text)
+        if match:
+            weight = float(match.group(1)) * 0.4536
+
+    return height, weight
+
+
+def target_length_window(height_cm: float, weight_kg: Optional[float] = None,
+                         skill_level: str = "intermediate",
+                         terrain: Optional[str] = None) -> Tuple[float, float]:
+    """The (shortest, longest) ski length in cm that suits this skier"""
+    low_offset, high_offset = SKILL_LENGTH_OFFSETS.get(skill_level, SKILL_LENGTH_OFFSETS["intermediate"])
+    adjustment = TERRAIN_LENGTH_ADJUSTMENTS.get(terrain, 0)
+
+    if weight_kg is not None:
+        # Rough typical weight for a height: height in cm minus 100
+        typical_weight = height_cm - 100
+        if weight_kg > typical_weight + WEIGHT_TOLERANCE_KG:
+            adjustment += HEAVY_ADJUSTMENT_CM
+        elif weight_kg < typical_weight - WEIGHT_TOLERANCE_KG:
+            adjustment += LIGHT_ADJUSTMENT_CM
+
+    return height_cm + low_offset + adjustment, height_cm + high_offset + adjustment
+
+
+def target_length_for(physical_stats: Any, skill_level: str = "intermediate",
+                      terrain: Optional[str] = None) -> Optional[float]:
+    """The middle of the skier's target length window, or None when height is unknown"""
+    height, weight = parse_physical_stats(physical_stats)
+    if height is None:
+        return None
+    low, high = target_length_window(height, weight, skill_level, terrain)
+    return round((low + high) / 2)
+
+
+def fit_lengths(length_min: np.ndarray, length_max: np.ndarray, window: Tuple[float, float],
+                step: float = SIZE_STEP_CM) -> List[List[float]]:
+    """
+    For every ski at once, the sizes it comes in (length_min, +step, ... up to
+    length_max, plus length_max itself) that fall inside the target window
+    """
+    length_min = np.asarray(length_min, dtype=np.float64)
+    length_max = np.asarray(length_max, dtype=np.float64)
+    if not len(length_min):
+        return []
+
+    known = np.isfinite(length_min) & np.isfinite(length_max)
+    spans = np.where(known, length_max - length_min, 0)
+    steps = int(np.max(spans) // step) + 2
+
+    # (skis x steps) grid of offered sizes; the last column is the longest size
+    sizes = length_min[:, None] + step * np.arange(steps)[None, :]
+    offered = sizes < length_max[:, None]
+    sizes[:, -1] = length_max
+    offered[:, -1] = known
+
+    fits = offered & (sizes >= window[0]) & (sizes <= window[1])
+    return [sorted(set(np.round(row_sizes[row_fits]).tolist())) for row_sizes, row_fits in zip(sizes, fits)]
+
+
+def size_skis(skis: Sequence[Any], physical_stats: Any, skill_level: str = "intermediate",
+              terrain: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Sizing advice for a list of SkiModel records: the skier's target window and the
+    lengths each ski can be ordered in within it. None when height is unknown.
+    """
+    height, weight = parse_physical_stats(physical_stats)
+    if height is None:
+        return None
+
+    window = target_length_window(height, weight, skill_level, terrain)
+    lengths = [ski.length or (np.nan, np.nan) for ski in skis]
+    length_min = np.array([low for low, _ in lengths], dtype=np.float64)
+    length_max = np.array([high for _, high in lengths], dtype=np.float64)
+
+    return {
+        'height_cm': height,
+        'weight_kg': weight,
+        'window': window,
+        'sizes': list(zip(skis, fit_lengths(length_min, length_max, window))),
+    }
+
+
+def describe_sizing(sizing: Dict[str, Any]) -> str:
+    """Plain-language sizing answer suitable for speaking back to the user"""
+    low, high = sizing['window']
+    lines = [f"Based on your height and ability, you want skis between {low:.0f} and {high:.0f}cm."]
+
+    for ski, sizes in sizing['sizes']:
+        if sizes:
+            lines.append(f"The {ski.name} comes in {', '.join(f'{size:.0f}' for size in sizes)}cm for you.")
+        else:
+            lines.append(f"The {ski.name} doesn't come in a length in that range.")
+
+    return " ".join(lines)
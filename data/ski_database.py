@@ -1,6 +1,28 @@
 """
 Comprehensive ski database with current models, prices, and retailer links
 """
+import os
+import sys
+import threading
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from data.catalog_compiler import compile_rows, flatten_database
+from data.catalog_engine import SkiCatalog
+from data.catalog_io import load_catalog
+from data.catalog_manager import CatalogManager, RecommendationList
+from data.catalog_shards import ShardedCatalog, recommend_from_catalogs
+from data.facets import describe_count, get_facet_index
+from data.keyword_matcher import get_keyword_matcher
+from data.parsing import parse_budget, parse_gender
+from data.query_cache import RecommendationCache
+from data.ranking import rank_skis
+from data.sizing import target_length_for
+from data.similarity import get_similarity_index
+from data.tenant_catalog import TenantRegistry
 
 SKI_DATABASE = {
     "all_mountain": {
@@ -111,27 +133,318 @@ SKI_DATABASE = {
     }
 }
 
-def get_ski_recommendations(skill_level, terrain_preference, budget_range=None, gender=None):
+_CATALOG_MANAGER = None
+_CATALOG_MANAGER_LOCK = threading.Lock()
+
+# Memo of recent queries, keyed on the normalized query plus catalog version
+RECOMMENDATION_CACHE = RecommendationCache(Config.RECOMMENDATION_CACHE_SIZE)
+
+def _load_configured_catalog():
     """
-    Get ski recommendations based on user preferences
+    Load the configured catalog file (via its memory-mapped snapshot), or SKI_DATABASE.
+    Either way every record has been validated and normalized by the catalog compiler.
     """
-    recommendations = []
+    if Config.CATALOG_PATH:
+        snapshot_path = Config.CATALOG_SNAPSHOT_PATH or Config.CATALOG_PATH + ".snap"
+        catalog = load_catalog(Config.CATALOG_PATH, snapshot_path)
+    else:
+        skis, issues = compile_rows(flatten_database(SKI_DATABASE))
+        for issue in issues:
+            print(f"Built-in catalog: {issue}")
+        catalog = SkiCatalog(skis)
     
-    # Match terrain preference
-    terrain_key = None
-    if "powder" in terrain_preference.lower() or "deep" in terrain_preference.lower():
-        terrain_key = "powder"
-    elif "carving" in terrain_preference.lower() or "groomed" in terrain_preference.lower():
-        terrain_key = "carving"
+    # Facet bitmaps come straight from the columns, so build them as part of loading.
+    # The similarity index reads every name and is left until the first lookup.
+    get_facet_index(catalog)
+    return catalog
+
+def get_catalog_manager():
+    """
+    Get the process-wide catalog manager, creating it on first use. When a catalog
+    file is configured, it is watched and hot-reloaded in the background.
+    """
+    global _CATALOG_MANAGER
+    if _CATALOG_MANAGER is None:
+        with _CATALOG_MANAGER_LOCK:
+            if _CATALOG_MANAGER is None:
+                manager = CatalogManager(
+                    _load_configured_catalog,
+                    source_path=Config.CATALOG_PATH,
+                    poll_interval=Config.CATALOG_RELOAD_INTERVAL or 5.0
+                )
+                # Entries for old versions can never hit again, so free them on reload
+                manager.add_listener(lambda published: RECOMMENDATION_CACHE.clear())
+                if Config.CATALOG_RELOAD_INTERVAL > 0:
+                    manager.start_watching()
+                _CATALOG_MANAGER = manager
+    return _CATALOG_MANAGER
+
+_SHARDED_CATALOG = None
+
+def get_sharded_catalog():
+    """
+    Get the regional shard set when SKI_CATALOG_SHARD_DIR is configured, else None.
+    Shards load on first query and are evicted after sitting idle.
+    """
+    global _SHARDED_CATALOG
+    if _SHARDED_CATALOG is None and Config.CATALOG_SHARD_DIR:
+        with _CATALOG_MANAGER_LOCK:
+            if _SHARDED_CATALOG is None:
+                sharded = ShardedCatalog.from_directory(
+                    Config.CATALOG_SHARD_DIR,
+                    region_shards=Config.REGION_SHARDS,
+                    idle_timeout=Config.CATALOG_SHARD_IDLE_SECONDS,
+                    reload_interval=Config.CATALOG_RELOAD_INTERVAL,
+                    default_region=Config.DEFAULT_REGION
+                )
+                # As with the global catalog, memo entries for old shard versions can never hit again
+                sharded.add_listener(lambda published: RECOMMENDATION_CACHE.clear())
+                sharded.start_janitor()
+                _SHARDED_CATALOG = sharded
+    return _SHARDED_CATALOG
+
+_TENANT_REGISTRY = None
+
+def get_tenant_registry():
+    """
+    Get the tenant overlays from SKI_TENANT_DIR, loaded on first use
+    """
+    global _TENANT_REGISTRY
+    if _TENANT_REGISTRY is None:
+        with _CATALOG_MANAGER_LOCK:
+            if _TENANT_REGISTRY is None:
+                _TENANT_REGISTRY = TenantRegistry(Config.TENANT_DIR)
+    return _TENANT_REGISTRY
+
+def get_catalog():
+    """
+    Get the currently published catalog
+    """
+    return get_catalog_manager().current().catalog
+
+def _region_key(region):
+    """Canonical region code for free text, or the default region"""
+    matcher = get_keyword_matcher()
+    return matcher.match_field(str(region or ""), "region") or str(region or Config.DEFAULT_REGION).lower()
+
+def get_region_catalogs(region=None):
+    """
+    The catalog versions serving a region as (name, CatalogVersion) pairs: the
+    region's shards when sharding is configured (loading only those), else the
+    global catalog under the name None
+    """
+    sharded = get_sharded_catalog()
+    if sharded is None:
+        return [(None, get_catalog_manager().current())]
+    return [(shard.name, shard.current()) for shard in sharded.shards_for(_region_key(region))]
+
+def _catalog_version(catalogs):
+    """Version tag for results read from these catalogs, as ShardedCatalog.recommend tags them"""
+    if len(catalogs) == 1 and catalogs[0][0] is None:
+        return catalogs[0][1].version
+    return tuple((name, published.version) for name, published in catalogs)
+
+def get_catalog_version(region=None):
+    """
+    Version tag of the catalog(s) serving a region
+    """
+    return _catalog_version(get_region_catalogs(region))
+
+def get_loaded_catalogs():
+    """
+    Catalogs already in memory, for background sweeps: the loaded shards when
+    sharding is configured, so a sweep never loads a shard or the global catalog
+    """
+    sharded = get_sharded_catalog()
+    if sharded is None:
+        return [get_catalog()]
+    return [published.catalog for published in sharded.loaded_versions()]
+
+def add_catalog_listener(listener):
+    """
+    Call listener(version) whenever the global catalog or, with sharding, any shard publishes
+    """
+    sharded = get_sharded_catalog()
+    if sharded is None:
+        get_catalog_manager().add_listener(listener)
     else:
-        terrain_key = "all_mountain"
+        sharded.add_listener(listener)
+
+def get_ski_recommendations(skill_level, terrain_preference, budget_range=None, gender=None, tenant=None,
+                            physical_stats=None):
+    """
+    Get ski recommendations based on user preferences. With a tenant, the shop's
+    prices, exclusions and links are applied on top of the shared catalog.
+    Height and weight in physical_stats favour skis offered in the skier's length.
+    """
+    # Pin one catalog version for the whole query so a concurrent reload can't mix versions
+    published = get_catalog_manager().current()
+    catalog = published.catalog
+    registry = get_tenant_registry()
+    # Read the overlay generation before the view, so a concurrent add() can only make the key older
+    overlay_generation = registry.generation
+    tenant_view = registry.view(tenant, catalog) if tenant else None
+    budget = parse_budget(budget_range)
+    
+    # Normalize free-text terrain and skill to canonical codes in one pass each
+    matcher = get_keyword_matcher()
+    terrain_key = matcher.match_field(terrain_preference, "terrain") or "all_mountain"
+    skill_level = matcher.match_field(skill_level, "skill") or skill_level
+    
+    gender_key = parse_gender(gender)
+    target_length = target_length_for(physical_stats, skill_level, terrain_key)
+    
+    # Score skis for terrain, skill level, budget, gender and length; all-mountain
+    # skis rank below exact terrain matches as the fallback
+    def rank():
+        if tenant_view is not None:
+            best_rows = tenant_view.rank(skill_level, terrain_key, budget, gender_key, target_length, k=3)
+            return tuple(tenant_view.rows_at(best_rows))
+        
+        best_rows = rank_skis(
+            catalog,
+            skill_level=skill_level,
+            terrain=terrain_key,
+            budget=budget,
+            gender=gender_key,
+            target_length=target_length,
+            k=3
+        )
+        return tuple(catalog.rows_at(best_rows))
+    
+    tenant_key = (tenant, overlay_generation) if tenant_view is not None else None
+    cache_key = (skill_level, terrain_key, budget, gender_key, target_length, 3, published.version, tenant_key)
+    skis = RECOMMENDATION_CACHE.get_or_compute(cache_key, rank)
+    
+    # Return top 3 recommendations
+    return RecommendationList(skis, catalog_version=published.version)
+
+def get_regional_recommendations(region, skill_level, terrain_preference, budget_range=None, gender=None,
+                                 physical_stats=None):
+    """
+    Get ski recommendations from the catalog shards serving a region. Falls back
+    to the global catalog when sharding isn't configured.
+    """
+    sharded = get_sharded_catalog()
+    if sharded is None:
+        return get_ski_recommendations(skill_level, terrain_preference, budget_range, gender,
+                                       physical_stats=physical_stats)
+    
+    # Pin the region's shard versions once; they are both the memo key and what gets ranked
+    catalogs = get_region_catalogs(region)
+    catalog_version = _catalog_version(catalogs)
     
-    # Get skis for terrain and skill level
-    if terrain_key in SKI_DATABASE and skill_level in SKI_DATABASE[terrain_key]:
-        recommendations.extend(SKI_DATABASE[terrain_key][skill_level])
+    matcher = get_keyword_matcher()
+    skill_level = matcher.match_field(skill_level, "skill") or skill_level
+    terrain_key = matcher.match_field(terrain_preference, "terrain") or "all_mountain"
+    budget = parse_budget(budget_range)
+    gender_key = parse_gender(gender)
+    target_length = target_length_for(physical_stats, skill_level, terrain_key)
     
-    # If specific terrain doesn't have options, fall back to all-mountain
-    if not recommendations and skill_level in SKI_DATABASE["all_mountain"]:
-        recommendations.extend(SKI_DATABASE["all_mountain"][skill_level])
+    def rank():
+        return tuple(recommend_from_catalogs(
+            catalogs,
+            skill_level=skill_level,
+            terrain=terrain_key,
+            budget=budget,
+            gender=gender_key,
+            target_length=target_length,
+            k=3
+        ))
     
-    return recommendations[:3]  # Return top 3 recommendations
\ No newline at end of file
+    cache_key = (skill_level, terrain_key, budget, gender_key, target_length, 3, catalog_version, None)
+    skis = RECOMMENDATION_CACHE.get_or_compute(cache_key, rank)
+    return RecommendationList(skis, catalog_version=catalog_version)
+
+def get_skis_by_specs(waist=None, length=None, radius=None, skill_level=None, terrain=None, limit=None,
+                      region=None, tenant=None):
+    """
+    Look up skis by numeric specs. Each spec is a single value (e.g. length=178
+    for "available at 178cm") or a (low, high) window (e.g. waist=(95, 105)).
+    With sharding, only the region's shards are searched. With a tenant, the
+    shop's exclusions, prices and links apply.
+    """
+    catalogs = get_region_catalogs(region)
+    skis = []
+    for _, published in catalogs:
+        catalog = published.catalog
+        view = get_tenant_registry().view(tenant, catalog) if tenant else None
+        mask = catalog.spec_mask(waist=waist, length=length, radius=radius)
+        mask &= catalog.mask(terrain=terrain, skill_level=skill_level)
+        rows = np.flatnonzero(mask)
+        if view is not None:
+            rows = view.visible_rows(rows)
+        if limit is not None:
+            rows = rows[:limit - len(skis)]
+        skis += (view or catalog).rows_at(rows)
+        if limit is not None and len(skis) >= limit:
+            break
+    
+    return RecommendationList(skis, catalog_version=_catalog_version(catalogs))
+
+def find_similar_skis(current_skis, k=3, region=None, tenant=None):
+    """
+    Find catalog skis similar to the ones a user mentions owning. Returns the
+    resolved catalog ski (or None) and its nearest neighbours in spec space,
+    from the first of the region's catalogs that knows the ski. With a tenant,
+    only skis the shop carries are suggested, at the shop's prices.
+    """
+    catalogs = get_region_catalogs(region)
+    for _, published in catalogs:
+        catalog = published.catalog
+        index = get_similarity_index(catalog)
+        row = index.resolve(str(current_skis or ""))
+        if row is None:
+            continue
+        
+        view = get_tenant_registry().view(tenant, catalog) if tenant else None
+        if view is None:
+            neighbours = catalog.rows_at(index.nearest(row, k=k))
+            return catalog.skis[row], RecommendationList(neighbours, catalog_version=_catalog_version(catalogs))
+        
+        # Ask for enough neighbours that k remain after the shop's exclusions
+        nearest = view.visible_rows(index.nearest(row, k=k + len(view.excluded_rows)))[:k]
+        neighbours = view.rows_at(nearest)
+        return view.skis[row], RecommendationList(neighbours, catalog_version=_catalog_version(catalogs))
+    
+    return None, RecommendationList(catalog_version=_catalog_version(catalogs))
+
+def _facet_bitmaps(catalogs, tenant, max_price, **filters):
+    """(catalog or tenant view, facet index, packed bitmap) for each of a region's catalogs"""
+    for _, published in catalogs:
+        catalog = published.catalog
+        facets = get_facet_index(catalog)
+        view = get_tenant_registry().view(tenant, catalog) if tenant else None
+        if view is None:
+            yield catalog, facets, facets.select(max_price=max_price, **filters)
+        else:
+            yield view, facets, view.facet_bitmap(facets, max_price=max_price, **filters)
+
+def count_skis(terrain=None, skill_level=None, max_price=None, waist_band=None, region=None, tenant=None):
+    """
+    Count catalog skis matching facet filters from the precomputed bitmaps.
+    Returns the count and a summary like "14 powder skis under $700 for intermediate skiers".
+    """
+    count = sum(
+        facets.popcount(bitmap)
+        for _, facets, bitmap in _facet_bitmaps(get_region_catalogs(region), tenant, max_price, terrain=terrain,
+                                                skill=skill_level, waist_band=waist_band)
+    )
+    return count, describe_count(count, terrain, skill_level, max_price)
+
+def get_skis_by_facets(terrain=None, skill_level=None, max_price=None, waist_band=None, limit=None, region=None,
+                       tenant=None):
+    """
+    Skis matching facet filters, selected with bitmap ANDs instead of a scan
+    """
+    catalogs = get_region_catalogs(region)
+    skis = []
+    for catalog, facets, bitmap in _facet_bitmaps(catalogs, tenant, max_price, terrain=terrain, skill=skill_level,
+                                                  waist_band=waist_band):
+        rows = facets.bitmap_rows(bitmap)
+        if limit is not None:
+            rows = rows[:limit - len(skis)]
+        skis += catalog.rows_at(rows)
+        if limit is not None and len(skis) >= limit:
+            break
+    return RecommendationList(skis, catalog_version=_catalog_version(catalogs))
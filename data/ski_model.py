@@ -0,0 +1,153 @@
+"""
+Compact immutable record type for catalog skis
+"""
+import sys
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from data.parsing import parse_range, parse_specs
+
+Range = Optional[Tuple[float, float]]
+
+_SLUG_PLACEHOLDER = "{slug}"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class RetailerLink(NamedTuple):
+    """
+    A retailer link stored as an interned retailer name, an interned URL template
+    shared by every ski from that retailer, and the ski-specific slug.
+    """
+    retailer: str
+    template: str
+    slug: str
+
+    @classmethod
+    def from_url(cls, retailer: str, url: str) -> "RetailerLink":
+        prefix, _, slug = url.rpartition("/")
+        if not prefix or "://" not in prefix:
+            # Bare host or unusual URL: keep it whole rather than guess a template
+            return cls(_intern(retailer), _SLUG_PLACEHOLDER, url)
+        return cls(_intern(retailer), _intern(prefix + "/" + _SLUG_PLACEHOLDER), slug)
+
+    @property
+    def url(self) -> str:
+        return self.template.replace(_SLUG_PLACEHOLDER, self.slug)
+
+
+class SkiModel:
+    """
+    Immutable catalog record. Uses __slots__ and interned strings so the catalog
+    and every session holding recommendations share one small object per ski.
+    Supports read-only mapping access (ski['name'], ski['retailers']) so code
+    written against the original dict entries keeps working.
+    """
+
+    __slots__ = (
+        'name', 'terrain', 'skill_level', 'price_range', 'price', 'description',
+        'links', 'spec_text', 'length', 'waist', 'radius',
+    )
+
+    def __init__(self, name: str, terrain: str, skill_level: str, price_range: str,
+                 description: str, links: Tuple[RetailerLink, ...],
+                 spec_text: Tuple[Tuple[str, str], ...]):
+        set_field = object.__setattr__
+        set_field(self, 'name', name)
+        set_field(self, 'terrain', _intern(terrain))
+        set_field(self, 'skill_level', _intern(skill_level))
+        set_field(self, 'price_range', price_range)
+        set_field(self, 'price', parse_range(price_range))
+        set_field(self, 'description', description)
+        set_field(self, 'links', tuple(links))
+        set_field(self, 'spec_text', tuple((_intern(k), _intern(v)) for k, v in spec_text))
+
+        specs = parse_specs(dict(spec_text))
+        set_field(self, 'length', specs.get('length'))
+        set_field(self, 'waist', specs.get('waist'))
+        set_field(self, 'radius', specs.get('radius'))
+
+    @classmethod
+    def from_dict(cls, ski: Dict[str, Any], terrain: str, skill_level: str) -> "SkiModel":
+        """Build a record from a SKI_DATABASE-style dict entry"""
+        links = tuple(
+            RetailerLink.from_url(retailer, url)
+            for retailer, url in ski.get('retailers', {}).items()
+        )
+        return cls(
+            name=ski['name'],
+            terrain=terrain,
+            skill_level=skill_level,
+            price_range=ski.get('price_range', ''),
+            description=ski.get('description', ''),
+            links=links,
+            spec_text=tuple((ski.get('specs') or {}).items()),
+        )
+
+    def replace(self, **changes) -> "SkiModel":
+        """A copy of this record with some constructor fields changed"""
+        fields = {
+            'name': self.name,
+            'terrain': self.terrain,
+            'skill_level': self.skill_level,
+            'price_range': self.price_range,
+            'description': self.description,
+            'links': self.links,
+            'spec_text': self.spec_text,
+        }
+        fields.update(changes)
+        return SkiModel(**fields)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("SkiModel records are immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("SkiModel records are immutable")
+
+    def __repr__(self) -> str:
+        return f"SkiModel({self.name!r}, {self.terrain!r}, {self.skill_level!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SkiModel):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.terrain, self.skill_level, self.price_range))
+
+    def __reduce__(self):
+        return (SkiModel, (self.name, self.terrain, self.skill_level, self.price_range,
+                           self.description, self.links, self.spec_text))
+
+    @property
+    def retailers(self) -> Dict[str, str]:
+        return {link.retailer: link.url for link in self.links}
+
+    @property
+    def specs(self) -> Dict[str, str]:
+        return dict(self.spec_text)
+
+    # Read-only mapping interface, matching the original dict entries
+    _MAPPING_KEYS = ('name', 'price_range', 'description', 'retailers', 'specs')
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._MAPPING_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._MAPPING_KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._MAPPING_KEYS)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def keys(self):
+        return self._MAPPING_KEYS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the SKI_DATABASE entry format"""
+        return {key: self[key] for key in self._MAPPING_KEYS}
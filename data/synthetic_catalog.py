@@ -0,0 +1,165 @@
+"""
+Deterministic synthetic ski catalogs for exercising the engine at realistic sizes
+"""
+import json
+import numpy as np
+from typing import Any, Dict, Iterator, List
+
+from data.catalog_engine import SKILL_CODES, TERRAIN_CODES, SkiCatalog
+from data.ski_model import RetailerLink, SkiModel
+
+BRANDS = ["Atomic", "Black Crows", "Blizzard", "Dynastar", "Elan", "Faction", "Fischer", "Head", "K2",
+          "Kästle", "Line", "Nordica", "Rossignol", "Salomon", "Armada", "Stöckli", "Völkl", "DPS", "Moment",
+          "4FRNT", "Icelantic", "J Skis", "Liberty", "Majesty", "Ogaso", "Scott", "Sego", "Voile", "Wagner", "ZAG"]
+SERIES = ["Bent", "Enforcer", "Mantra", "Ripstick", "Sender", "Kore", "Deacon", "QST", "Mindbender", "Blade",
+          "Rustler", "Maverick", "Experience", "Redster", "Wailer", "Vision", "Ranger", "Santa Ana", "Pescado",
+          "Commander", "Backland", "Zero G", "Stance", "Reckoner", "Atris", "Sheeva", "Black Pearl", "Wildcat"]
+SUFFIXES = ["", " Ti", " C", " CI", " Pro", " W", " Tour", " Alloy", " Carbon", " LT"]
+DESCRIPTORS = ["Playful", "Stable", "Damp", "Lively", "Forgiving", "Precise", "Lightweight", "Powerful"]
+
+# (retailer, URL template) pairs; every generated ski is stocked by a few of them
+RETAILERS = [
+    ("REI", "https://www.rei.com/product/{slug}"),
+    ("Evo", "https://www.evo.com/skis/{slug}"),
+    ("Backcountry", "https://www.backcountry.com/{slug}"),
+    ("Christy Sports", "https://www.christysports.com/{slug}"),
+    ("Peter Glenn", "https://www.peterglenn.com/{slug}"),
+    ("Blue Tomato", "https://www.blue-tomato.com/{slug}"),
+    ("Sport Chek", "https://www.sportchek.ca/{slug}"),
+    ("Snowleader", "https://www.snowleader.com/{slug}"),
+]
+
+# Waist width (mm) ranges by terrain and starting price by skill level
+_WAIST_BY_TERRAIN = {"all_mountain": (78, 100), "powder": (98, 125), "carving": (64, 80),
+                     "park": (82, 100), "backcountry": (88, 112)}
+_PRICE_BY_SKILL = {"beginner": 300, "intermediate": 450, "advanced": 600, "expert": 750}
+
+# Catalog mix; all-mountain skis dominate real catalogs
+_TERRAIN_WEIGHTS = {"all_mountain": 0.4, "powder": 0.2, "carving": 0.15, "park": 0.1, "backcountry": 0.15}
+_SKILL_WEIGHTS = {"beginner": 0.2, "intermediate": 0.35, "advanced": 0.3, "expert": 0.15}
+
+
+def _columns(count: int, seed: int) -> Dict[str, np.ndarray]:
+    """Draw every numeric attribute of the catalog at once"""
+    rng = np.random.default_rng(seed)
+    terrains = list(TERRAIN_CODES)
+    skills = list(SKILL_CODES)
+
+    terrain = rng.choice(len(terrains), count, p=[_TERRAIN_WEIGHTS[t] for t in terrains])
+    skill = rng.choice(len(skills), count, p=[_SKILL_WEIGHTS[s] for s in skills])
+
+    waist_low = np.array([_WAIST_BY_TERRAIN[t][0] for t in terrains])[terrain]
+    waist_high = np.array([_WAIST_BY_TERRAIN[t][1] for t in terrains])[terrain]
+    base_price = np.array([_PRICE_BY_SKILL[s] for s in skills])[skill]
+
+    length_low = rng.integers(140, 172, count)
+    return {
+        'terrain': terrain,
+        'skill': skill,
+        'waist': rng.integers(waist_low, waist_high + 1),
+        'price_low': (base_price + rng.integers(0, 20, count) * 25),
+        'price_span': rng.choice([0, 50, 100, 150], count, p=[0.2, 0.3, 0.3, 0.2]),
+        'length_low': length_low,
+        'length_high': length_low + rng.integers(3, 6, count) * 6,
+        'radius_low': rng.integers(11, 22, count),
+        'radius_span': rng.integers(0, 6, count),
+        'brand': rng.integers(0, len(BRANDS), count),
+        'series': rng.integers(0, len(SERIES), count),
+        'suffix': rng.integers(0, len(SUFFIXES), count),
+        'descriptor': rng.integers(0, len(DESCRIPTORS), count),
+        'retailers': rng.integers(1, 1 << len(RETAILERS), count),
+        'womens': rng.random(count) < 0.2,
+    }
+
+
+def _slug(name: str) -> str:
+    return "-".join(name.lower().replace("ö", "o").replace("ä", "a").split())
+
+
+def iter_rows(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield `count` flat catalog rows in the format the catalog compiler reads.
+    The same (count, seed) always yields the same rows.
+    """
+    columns = _columns(count, seed)
+    terrains = list(TERRAIN_CODES)
+    skills = list(SKILL_CODES)
+
+    for i in range(count):
+        terrain, skill = terrains[columns['terrain'][i]], skills[columns['skill'][i]]
+        # A running model number keeps names unique at any catalog size
+        name = (f"{BRANDS[columns['brand'][i]]} {SERIES[columns['series'][i]]} {int(columns['waist'][i])}"
+                f"{SUFFIXES[columns['suffix'][i]]}{' W' if columns['womens'][i] else ''} #{i}")
+
+        price_low = int(columns['price_low'][i])
+        price_high = price_low + int(columns['price_span'][i])
+        radius_low = int(columns['radius_low'][i])
+        radius_high = radius_low + int(columns['radius_span'][i])
+        slug = _slug(name.replace("#", ""))
+
+        retailer_bits = int(columns['retailers'][i])
+        yield {
+            'name': name,
+            'terrain': terrain,
+            'skill_level': skill,
+            'price_range': f"${price_low}" if price_low == price_high else f"${price_low}-{price_high}",
+            'description': f"{DESCRIPTORS[columns['descriptor'][i]]} {terrain.replace('_', '-')} ski for "
+                           f"{skill} skiers{'; female-specific' if columns['womens'][i] else ''}.",
+            'retailers': {
+                retailer: template.format(slug=slug)
+                for bit, (retailer, template) in enumerate(RETAILERS) if retailer_bits >> bit & 1
+            },
+            'specs': {
+                'length': f"{columns['length_low'][i]}-{columns['length_high'][i]}cm",
+                'waist': f"{columns['waist'][i]}mm",
+                'radius': f"{radius_low}m" if radius_low == radius_high else f"{radius_low}-{radius_high}m",
+            },
+        }
+
+
+def generate_skis(count: int, seed: int = 0) -> List[SkiModel]:
+    """
+    Synthetic records built directly, skipping validation. The generator only
+    emits canonical values, so this matches compiling iter_rows() output.
+    """
+    return [
+        SkiModel(
+            name=row['name'],
+            terrain=row['terrain'],
+            skill_level=row['skill_level'],
+            price_range=row['price_range'],
+            description=row['description'],
+            links=tuple(RetailerLink.from_url(retailer, url) for retailer, url in row['retailers'].items()),
+            spec_text=tuple(row['specs'].items()),
+        )
+        for row in iter_rows(count, seed)
+    ]
+
+
+def generate_catalog(count: int, seed: int = 0) -> SkiCatalog:
+    """A synthetic catalog of `count` skis"""
+    return SkiCatalog(generate_skis(count, seed))
+
+
+def write_catalog_json(count: int, path: str, seed: int = 0):
+    """Write a synthetic catalog as a flat JSON list of rows"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(list(iter_rows(count, seed)), f, ensure_ascii=False)
+
+
+def generate_profiles(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Random user profiles in the shape batch_top_k and the recommendation path accept"""
+    rng = np.random.default_rng(seed + 1)
+    terrains = ["all-mountain", "powder", "carving", "park", "backcountry", "groomers", "deep snow"]
+    skills = ["beginner", "intermediate", "advanced", "expert", "blue runs", "strong skier"]
+    budgets = [None, "under $500", "$400-700", "around $600", "$800+", "$300-$1000"]
+
+    return [
+        {
+            'skill_level': skills[rng.integers(len(skills))],
+            'terrain_preference': terrains[rng.integers(len(terrains))],
+            'budget': budgets[rng.integers(len(budgets))],
+            'gender': ["", "female", "male"][rng.integers(3)],
+        }
+        for _ in range(count)
+    ]
@@ -0,0 +1,256 @@
+"""
+Per-tenant catalog overlays on one shared, immutable base catalog
+"""
+import json
+import os
+import threading
+import weakref
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from data.catalog_engine import GENDER_CODES, SKILL_CODES, TERRAIN_CODES, UNKNOWN_CODE, PatchedRows, SkiCatalog
+from data.facets import FacetIndex, FacetValue
+from data.parsing import parse_range
+from data.ranking import DEFAULT_WEIGHTS, RankingWeights, candidate_mask, score_skis, top_k_scored
+from data.ski_model import RetailerLink, SkiModel
+
+
+class TenantOverlay:
+    """
+    A shop's differences from the shared catalog: its own prices, skis it doesn't
+    carry, and its own retailer links. Keyed by ski name so an overlay survives
+    reloads of the base catalog.
+    """
+
+    def __init__(self, tenant: str, prices: Optional[Dict[str, str]] = None,
+                 excluded: Iterable[str] = (), links: Optional[Dict[str, Dict[str, str]]] = None):
+        self.tenant = tenant
+        self.prices = dict(prices or {})
+        self.excluded = frozenset(excluded)
+        self.links = {name: dict(retailers) for name, retailers in (links or {}).items()}
+
+    @classmethod
+    def from_dict(cls, tenant: str, data: Dict) -> "TenantOverlay":
+        """
+        Build from {"prices": {name: "$499"}, "exclude": [name, ...],
+        "links": {name: {retailer: url}}}
+        """
+        return cls(tenant, data.get('prices'), data.get('exclude', ()), data.get('links'))
+
+    @classmethod
+    def load(cls, path: str) -> "TenantOverlay":
+        """Load an overlay file; the tenant id is the file name without extension"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls.from_dict(os.path.splitext(os.path.basename(path))[0], data)
+
+    def __len__(self) -> int:
+        return len(set(self.prices) | self.excluded | set(self.links))
+
+
+_NAME_INDEXES = weakref.WeakKeyDictionary()
+_NAME_INDEXES_LOCK = threading.Lock()
+
+
+def name_index(catalog: SkiCatalog) -> Dict[str, List[int]]:
+    """
+    Ski name -> rows for a catalog (a model listed under several terrains or
+    skill levels has several rows), built once and shared by every tenant
+    """
+    with _NAME_INDEXES_LOCK:
+        index = _NAME_INDEXES.get(catalog)
+        if index is None:
+            index = {}
+            for row, name in enumerate(catalog.names()):
+                index.setdefault(name, []).append(row)
+            _NAME_INDEXES[catalog] = index
+        return index
+
+
+class TenantCatalog:
+    """
+    A tenant's view of a base catalog. Only the overridden rows are stored: the
+    overlay's records and a few column values for those rows. The base columns,
+    indexes and records are shared, and queries merge the overlay into the
+    results instead of copying the catalog.
+    """
+
+    def __init__(self, base: SkiCatalog, overlay: TenantOverlay):
+        self.base = base
+        self.overlay = overlay
+
+        rows = name_index(base)
+        patches = {}
+        for name in set(overlay.prices) | set(overlay.links):
+            changes = {}
+            if name in overlay.prices:
+                changes['price_range'] = overlay.prices[name]
+            if name in overlay.links:
+                changes['links'] = tuple(
+                    RetailerLink.from_url(retailer, url) for retailer, url in overlay.links[name].items()
+                )
+            for row in rows.get(name, ()):
+                patches[row] = base.skis[row].replace(**changes)
+
+        self.skis = PatchedRows(base.skis, patches) if patches else base.skis
+        self.excluded_rows = np.array(
+            sorted(row for name in overlay.excluded for row in rows.get(name, ())), dtype=np.intp
+        )
+
+        # Rows whose price differs from the base, with their prices (NaN when unparseable)
+        self.price_rows = np.array(
+            sorted(row for row, ski in patches.items() if ski.price_range != base.skis[row].price_range),
+            dtype=np.intp
+        )
+        prices = [parse_range(self.skis[row].price_range) or (np.nan, np.nan) for row in self.price_rows]
+        self.price_low = np.array([low for low, _ in prices], dtype=np.float32)
+        self.price_high = np.array([high for _, high in prices], dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def _override_columns(self, rows: np.ndarray) -> SimpleNamespace:
+        """Base column values for a few rows, with the tenant's prices applied"""
+        columns = {name: values[rows] for name, values in self.base.columns().items()}
+        positions = np.searchsorted(self.price_rows, rows)
+        columns['price_low'] = self.price_low[positions]
+        columns['price_high'] = self.price_high[positions]
+        return SimpleNamespace(**columns)
+
+    def mask(self, skill: int, terrain: int, budget: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """candidate_mask for this tenant: repriced rows re-checked, excluded rows removed"""
+        mask = candidate_mask(self.base, skill, terrain, budget)
+
+        if budget and len(self.price_rows):
+            rows = self.price_rows
+            low, high = budget
+            low = -np.inf if low is None else low
+            high = np.inf if high is None else high
+            in_budget = (self.price_low <= high) & (self.price_high >= low)
+            # Recompute the skill/terrain part for these rows without the base budget
+            mask[rows] = candidate_mask(_RowSubset(self.base, rows), skill, terrain) & in_budget
+
+        mask[self.excluded_rows] = False
+        return mask
+
+    def rank_scored(self, skill_level: str, terrain: str, budget: Optional[Tuple[float, float]] = None,
+                    gender: Optional[str] = None, target_length: Optional[float] = None, k: int = 3,
+                    weights: RankingWeights = DEFAULT_WEIGHTS) -> Tuple[np.ndarray, np.ndarray]:
+        """rank_skis_scored against the tenant's view of the catalog"""
+        skill = SKILL_CODES.get(skill_level, UNKNOWN_CODE)
+        terrain_code = TERRAIN_CODES.get(terrain, UNKNOWN_CODE)
+        if skill == UNKNOWN_CODE or k <= 0:
+            return np.array([], dtype=np.intp), np.array([], dtype=np.float32)
+
+        rows = np.flatnonzero(self.mask(skill, terrain_code, budget))
+        if not len(rows):
+            return rows, np.array([], dtype=np.float32)
+
+        budget_low, budget_high = budget if budget else (np.nan, np.nan)
+        query = dict(
+            skill=np.float32(skill),
+            terrain=np.int8(terrain_code),
+            budget_low=np.float32(budget_low),
+            budget_high=np.float32(budget_high),
+            target_length=np.float32(np.nan if target_length is None else target_length),
+            gender=np.int8(GENDER_CODES.get(gender or "unisex", GENDER_CODES["unisex"])),
+            weights=weights,
+        )
+        scores = score_skis(self.base, rows, **query)
+
+        # Rescore just the repriced candidates against their tenant prices
+        repriced = np.flatnonzero(np.isin(rows, self.price_rows, assume_unique=True))
+        if len(repriced):
+            subset = rows[repriced]
+            scores[repriced] = score_skis(self._override_columns(subset), np.arange(len(subset)), **query)
+
+        return top_k_scored(scores, rows, k)
+
+    def rank(self, skill_level: str, terrain: str, budget: Optional[Tuple[float, float]] = None,
+             gender: Optional[str] = None, target_length: Optional[float] = None, k: int = 3) -> np.ndarray:
+        """Row indices of the tenant's k best skis for a profile, best first"""
+        return self.rank_scored(skill_level, terrain, budget, gender, target_length, k=k)[0]
+
+    def rows_at(self, indices) -> List[SkiModel]:
+        """The tenant's records at the given rows"""
+        return [self.skis[i] for i in indices]
+
+    def visible_rows(self, rows) -> np.ndarray:
+        """The rows the tenant carries, in their original order"""
+        rows = np.asarray(rows, dtype=np.intp)
+        return rows[~np.isin(rows, self.excluded_rows)]
+
+    def facet_bitmap(self, facets: FacetIndex, max_price: Optional[float] = None,
+                     **filters: Optional[FacetValue]) -> np.ndarray:
+        """
+        FacetIndex.select for this tenant: repriced rows are re-checked against
+        their tenant prices and excluded rows are cleared
+        """
+        bitmap = facets.select(max_price=max_price, **filters)
+        if max_price is not None and len(self.price_rows):
+            # Whether each repriced row passes the other filters, read from their bits
+            others = facets.select(**filters)[self.price_rows >> 3]
+            matches = (others & (0x80 >> (self.price_rows & 7)).astype(np.uint8)) != 0
+            _set_bits(bitmap, self.price_rows, matches & (self.price_low < max_price))
+        _set_bits(bitmap, self.excluded_rows, np.zeros(len(self.excluded_rows), dtype=bool))
+        return bitmap
+
+
+def _set_bits(bitmap: np.ndarray, rows: np.ndarray, values: np.ndarray):
+    """Set or clear single rows' bits of a packed bitmap in place"""
+    byte, bit = rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8)
+    np.bitwise_and.at(bitmap, byte[~values], ~bit[~values])
+    np.bitwise_or.at(bitmap, byte[values], bit[values])
+
+
+class _RowSubset:
+    """Just enough of a catalog for candidate_mask over a few rows, without a budget"""
+
+    def __init__(self, catalog: SkiCatalog, rows: np.ndarray):
+        self.skill = catalog.skill[rows]
+        self.terrain = catalog.terrain[rows]
+        self._size = len(rows)
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class TenantRegistry:
+    """
+    Loads tenant overlays from a directory of <tenant>.json files and hands out
+    each tenant's view of the current base catalog, rebuilt only when the base
+    catalog is replaced
+    """
+
+    def __init__(self, overlay_dir: Optional[str] = None):
+        self.overlays: Dict[str, TenantOverlay] = {}
+        self._views = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        # Bumped by every add(), so results memoized for an older overlay can't be served
+        self.generation = 0
+        if overlay_dir and os.path.isdir(overlay_dir):
+            for filename in sorted(os.listdir(overlay_dir)):
+                if filename.endswith(".json"):
+                    try:
+                        self.add(TenantOverlay.load(os.path.join(overlay_dir, filename)))
+                    except (OSError, ValueError) as e:
+                        print(f"Error loading tenant overlay {filename}: {e}")
+
+    def add(self, overlay: TenantOverlay):
+        with self._lock:
+            self.overlays[overlay.tenant] = overlay
+            self._views = weakref.WeakKeyDictionary()
+            self.generation += 1
+
+    def view(self, tenant: str, base: SkiCatalog) -> Optional[TenantCatalog]:
+        """The tenant's view of a base catalog, or None for an unknown tenant"""
+        overlay = self.overlays.get(tenant)
+        if overlay is None:
+            return None
+        with self._lock:
+            views = self._views.setdefault(base, {})
+            if tenant not in views:
+                views[tenant] = TenantCatalog(base, overlay)
+            return views[tenant]
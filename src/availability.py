@@ -0,0 +1,194 @@
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Stock within this many cm of a recommended length counts as that size
+LENGTH_TOLERANCE = 3.0
+
+
+class AvailabilityRecord(NamedTuple):
+    ski: str
+    retailer: str
+    length: float  # cm
+    in_stock: bool
+    price: Optional[float]
+    url: Optional[str]
+    fetched_at: float
+
+
+class RetailerAdapter(ABC):
+    """
+    Source of stock information for one retailer. Subclasses implement fetch()
+    and return a record per length they know about for the ski.
+    """
+    retailer = None
+    
+    @abstractmethod
+    def fetch(self, ski) -> List[AvailabilityRecord]:
+        ...
+
+
+class FakeRetailerAdapter(RetailerAdapter):
+    """
+    Local stand-in for a retailer API. Stock is either given explicitly as
+    {(ski_name, length): (in_stock, price)} or generated deterministically from
+    the ski's length range. An optional delay simulates a slow retailer.
+    """
+    
+    def __init__(self, retailer: str, stock: Optional[Dict[Tuple[str, float], Tuple[bool, Optional[float]]]] = None,
+                 delay: float = 0.0, sizes_step: float = 7):
+        self.retailer = retailer
+        self.stock = stock
+        self.delay = delay
+        self.sizes_step = sizes_step
+        self.calls = 0
+    
+    def fetch(self, ski) -> List[AvailabilityRecord]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        
+        now = time.time()
+        url = ski.retailers.get(self.retailer) if hasattr(ski, 'retailers') else None
+        
+        if self.stock is not None:
+            return [
+                AvailabilityRecord(ski.name, self.retailer, length, in_stock, price, url, now)
+                for (name, length), (in_stock, price) in self.stock.items()
+                if name == ski.name
+            ]
+        
+        if not ski.length:
+            return []
+        
+        # Same ski and retailer always produce the same stock levels
+        rng = random.Random(f"{ski.name}|{self.retailer}")
+        low, high = ski.length
+        price = ski.price[0] if ski.price else None
+        records = []
+        length = low
+        while length <= high:
+            records.append(AvailabilityRecord(ski.name, self.retailer, length, rng.random() > 0.3, price, url, now))
+            length += self.sizes_step
+        return records
+
+
+class AvailabilityCache:
+    """
+    Availability keyed by (ski, retailer, length) with stale-while-revalidate:
+    lookups always answer immediately from whatever is cached and schedule a
+    background refresh for anything missing or older than the TTL.
+    """
+    
+    def __init__(self, adapters: Iterable[RetailerAdapter] = (), ttl: float = 900, max_workers: int = 4):
+        self.ttl = ttl
+        self.adapters: Dict[str, RetailerAdapter] = {}
+        # ski name -> (retailer, length) -> record, so lookups only touch one ski's records
+        self._records: Dict[str, Dict[Tuple[str, float], AvailabilityRecord]] = {}
+        self._refreshed_at: Dict[Tuple[str, str], float] = {}
+        self._in_flight: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="availability")
+        
+        for adapter in adapters:
+            self.register_adapter(adapter)
+    
+    def register_adapter(self, adapter: RetailerAdapter):
+        self.adapters[adapter.retailer] = adapter
+    
+    def _needs_refresh(self, key: Tuple[str, str]) -> bool:
+        refreshed_at = self._refreshed_at.get(key)
+        return (refreshed_at is None or time.time() - refreshed_at > self.ttl) and key not in self._in_flight
+    
+    def refresh(self, ski, retailer: str):
+        """Fetch one ski from one retailer and replace its cached records (blocking)"""
+        key = (ski.name, retailer)
+        try:
+            records = self.adapters[retailer].fetch(ski)
+            with self._lock:
+                # Copy on write so lookups can filter a ski's records outside the lock
+                ski_records = {
+                    record_key: record for record_key, record in self._records.get(ski.name, {}).items()
+                    if record_key[0] != retailer
+                }
+                for record in records:
+                    ski_records[(record.retailer, record.length)] = record
+                self._records[ski.name] = ski_records
+                self._refreshed_at[key] = time.time()
+        except Exception as e:
+            # Keep serving the old records; the next lookup after the TTL retries
+            print(f"Availability refresh failed for {ski.name} at {retailer}: {e}")
+            with self._lock:
+                self._refreshed_at[key] = time.time()
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+    
+    def prefetch(self, skis: Iterable, retailers: Optional[Iterable[str]] = None):
+        """Schedule background refreshes for missing or expired entries; never blocks"""
+        for ski in skis:
+            ski_retailers = retailers or [r for r in ski.retailers if r in self.adapters]
+            for retailer in ski_retailers:
+                if retailer not in self.adapters:
+                    continue
+                key = (ski.name, retailer)
+                with self._lock:
+                    if not self._needs_refresh(key):
+                        continue
+                    self._in_flight.add(key)
+                self._executor.submit(self.refresh, ski, retailer)
+    
+    def lookup(self, ski, length: Optional[float] = None, retailer: Optional[str] = None,
+               tolerance: float = LENGTH_TOLERANCE) -> List[AvailabilityRecord]:
+        """
+        Cached records for a ski, optionally narrowed to a retailer and to lengths
+        within tolerance cm. Returns immediately, possibly with stale or no data,
+        and triggers a background refresh when needed.
+        """
+        self.prefetch([ski], [retailer] if retailer else None)
+        
+        with self._lock:
+            ski_records = self._records.get(ski.name, {})
+        records = [
+            record for (record_retailer, record_length), record in ski_records.items()
+            if (retailer is None or record_retailer == retailer)
+            and (length is None or abs(record_length - length) <= tolerance)
+        ]
+        return sorted(records, key=lambda record: (record.retailer, record.length))
+    
+    def where_to_buy(self, ski, length: Optional[float] = None) -> List[AvailabilityRecord]:
+        """In-stock cached records for a ski (and length), cheapest first"""
+        in_stock = [record for record in self.lookup(ski, length) if record.in_stock]
+        return sorted(in_stock, key=lambda record: (record.price is None, record.price or 0, record.retailer))
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def describe_availability(cache: AvailabilityCache, skis_with_sizes: Iterable[Tuple[object, List[float]]]) -> str:
+    """Summary of cached stock for each ski in the sizes that fit, e.g. for the reply context"""
+    lines = []
+    for ski, sizes in skis_with_sizes:
+        # One lookup per ski; each size just narrows it
+        in_stock = cache.where_to_buy(ski)
+        for length in sizes or [None]:
+            records = [
+                record for record in in_stock
+                if length is None or abs(record.length - length) <= LENGTH_TOLERANCE
+            ]
+            if records:
+                shops = ", ".join(
+                    f"{record.retailer}" + (f" (${record.price:.0f})" if record.price else "")
+                    for record in records
+                )
+                size_text = f" {length:.0f}cm" if length else ""
+                lines.append(f"{ski.name}{size_text} in stock at {shops}")
+    return "; ".join(lines)
+
+
+# Shared availability cache. No retailer feeds are wired in yet, so it starts with
+# no adapters and stock lookups answer empty until one is added with register_adapter()
+AVAILABILITY = AvailabilityCache()
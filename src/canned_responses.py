@@ -0,0 +1,188 @@
+import json
+import sys
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from data.ski_database import add_catalog_listener, get_catalog_version
+
+
+class CannedTurn(NamedTuple):
+    response: str
+    recommendations: List[Any]
+    profile: Dict[str, Any]  # the profile after the turn
+    catalog_version: Any  # as tagged by get_catalog_version(): per shard when sharded
+    audio: Optional[bytes]
+
+
+def normalize_prompt(text: str) -> str:
+    """Case, spacing and trailing punctuation don't change a canned prompt"""
+    return " ".join(str(text).lower().split()).strip(" .!?\"'")
+
+
+def profile_state(profile: Dict[str, Any]) -> tuple:
+    """Hashable snapshot of a profile, so canned replies only match the state they were made for"""
+    return tuple(sorted((key, json.dumps(value, sort_keys=True, default=str)) for key, value in profile.items()))
+
+
+def synthesize_speech(openai_client, text: str) -> bytes:
+    """MP3 audio for a reply"""
+    response = openai_client.audio.speech.create(
+        model=Config.TTS_MODEL,
+        voice=Config.TTS_VOICE,
+        input=text[:1200],  # Limit length
+        response_format="mp3"
+    )
+    return response.content
+
+
+def canned_prompts() -> List[str]:
+    """
+    Every fixed example prompt the interfaces offer as buttons. Interfaces whose
+    optional recorder packages aren't installed are skipped.
+    """
+    prompts = []
+    try:
+        from src.enhanced_voice import EnhancedVoiceHandler
+        prompts += EnhancedVoiceHandler.voice_prompts
+    except ImportError:
+        pass
+    try:
+        from src.text_interface import EnhancedTextInterface
+        prompts += EnhancedTextInterface.conversation_starters
+    except ImportError:
+        pass
+
+    unique = {}
+    for prompt in prompts:
+        unique.setdefault(normalize_prompt(prompt), prompt)
+    return list(unique.values())
+
+
+class CannedResponseCache:
+    """
+    Pre-computed first-turn replies (and their speech) for the canned prompts,
+    keyed on the prompt, the profile state and the tenant. Entries made against
+    an older catalog version never match.
+    """
+
+    def __init__(self, rewarm_delay: float = Config.CANNED_REWARM_DELAY):
+        self._turns: Dict[tuple, CannedTurn] = {}
+        self._audio: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.rewarm_delay = rewarm_delay
+        self._rewarm_registered = False
+        self._warm_due: Optional[float] = None  # when the pending warm-up may start
+        self._warmer: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(prompt: str, profile: Dict[str, Any], tenant: Optional[str]) -> tuple:
+        return normalize_prompt(prompt), profile_state(profile), tenant
+
+    def lookup(self, prompt: str, profile: Dict[str, Any], tenant: Optional[str] = None) -> Optional[CannedTurn]:
+        """The canned turn for this prompt and profile, if one is warm for the live catalog"""
+        with self._lock:
+            turn = self._turns.get(self._key(prompt, profile, tenant))
+        if turn is None or turn.catalog_version != get_catalog_version():
+            return None
+        return turn
+
+    def audio_for(self, text: str) -> Optional[bytes]:
+        """Pre-synthesized speech for a canned reply"""
+        with self._lock:
+            return self._audio.get(text)
+
+    def store(self, prompt: str, profile: Dict[str, Any], tenant: Optional[str], turn: CannedTurn):
+        key = self._key(prompt, profile, tenant)
+        with self._lock:
+            previous = self._turns.get(key)
+            if previous is not None:
+                self._audio.pop(previous.response, None)
+            self._turns[key] = turn
+            if turn.audio:
+                self._audio[turn.response] = turn.audio
+
+    def clear(self):
+        with self._lock:
+            self._turns.clear()
+            self._audio.clear()
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def warm(self, prompts: Iterable[str], expert_factory: Callable[[], Any], openai_client,
+             synthesize_audio: bool = True) -> int:
+        """
+        Run each prompt as the first turn of a fresh conversation and keep the
+        reply, recommendations and audio. Returns how many prompts were warmed.
+        """
+        warmed = 0
+        for prompt in prompts:
+            try:
+                expert = expert_factory()
+                start_profile = dict(expert.user_profile)
+                version = get_catalog_version()
+
+                response, recommendations = expert.generate_response(prompt, openai_client)
+                if not expert.conversation_history:
+                    continue  # The turn failed; don't cache the apology
+
+                audio = synthesize_speech(openai_client, response) if synthesize_audio else None
+                self.store(prompt, start_profile, expert.tenant, CannedTurn(
+                    response, list(recommendations), dict(expert.user_profile), version, audio
+                ))
+                warmed += 1
+            except Exception as e:
+                print(f"Error warming canned response for {prompt!r}: {e}")
+        return warmed
+
+    def warm_in_background(self, prompts: Iterable[str], expert_factory: Callable[[], Any], openai_client,
+                           synthesize_audio: bool = True) -> threading.Thread:
+        """
+        Warm in a daemon thread, and warm again after new catalog versions are
+        published so canned recommendations never go stale. Publishes are
+        coalesced: a feed publishing batch after batch causes one re-warm once
+        the catalog has stayed unchanged for rewarm_delay seconds, and only one
+        warm-up ever runs at a time.
+        """
+        prompts = list(prompts)
+        args = (prompts, expert_factory, openai_client, synthesize_audio)
+
+        if not self._rewarm_registered:
+            self._rewarm_registered = True
+            add_catalog_listener(lambda published: self._schedule_warm(self.rewarm_delay, args))
+
+        return self._schedule_warm(0, args)
+
+    def _schedule_warm(self, delay: float, args: tuple) -> threading.Thread:
+        """Ask for a warm-up in delay seconds, pushing back any pending one; returns the warming thread"""
+        with self._lock:
+            self._warm_due = time.time() + delay
+            if self._warmer is None:
+                self._warmer = threading.Thread(target=self._run_warmer, args=args,
+                                                name="canned-response-warmup", daemon=True)
+                self._warmer.start()
+            return self._warmer
+
+    def _run_warmer(self, *args):
+        """Wait for the catalog to settle, warm, and repeat while publishes keep arriving"""
+        while True:
+            with self._lock:
+                if self._warm_due is None:
+                    self._warmer = None
+                    return
+                wait = self._warm_due - time.time()
+                if wait <= 0:
+                    self._warm_due = None
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            self.warm(*args)
+
+
+CANNED_RESPONSES = CannedResponseCache()
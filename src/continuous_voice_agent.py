@@ -8,6 +8,16 @@ from typing import Callable
 from config.settings import Config
 
 class ContinuousVoiceAgent:
+    # Quick commands; they refer back to the conversation, so they always go to the model
+    quick_commands = [
+        "Tell me more about that first option",
+        "What's the difference between these skis?", 
+        "Help me choose between these",
+        "Show me something cheaper",
+        "What about for powder skiing?",
+        "I need help with sizing"
+    ]
+    
     def __init__(self, openai_client, on_voice_callback: Callable[[str], str]):
         self.client = openai_client
         self.on_voice_callback = on_voice_callback
@@ -62,17 +72,8 @@ class ContinuousVoiceAgent:
         if self.conversation_active:
             st.markdown("### 💡 Try saying:")
             
-            quick_commands = [
-                "Tell me more about that first option",
-                "What's the difference between these skis?", 
-                "Help me choose between these",
-                "Show me something cheaper",
-                "What about for powder skiing?",
-                "I need help with sizing"
-            ]
-            
             command_cols = st.columns(3)
-            for i, command in enumerate(quick_commands):
+            for i, command in enumerate(self.quick_commands):
                 col = command_cols[i % 3]
                 with col:
                     if st.button(f"🗣️ \"{command}\"", key=f"voice_cmd_{i}"):
@@ -9,6 +9,14 @@ import numpy as np
 from config.settings import Config
 
 class EnhancedVoiceHandler:
+    # Example prompts; their replies and audio are pre-warmed in the canned response cache
+    voice_prompts = [
+        "I'm a beginner looking for my first skis",
+        "I love skiing powder in Colorado",
+        "I need carving skis under $500",
+        "What's the difference between these options?"
+    ]
+    
     def __init__(self, openai_client, on_transcription_callback: Callable[[str], None]):
         self.client = openai_client
         self.on_transcription = on_transcription_callback
@@ -76,14 +84,7 @@ class EnhancedVoiceHandler:
             st.markdown("### 💡 Try saying:")
             prompt_cols = st.columns(2)
             
-            voice_prompts = [
-                "I'm a beginner looking for my first skis",
-                "I love skiing powder in Colorado",
-                "I need carving skis under $500",
-                "What's the difference between these options?"
-            ]
-            
-            for i, prompt in enumerate(voice_prompts):
+            for i, prompt in enumerate(self.voice_prompts):
                 col = prompt_cols[i % 2]
                 with col:
                     if st.button(f"🗣️ \"{prompt}\"", key=f"prompt_{i}", help="Click to use this example"):
@@ -0,0 +1,164 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+
+# Only these mean the page is really gone; timeouts, 5xx and bot blocks (403) stay "unknown"
+DEAD_STATUS_CODES = {404, 410}
+
+
+class LinkStatus(NamedTuple):
+    url: str
+    state: str  # "ok", "dead" or "unknown"
+    status_code: Optional[int]
+    checked_at: float
+    error: Optional[str] = None
+
+
+class LinkHealthCache:
+    """Thread-safe TTL cache of link check results, read by the renderer without any network work"""
+    
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._results: Dict[str, LinkStatus] = {}
+        self._lock = threading.Lock()
+    
+    def update(self, results: Dict[str, LinkStatus]):
+        with self._lock:
+            self._results.update(results)
+    
+    def status(self, url: str) -> Optional[LinkStatus]:
+        """Latest result for a URL, or None if never checked or expired"""
+        with self._lock:
+            result = self._results.get(url)
+        if result is None or time.time() - result.checked_at > self.ttl:
+            return None
+        return result
+    
+    def stale_urls(self, urls: Iterable[str]) -> List[str]:
+        """URLs with no fresh result"""
+        return [url for url in urls if self.status(url) is None]
+    
+    def order_links(self, retailers: Dict[str, str]) -> List[Tuple[str, str]]:
+        """
+        Retailer links for display: verified links first, unchecked ones after,
+        dead links dropped. Original order is kept within each group.
+        """
+        verified, unchecked = [], []
+        for retailer, url in retailers.items():
+            result = self.status(url)
+            if result is None or result.state == "unknown":
+                unchecked.append((retailer, url))
+            elif result.state == "ok":
+                verified.append((retailer, url))
+        return verified + unchecked
+
+
+class LinkChecker:
+    """
+    Probes many URLs concurrently with asyncio. Requests run on a bounded
+    thread pool sharing one pooled HTTP session, with a global concurrency cap
+    and a smaller per-host cap so no retailer gets hammered.
+    """
+    
+    def __init__(self, max_connections: int = 20, per_host_limit: int = 2, timeout: float = 5.0):
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = "SkiConcierge-LinkChecker/1.0"
+    
+    def _probe(self, url: str) -> LinkStatus:
+        """Blocking probe: HEAD first, falling back to GET for servers that reject HEAD"""
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            if response.status_code in (403, 405, 501):
+                response = self.session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+                response.close()
+            
+            if response.status_code < 400:
+                state = "ok"
+            elif response.status_code in DEAD_STATUS_CODES:
+                state = "dead"
+            else:
+                state = "unknown"
+            return LinkStatus(url, state, response.status_code, time.time())
+        
+        except requests.RequestException as e:
+            return LinkStatus(url, "unknown", None, time.time(), str(e))
+    
+    async def check_all(self, urls: Iterable[str]) -> Dict[str, LinkStatus]:
+        """Check every URL concurrently within the global and per-host limits"""
+        urls = list(dict.fromkeys(urls))
+        loop = asyncio.get_running_loop()
+        connection_slots = asyncio.Semaphore(self.max_connections)
+        host_slots: Dict[str, asyncio.Semaphore] = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            async def check(url: str) -> LinkStatus:
+                host = urlsplit(url).netloc.lower()
+                host_slot = host_slots.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+                async with host_slot, connection_slots:
+                    return await loop.run_in_executor(executor, self._probe, url)
+            
+            results = await asyncio.gather(*(check(url) for url in urls))
+        
+        return {result.url: result for result in results}
+    
+    def check(self, urls: Iterable[str]) -> Dict[str, LinkStatus]:
+        """Synchronous wrapper around check_all for use from background threads"""
+        return asyncio.run(self.check_all(urls))
+
+
+def catalog_urls(catalog) -> List[str]:
+    """Every distinct retailer URL in a catalog, read from its link columns rather than decoded rows"""
+    return catalog.link_urls()
+
+
+# Shared results read by the recommendation cards
+LINK_HEALTH = LinkHealthCache(ttl=Config.LINK_CHECK_TTL)
+
+
+def start_link_monitor(get_catalogs: Callable[[], Iterable], cache: LinkHealthCache = LINK_HEALTH,
+                       interval: float = Config.LINK_CHECK_INTERVAL,
+                       checker: Optional[LinkChecker] = None) -> threading.Thread:
+    """
+    Re-check links whose results have expired, every interval seconds, in a
+    daemon thread. get_catalogs returns the catalogs to sweep (e.g. only the
+    regional shards already loaded), so sweeps never load a catalog themselves.
+    """
+    checker = checker or LinkChecker(
+        max_connections=Config.LINK_CHECK_MAX_CONNECTIONS,
+        per_host_limit=Config.LINK_CHECK_PER_HOST
+    )
+    
+    def run():
+        while True:
+            try:
+                urls = {url: None for catalog in get_catalogs() for url in catalog_urls(catalog)}
+                urls = cache.stale_urls(urls)
+                if urls:
+                    cache.update(checker.check(urls))
+            except Exception as e:
+                print(f"Link check failed: {e}")
+            time.sleep(interval)
+    
+    thread = threading.Thread(target=run, name="link-monitor", daemon=True)
+    thread.start()
+    return thread
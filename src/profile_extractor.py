@@ -0,0 +1,234 @@
+import re
+import sys
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from data.keyword_matcher import get_keyword_matcher
+from data.parsing import parse_budget, parse_gender
+from data.sizing import height_mention, parse_physical_stats
+
+# Confidence for a keyword match: the canonical word itself, a listed synonym,
+# or a synonym that often means something else ("deep", "pro", "ice")
+CANONICAL_CONFIDENCE = 0.95
+SYNONYM_CONFIDENCE = 0.85
+VAGUE_CONFIDENCE = 0.5
+VAGUE_PHRASES = {"deep", "float", "ice", "icy", "pro", "trees", "everything", "versatile", "learning",
+                 "improving", "aggressive", "experienced", "pipe", "race", "racing", "america"}
+
+# Long, rambling turns usually carry details the rules don't read
+LONG_UTTERANCE_WORDS = 35
+
+_NEGATION_PATTERN = re.compile(r"\b(?:not|no|never|don'?t|isn'?t|aren'?t|without|hate|avoid)\W+(?:\w+\W+){0,2}$",
+                               re.IGNORECASE)
+_MONEY = r"\$?\s*\d+(?:,\d{3})*(?:\.\d+)?\s*k?\b"
+# The span keeps the words on either side that say which way the budget runs
+# ("from $500", "$500 or more"), since parse_budget reads it on its own
+_BUDGET_PATTERN = re.compile(
+    rf"(?:between\s+{_MONEY}\s*(?:-|–|to|and)\s*{_MONEY}|"
+    rf"(?:(?:under|below|less than|up to|(?:no|not)\s+(?:more than|over|above|higher than|exceeding)|at most|"
+    rf"max(?:imum)?|around|about|roughly|approximately|~|over|above|at least|more than|from|starting at|"
+    rf"min(?:imum)?)\s+)?{_MONEY}(?:\s*(?:-|–|to)\s*{_MONEY})?)\s*"
+    rf"(?:\+|dollars|bucks|usd|max)?(?:\s*\b(?:or (?:more|above|higher)|and (?:up|above)))?",
+    re.IGNORECASE,
+)
+_NOT_MONEY_PATTERN = re.compile(r"\s*(?:cm|mm|m\b|kgs?|kilos?|lbs?|pounds|'|’|\"|ft|feet|foot|in\b|inch|"
+                                r"days?|times?|years?|%)", re.IGNORECASE)
+_BUDGET_CONTEXT_PATTERN = re.compile(r"\b(?:budget|spend|price|cost|afford|dollars|bucks|usd)\b", re.IGNORECASE)
+# A height only counts as the skier's own next to words like these ("I'm 180cm", "6 foot tall"),
+# since a bare length is as likely a ski ("the Kore in 170cm")
+_HEIGHT_BEFORE_PATTERN = re.compile(
+    r"\b(?:i'?m|i am|height(?:\s+is)?:?|stand|(?:he|she)'?s|they'?re)\s+(?:about\s+|around\s+|roughly\s+|just\s+)?$",
+    re.IGNORECASE,
+)
+_HEIGHT_AFTER_PATTERN = re.compile(r"\s*(?:tall|in height)\b", re.IGNORECASE)
+_FREQUENCY_PATTERN = re.compile(
+    r"\b(?:\d+|one|two|three|four|five|six|ten|twenty|a few|a couple(?: of)?|once|twice)\s*"
+    r"(?:\+\s*)?(?:days?|times?|weekends?|weeks?|trips?)?\s*(?:a|per|each|every)\s+(?:year|season|winter|week|month)\b"
+    r"|\bevery (?:weekend|week|day)\b|\b(?:season pass|(?:ski|skiing) (?:most|every) weekends?)\b",
+    re.IGNORECASE,
+)
+_VAGUE_FREQUENCY_PATTERN = re.compile(r"\b(?:rarely|occasionally|sometimes|a lot|all the time|often)\b", re.IGNORECASE)
+# Mentions the rules can't turn into fields, like the skis someone owns now
+_NEEDS_MODEL_PATTERN = re.compile(
+    r"\b(?:currently|my (?:current |old )?skis|i (?:ski on|own|rent|demoed)|compared? to|versus|vs\.?)\b",
+    re.IGNORECASE,
+)
+# Injuries and other specific needs the model should hear about
+_SPECIFIC_NEEDS_PATTERN = re.compile(
+    r"\b(?:knees?|hips?|ankles?|shoulders?|(?:bad|my|lower|sore) back|injur(?:y|ies|ed)|surgery|acl|mcl|"
+    r"arthritis|pain|rehab|recover(?:ing|y)|lightweight|forgiving|stiff|soft|damp|playful)\b",
+    re.IGNORECASE,
+)
+# Skier gender; possessive forms ("women's skis") name a product line, bare words count
+# once the speaker says them of themselves ("I'm an intermediate woman")
+_GENDER_PATTERN = re.compile(r"\b(?:female|male|women'?s?|woman|men'?s?|man|ladies|lady|girls?|guys?|boys?)\b",
+                             re.IGNORECASE)
+_GENDER_PRODUCT_PATTERN = re.compile(r"^(?:women'?s|men'?s|ladies)$", re.IGNORECASE)
+_GENDER_SELF_PATTERN = re.compile(r"\b(?:i'?m|i am|as)\s+(?:an?\s+)?(?:[\w-]+\s+){0,2}$", re.IGNORECASE)
+# Gender words parse_gender doesn't map, usually because the skis are for someone else
+_OTHER_GENDER_PATTERN = re.compile(
+    r"\b(?:wife|husband|girlfriend|boyfriend|partner|daughter|son|kids?|children|mom|mum|dad|mother|father|"
+    r"sister|brother|her|him|non-?binary|unisex)\b",
+    re.IGNORECASE,
+)
+
+# Keyword matcher fields and the profile keys they fill
+_KEYWORD_FIELDS = {"skill": "skill_level", "terrain": "terrain_preference", "region": "region"}
+
+
+class ExtractedField(NamedTuple):
+    value: str
+    confidence: float
+    evidence: str
+
+
+class ProfileExtraction(NamedTuple):
+    fields: Dict[str, ExtractedField]
+    conflicts: List[str]
+    needs_model: bool
+
+    def is_confident(self, threshold: float) -> bool:
+        """Found something, every field clears the threshold and nothing conflicts"""
+        return (
+            bool(self.fields)
+            and not self.conflicts
+            and not self.needs_model
+            and all(field.confidence >= threshold for field in self.fields.values())
+        )
+
+    def to_analysis(self) -> Dict[str, str]:
+        """The extracted fields in the shape analyze_user_input returns"""
+        return {key: field.value for key, field in self.fields.items()}
+
+
+def _keyword_confidence(text: str, code: str, matched: str, start: int) -> float:
+    phrase = matched.lower()
+    if _NEGATION_PATTERN.search(text[:start]):
+        # "not a beginner", "no park skis": the mention says what they don't want
+        return 0.2
+    if phrase in VAGUE_PHRASES:
+        return VAGUE_CONFIDENCE
+    if phrase.replace("-", "_").replace(" ", "_") == code:
+        return CANONICAL_CONFIDENCE
+    return SYNONYM_CONFIDENCE
+
+
+def _extract_keywords(text: str, fields: Dict[str, ExtractedField], conflicts: List[str]):
+    matcher = get_keyword_matcher()
+    found: Dict[str, List[tuple]] = {}
+
+    # find_all only reports matched text, so locate each match for the negation check
+    position = 0
+    for field, code, matched in matcher.find_all(text):
+        start = text.find(matched, position)
+        position = start + len(matched)
+        found.setdefault(field, []).append((code, _keyword_confidence(text, code, matched, start), matched))
+
+    for field, matches in found.items():
+        key = _KEYWORD_FIELDS.get(field)
+        if key is None:
+            continue
+        codes = {code for code, confidence, _ in matches if confidence > 0.2}
+        if len(codes) > 1:
+            conflicts.append(f"{key}: {', '.join(sorted(codes))}")
+        code, confidence, matched = max(matches, key=lambda match: match[1])
+        fields[key] = ExtractedField(code, confidence, matched)
+
+
+def _extract_budget(text: str) -> Optional[ExtractedField]:
+    has_context = bool(_BUDGET_CONTEXT_PATTERN.search(text))
+    for match in _BUDGET_PATTERN.finditer(text):
+        span = match.group(0).strip()
+        if "$" not in span:
+            # A bare number could be a height, weight or ski length
+            if not has_context or _NOT_MONEY_PATTERN.match(text, match.end()):
+                continue
+        bounds = parse_budget(span)
+        if not bounds or bounds[1] < 50:
+            continue
+        return ExtractedField(span, 0.9 if "$" in span else 0.75, span)
+    return None
+
+
+def _extract_gender(text: str) -> Optional[ExtractedField]:
+    gender = parse_gender(text)
+    if gender is None:
+        return None
+
+    match = _GENDER_PATTERN.search(text)
+    confident = (_GENDER_PRODUCT_PATTERN.match(match.group(0))
+                 or _GENDER_SELF_PATTERN.search(text[:match.start()]))
+    return ExtractedField(gender, 0.9 if confident else VAGUE_CONFIDENCE, match.group(0))
+
+
+def _extract_physical_stats(text: str) -> Optional[ExtractedField]:
+    height, weight = parse_physical_stats(text)
+    if height is None and weight is None:
+        return None
+
+    parts = []
+    if height is not None:
+        parts.append(f"{height:.0f}cm")
+    if weight is not None:
+        parts.append(f"{weight:.0f}kg")
+
+    confidence = 0.9
+    if height is not None and weight is None:
+        _, start, end = height_mention(text)
+        if not (_HEIGHT_BEFORE_PATTERN.search(text[:start]) or _HEIGHT_AFTER_PATTERN.match(text, end)):
+            confidence = VAGUE_CONFIDENCE
+    return ExtractedField(", ".join(parts), confidence, ", ".join(parts))
+
+
+def _extract_frequency(text: str) -> Optional[ExtractedField]:
+    match = _FREQUENCY_PATTERN.search(text)
+    if match:
+        return ExtractedField(match.group(0), 0.85, match.group(0))
+    match = _VAGUE_FREQUENCY_PATTERN.search(text)
+    if match:
+        return ExtractedField(match.group(0), VAGUE_CONFIDENCE, match.group(0))
+    return None
+
+
+def extract_profile(text: str) -> ProfileExtraction:
+    """
+    Read skill, terrain, region, budget, gender, height/weight and ski frequency from a
+    user turn with compiled patterns and the synonym lexicons, each with a confidence
+    """
+    fields: Dict[str, ExtractedField] = {}
+    conflicts: List[str] = []
+    if not text or not text.strip():
+        return ProfileExtraction(fields, conflicts, True)
+
+    _extract_keywords(text, fields, conflicts)
+
+    for key, extract in (("budget", _extract_budget), ("gender", _extract_gender),
+                         ("physical_stats", _extract_physical_stats), ("skiing_frequency", _extract_frequency)):
+        field = extract(text)
+        if field:
+            fields[key] = field
+
+    # Gender words that parse_gender can't settle (both genders, or someone else's) go to the model
+    unmapped_gender = (
+        bool(_OTHER_GENDER_PATTERN.search(text))
+        or ('gender' not in fields and bool(_GENDER_PATTERN.search(text)))
+    )
+    needs_model = (
+        bool(_NEEDS_MODEL_PATTERN.search(text))
+        or bool(_SPECIFIC_NEEDS_PATTERN.search(text))
+        or unmapped_gender
+        or len(text.split()) > LONG_UTTERANCE_WORDS
+    )
+    return ProfileExtraction(fields, conflicts, needs_model)
+
+
+def extract_confident_profile(text: str, threshold: Optional[float] = None) -> Optional[Dict[str, str]]:
+    """The locally extracted analysis when it can stand in for the model's, else None"""
+    extraction = extract_profile(text)
+    if extraction.is_confident(Config.PROFILE_CONFIDENCE_THRESHOLD if threshold is None else threshold):
+        return extraction.to_analysis()
+    return None
@@ -0,0 +1,106 @@
+import re
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.canned_responses import CANNED_RESPONSES, synthesize_speech
+
+# A sentence ends at . ! or ? followed by whitespace
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Synthesizes reply sentences while the rest of the reply is still streaming
+_SPEECH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ski-speech")
+
+
+def iter_tokens(response):
+    """Text deltas of a streamed chat completion, skipping empty chunks"""
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        token = chunk.choices[0].delta.content
+        if token:
+            yield token
+
+
+class TokenStream:
+    """
+    Fans the tokens of one reply out to every subscriber as they arrive. Pass it
+    anywhere an on_token callback is taken.
+    """
+
+    def __init__(self, *subscribers: Optional[Callable[[str], None]]):
+        self._subscribers: List[Callable[[str], None]] = [s for s in subscribers if s]
+        self._parts: List[str] = []
+
+    def subscribe(self, callback: Callable[[str], None]):
+        self._subscribers.append(callback)
+
+    @property
+    def text(self) -> str:
+        """Everything received so far"""
+        return "".join(self._parts)
+
+    def __call__(self, token: str):
+        self._parts.append(token)
+        for subscriber in self._subscribers:
+            try:
+                subscriber(token)
+            except Exception as e:
+                # One broken consumer shouldn't stop the reply reaching the others
+                print(f"Error in reply stream subscriber: {e}")
+
+
+class SpeechStream:
+    """
+    Token subscriber that synthesizes the reply a few sentences at a time while
+    it streams, so most of the audio is ready when the last token arrives
+    """
+
+    def __init__(self, openai_client, min_chars: int = 60):
+        self.client = openai_client
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._spoken: List[str] = []
+        self._chunks = []
+        self._canned_audio = None
+
+    def __call__(self, token: str):
+        # A canned reply arrives whole and already has its audio
+        if not self._spoken and not self._buffer:
+            self._canned_audio = CANNED_RESPONSES.audio_for(token)
+            if self._canned_audio is not None:
+                self._spoken.append(token)
+                return
+
+        self._buffer += token
+        sentences = SENTENCE_END.split(self._buffer)
+        ready = " ".join(sentences[:-1])
+        if len(ready) >= self.min_chars:
+            self._speak(ready)
+            self._buffer = sentences[-1]
+
+    def _speak(self, text: str):
+        self._spoken.append(text)
+        self._chunks.append(_SPEECH_EXECUTOR.submit(synthesize_speech, self.client, text))
+
+    def finish(self, text: str) -> Optional[bytes]:
+        """
+        MP3 audio for the finished reply, or None when what streamed isn't the
+        reply that was returned (e.g. a turn that failed over to another path)
+        """
+        if self._buffer.strip():
+            self._speak(self._buffer.strip())
+            self._buffer = ""
+        if " ".join(self._spoken).split() != text.split():
+            return None
+        if self._canned_audio is not None:
+            return self._canned_audio
+        try:
+            return b"".join(chunk.result() for chunk in self._chunks)
+        except Exception as e:
+            print(f"Error synthesizing streamed speech: {e}")
+            return None
@@ -1,35 +1,172 @@
 import json
+import re
 import sys
 import os
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Dict, Any, Optional
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data.ski_database import get_ski_recommendations
+from data.ski_database import find_similar_skis, get_regional_recommendations, get_ski_recommendations
+from data.keyword_matcher import get_keyword_matcher
+from data.parsing import parse_budget, parse_gender
+from data.sizing import describe_sizing, parse_physical_stats, size_skis
+from src.availability import AVAILABILITY, describe_availability
+from src.canned_responses import CANNED_RESPONSES
+from src.profile_extractor import extract_confident_profile, extract_profile
+from src.reply_stream import iter_tokens
 from config.settings import Config
 
-class SkiExpert:
+# Profile fields the model extracts from each user turn
+PROFILE_FIELDS = """
+        - skill_level: beginner, intermediate, advanced, or expert
+        - terrain_preference: all-mountain, powder, carving, park, backcountry
+        - budget: any mentioned price range
+        - physical_stats: height, weight if mentioned
+        - gender: whether they want men's, women's or unisex skis, if mentioned
+        - skiing_frequency: how often they ski
+        - current_skis: what they currently use
+        - region: where they ski or shop (us, canada, europe)
+        - specific_needs: any particular requirements or concerns
+        - questions_to_ask: what additional information would be helpful""".strip("\n")
+
+CONCIERGE_PROMPT = """
+        You are a world-class ski concierge with 20+ years of experience fitting skis to skiers.
+        You're having a natural conversation to understand exactly what skis will be perfect for this person.
+        
+        Be enthusiastic, knowledgeable, and personable. Ask follow-up questions when needed.
+        When you have enough information, confidently recommend specific skis with reasoning.
+        
+        Keep responses conversational and under 150 words unless providing detailed recommendations.
+        """
+
+REPLY_GUIDELINES = """
+        Generate a friendly, expert response that:
+        1. Acknowledges what the user shared
+        2. If you have recommendations, introduce them enthusiastically
+        3. If you need more information, ask specific follow-up questions
+        4. Keep it conversational and expert-level
+        5. Don't repeat information unnecessarily
+        """
+
+# Where a single-call reply wants the catalog's picks; filled in after the lookup
+RECOMMENDATIONS_PLACEHOLDER = "[RECOMMENDATIONS]"
+
+
+# Where the reply string starts in a streamed structured completion
+_REPLY_KEY_PATTERN = re.compile(r'"reply"\s*:\s*"')
+
+SIZING_QUESTION = re.compile(r"\b(?:siz(?:e|es|ing)|how long|what length|ski length)\b", re.IGNORECASE)
+# Sizing questions about gear other than skis go to the model
+OTHER_GEAR = re.compile(r"\b(?:boots?|bindings?|poles?|helmets?|goggles|jackets?|pants|gloves)\b", re.IGNORECASE)
+# Longer turns usually say more than "what size do I need"
+SIZING_QUESTION_MAX_WORDS = 15
+
+def fill_recommendations(reply: str, recommendations: List[Any]) -> str:
+    """Replace the recommendations placeholder in a reply with the skis actually found"""
+    if RECOMMENDATIONS_PLACEHOLDER not in reply:
+        return reply
+    
+    if recommendations:
+        picks = [f"the {ski.name} ({ski.price_range})" for ski in recommendations]
+        spoken = picks[0] if len(picks) == 1 else f"{', '.join(picks[:-1])} and {picks[-1]}"
+    else:
+        spoken = "a few options once I know a bit more about your skiing"
+    return reply.replace(RECOMMENDATIONS_PLACEHOLDER, spoken)
+
+def run_in_thread(fn: Callable, *args) -> Future:
+    """
+    Run fn(*args) on its own daemon thread. Speculative turns use one per
+    analysis call, so concurrent sessions never queue behind each other's calls
+    the way they would on a shared, fixed-size pool.
+    """
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, name="ski-turn-analysis", daemon=True).start()
+    return future
+
+def placeholder_split(text: str) -> int:
+    """Where to cut streamed text so a partly received placeholder is held back"""
+    for size in range(min(len(text), len(RECOMMENDATIONS_PLACEHOLDER) - 1), 0, -1):
+        if RECOMMENDATIONS_PLACEHOLDER.startswith(text[-size:]):
+            return len(text) - size
+    return len(text)
+
+class StreamedReply:
+    """
+    Reads the "reply" string out of a structured completion while it streams.
+    The "profile" object is written first, so it's complete by the time the
+    reply starts.
+    """
+    
     def __init__(self):
+        self.raw = ""
+        self.profile = None
+        self.done = False
+        self._position = None  # next undecoded character of the reply string
+    
+    def feed(self, chunk: str) -> str:
+        """Add a chunk of the completion and return the reply text it completes"""
+        self.raw += chunk
+        if self._position is None:
+            match = _REPLY_KEY_PATTERN.search(self.raw)
+            if not match:
+                return ""
+            self._position = match.end()
+            try:
+                profile = json.loads(self.raw[:match.start()].rstrip().rstrip(",") + "}").get("profile")
+                self.profile = profile if isinstance(profile, dict) else None
+            except (ValueError, AttributeError):
+                self.profile = None
+        return self._decode()
+    
+    def _decode(self) -> str:
+        raw, i, decoded = self.raw, self._position, []
+        while i < len(raw) and not self.done:
+            if raw[i] == '"':
+                self.done = True
+                i += 1
+            elif raw[i] == "\\":
+                size = 6 if raw[i + 1:i + 2] == "u" else 2
+                # A high surrogate only decodes together with the low one after it
+                if size == 6 and raw[i + 2:i + 3].lower() == "d" and raw[i + 3:i + 4].lower() in "89ab":
+                    size = 12
+                if i + size > len(raw):
+                    break  # Wait for the rest of the escape
+                decoded.append(json.loads(f'"{raw[i:i + size]}"'))
+                i += size
+            else:
+                decoded.append(raw[i])
+                i += 1
+        self._position = i
+        return "".join(decoded)
+
+class SkiExpert:
+    def __init__(self, tenant=None):
         self.user_profile = {}
         self.conversation_history = []
+        # Shop whose prices, exclusions and links apply to recommendations
+        self.tenant = tenant or Config.TENANT_ID
         
     def analyze_user_input(self, user_input: str, openai_client) -> Dict[str, Any]:
         """
         Analyze user input to extract skiing preferences and requirements
         """
-        system_prompt = """
+        system_prompt = f"""
         You are an expert ski concierge. Analyze the user's input and extract key information about their skiing needs.
         
         Extract and categorize the following information:
-        - skill_level: beginner, intermediate, advanced, or expert
-        - terrain_preference: all-mountain, powder, carving, park, backcountry
-        - budget: any mentioned price range
-        - physical_stats: height, weight if mentioned
-        - skiing_frequency: how often they ski
-        - current_skis: what they currently use
-        - specific_needs: any particular requirements or concerns
-        - questions_to_ask: what additional information would be helpful
+{PROFILE_FIELDS}
         
         Return your analysis as a JSON object with these keys. If information isn't provided, mark as "unknown".
         """
@@ -56,85 +193,417 @@ class SkiExpert:
         """
         Generate ski recommendations based on user profile
         """
-        skill_level = user_profile.get('skill_level', 'intermediate').lower()
-        terrain_preference = user_profile.get('terrain_preference', 'all-mountain').lower()
+        # Normalize the profile's free text to canonical skill and terrain codes
+        matcher = get_keyword_matcher()
+        skill_level = matcher.match_field(str(user_profile.get('skill_level', '')), 'skill') or 'intermediate'
+        terrain_preference = matcher.match_field(str(user_profile.get('terrain_preference', '')), 'terrain') or 'all_mountain'
         budget = user_profile.get('budget', 'unknown')
+        gender = user_profile.get('gender')
+        physical_stats = user_profile.get('physical_stats')
         
-        # Get recommendations from database
-        recommendations = get_ski_recommendations(
-            skill_level=skill_level,
-            terrain_preference=terrain_preference,
-            budget_range=budget
-        )
+        # Get recommendations from database, from the user's regional catalog (the default region's until known)
+        region = user_profile.get('region')
+        if not self.tenant:
+            recommendations = get_regional_recommendations(
+                region if region != 'unknown' else None,
+                skill_level=skill_level,
+                terrain_preference=terrain_preference,
+                budget_range=budget,
+                gender=gender,
+                physical_stats=physical_stats
+            )
+        else:
+            recommendations = get_ski_recommendations(
+                skill_level=skill_level,
+                terrain_preference=terrain_preference,
+                budget_range=budget,
+                gender=gender,
+                tenant=self.tenant,
+                physical_stats=physical_stats
+            )
         
         return recommendations
     
-    def generate_response(self, user_input: str, openai_client) -> tuple[str, List[Dict[str, Any]]]:
+    def find_similar_to_current_skis(self, user_profile: Dict[str, Any]) -> tuple:
         """
-        Generate conversational response and ski recommendations
+        Resolve the user's current skis to a catalog entry and find similar models
         """
-        # Analyze current input
-        analysis = self.analyze_user_input(user_input, openai_client)
+        current_skis = user_profile.get('current_skis')
+        if not current_skis or current_skis == 'unknown':
+            return None, []
         
-        # Update user profile with new information
+        region = user_profile.get('region')
+        return find_similar_skis(current_skis, k=3, region=region if region != 'unknown' else None, tenant=self.tenant)
+    
+    def generate_sizing(self, user_profile: Dict[str, Any], recommendations: List[Any]):
+        """
+        Work out ski lengths locally from height, weight and skill level
+        """
+        physical_stats = user_profile.get('physical_stats')
+        if not physical_stats or physical_stats == 'unknown':
+            return None
+        
+        matcher = get_keyword_matcher()
+        skill_level = matcher.match_field(str(user_profile.get('skill_level', '')), 'skill') or 'intermediate'
+        terrain = matcher.match_field(str(user_profile.get('terrain_preference', '')), 'terrain')
+        
+        return size_skis(recommendations, physical_stats, skill_level, terrain)
+    
+    def sizing_question_analysis(self, user_input: str):
+        """
+        The turn's analysis when it only asks about ski length, else None. Apart
+        from height and weight, nothing in a sizing-only turn changes the profile
+        or needs the model to read.
+        """
+        if not SIZING_QUESTION.search(user_input) or OTHER_GEAR.search(user_input):
+            return None
+        if len(user_input.split()) > SIZING_QUESTION_MAX_WORDS:
+            return None
+        
+        extraction = extract_profile(user_input)
+        if extraction.needs_model or extraction.conflicts or not set(extraction.fields) <= {"physical_stats"}:
+            return None
+        # A length that may be a ski rather than the skier ("is 170cm too short?") goes to the model
+        if any(field.confidence < Config.PROFILE_CONFIDENCE_THRESHOLD for field in extraction.fields.values()):
+            return None
+        return extraction.to_analysis()
+    
+    def answer_sizing_question(self, user_input: str):
+        """
+        Answer "what size do I need" without a model round trip when the profile
+        already has height and weight. Returns None if the model should handle it,
+        including sizing questions that also say something new about the skier.
+        """
+        analysis = self.sizing_question_analysis(user_input)
+        if analysis is None:
+            return None
+        
+        # "I'm 185cm now, what length?" updates the stats the answer is based on. The
+        # new stats go first, so they win and the old ones only fill in what's missing.
+        previous_profile = dict(self.user_profile)
+        known_stats = self.user_profile.get('physical_stats')
+        if analysis.get('physical_stats') and known_stats and known_stats != 'unknown':
+            analysis['physical_stats'] = f"{analysis['physical_stats']}, {known_stats}"
+        self.update_profile(analysis)
+        
+        has_skill_level = self.user_profile.get('skill_level', 'unknown') != 'unknown'
+        has_terrain_pref = self.user_profile.get('terrain_preference', 'unknown') != 'unknown'
+        recommendations = self.generate_recommendations(self.user_profile) if has_skill_level and has_terrain_pref else []
+        
+        sizing = self.generate_sizing(self.user_profile, recommendations)
+        if not sizing:
+            self.user_profile = previous_profile
+            return None
+        
+        return describe_sizing(sizing), recommendations
+    
+    def update_profile(self, analysis: Dict[str, Any]):
+        """Merge newly extracted fields into the user profile"""
         for key, value in analysis.items():
             if value != "unknown" and key != "questions_to_ask":
                 self.user_profile[key] = value
+    
+    def has_recommendation_inputs(self) -> bool:
+        """Whether the profile has enough information for recommendations"""
+        has_skill_level = self.user_profile.get('skill_level', 'unknown') != 'unknown'
+        has_terrain_pref = self.user_profile.get('terrain_preference', 'unknown') != 'unknown'
+        return has_skill_level and has_terrain_pref
+    
+    def build_reply_context(self) -> tuple:
+        """
+        Look up recommendations for the current profile and gather the sizing,
+        stock and similar-ski notes the reply should draw on
+        """
+        recommendations = self.generate_recommendations(self.user_profile) if self.has_recommendation_inputs() else []
         
-        # Check if we have enough information for recommendations
-        has_skill_level = 'skill_level' in self.user_profile and self.user_profile['skill_level'] != 'unknown'
-        has_terrain_pref = 'terrain_preference' in self.user_profile and self.user_profile['terrain_preference'] != 'unknown'
+        # Size the recommendations locally so the reply can quote real lengths
+        sizing = self.generate_sizing(self.user_profile, recommendations)
+        sizing_context = f"Sizing: {describe_sizing(sizing)}" if sizing else ""
         
-        recommendations = []
+        # Stock comes from the availability cache only; missing entries refresh in the background
+        AVAILABILITY.prefetch(recommendations)
+        skis_with_sizes = sizing['sizes'] if sizing else [(ski, []) for ski in recommendations]
+        availability = describe_availability(AVAILABILITY, skis_with_sizes)
+        availability_context = f"Retailer stock: {availability}" if availability else ""
         
-        if has_skill_level and has_terrain_pref:
-            recommendations = self.generate_recommendations(self.user_profile)
+        # Look up skis similar to what they ski on now
+        current_ski, similar_skis = self.find_similar_to_current_skis(self.user_profile)
+        similar_context = ""
+        if current_ski:
+            similar_context = f"Skis similar to their current {current_ski.name}: {', '.join(ski.name for ski in similar_skis)}"
         
-        # Generate conversational response
-        conversation_context = f"""
-        User Profile: {json.dumps(self.user_profile, indent=2)}
-        Current Analysis: {json.dumps(analysis, indent=2)}
-        Available Recommendations: {len(recommendations)} skis found
+        return recommendations, "\n        ".join(
+            line for line in (similar_context, sizing_context, availability_context) if line
+        )
+    
+    def record_turn(self, user_input: str, ai_response: str, recommendations: List[Any],
+                    on_token: Optional[Callable[[str], None]] = None) -> tuple:
+        """
+        Add a finished turn to the history and return it as (response, recommendations).
+        on_token gets the whole response when it wasn't streamed.
+        """
+        if on_token:
+            on_token(ai_response)
+        self.conversation_history.append({
+            "user": user_input,
+            "assistant": ai_response,
+            "recommendations": recommendations
+        })
+        return ai_response, recommendations
+    
+    def generate_response(self, user_input: str, openai_client,
+                          on_token: Optional[Callable[[str], None]] = None) -> tuple[str, List[Dict[str, Any]]]:
+        """
+        Generate conversational response and ski recommendations.
+        With on_token, the reply is also passed on piece by piece as it's written;
+        replies that don't come from the model arrive as a single piece.
+        """
+        # Example prompts clicked as the first turn were answered at server start
+        if not self.conversation_history:
+            canned = CANNED_RESPONSES.lookup(user_input, self.user_profile, self.tenant)
+            if canned:
+                self.user_profile = dict(canned.profile)
+                return self.record_turn(user_input, canned.response, list(canned.recommendations), on_token)
         
-        Generate a friendly, expert response that:
-        1. Acknowledges what the user shared
-        2. If you have recommendations, introduce them enthusiastically
-        3. If you need more information, ask specific follow-up questions
-        4. Keep it conversational and expert-level
-        5. Don't repeat information unnecessarily
+        # Sizing questions are answered locally once we know height and weight
+        sizing_answer = self.answer_sizing_question(user_input)
+        if sizing_answer:
+            return self.record_turn(user_input, *sizing_answer, on_token)
+        
+        # Plain turns ("beginner, carving skis under $500") don't need the model to read them
+        local_analysis = extract_confident_profile(user_input) if Config.LOCAL_PROFILE_EXTRACTION else None
+        if local_analysis is not None:
+            return self.generate_two_call_response(user_input, openai_client, analysis=local_analysis,
+                                                   on_token=on_token)
+        
+        if Config.TURN_MODE == "single":
+            turn = self.generate_single_call_response(user_input, openai_client, on_token)
+            if turn:
+                return turn
+        
+        if Config.TURN_MODE == "speculative":
+            return self.generate_speculative_response(user_input, openai_client, on_token)
+        
+        return self.generate_two_call_response(user_input, openai_client, on_token=on_token)
+    
+    def generate_single_call_response(self, user_input: str, openai_client,
+                                      on_token: Optional[Callable[[str], None]] = None):
+        """
+        One structured completion returns both the profile fields and the reply.
+        The reply marks where recommendations go, and the catalog lookup for the
+        updated profile fills them in before the reply is shown or spoken.
+        Returns None when the completion can't be used, so the caller can fall back,
+        unless part of the reply was already streamed to on_token.
+        Sizing, stock and similar-ski notes are left out of the prompt: they depend
+        on the profile this same completion updates, so they would describe the
+        previous turn's skis.
         """
+        system_prompt = f"""{CONCIERGE_PROMPT}
+        Each turn, also extract the user's skiing profile from everything they've said so far:
+{PROFILE_FIELDS}
         
-        system_prompt = """
-        You are a world-class ski concierge with 20+ years of experience fitting skis to skiers.
-        You're having a natural conversation to understand exactly what skis will be perfect for this person.
+        Return a JSON object with two keys, in this order:
+        - "profile": an object with the fields above, using "unknown" for anything not provided
+        - "reply": your spoken reply to the user
         
-        Be enthusiastic, knowledgeable, and personable. Ask follow-up questions when needed.
-        When you have enough information, confidently recommend specific skis with reasoning.
+        Don't name specific ski models yourself. When you're ready to recommend skis, write
+        {RECOMMENDATIONS_PLACEHOLDER} in the reply where the catalog's picks should be read out.
+        """
         
-        Keep responses conversational and under 150 words unless providing detailed recommendations.
+        conversation_context = f"""
+        User Profile: {json.dumps(self.user_profile, indent=2)}
+        {REPLY_GUIDELINES}
         """
         
+        request = dict(
+            model=Config.MODEL_NAME,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"User said: '{user_input}'\n\nContext: {conversation_context}"}
+            ],
+            temperature=0.7,
+            max_tokens=700,
+            response_format={"type": "json_object"}
+        )
+        
+        recommendations = None
+        streamed = []
+        
+        def emit(text: str):
+            streamed.append(text)
+            on_token(text)
+        
         try:
-            response = openai_client.chat.completions.create(
-                model=Config.MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"User said: '{user_input}'\n\nContext: {conversation_context}"}
-                ],
-                temperature=0.7,
-                max_tokens=500
+            if on_token:
+                response = openai_client.chat.completions.create(stream=True, **request)
+                content, recommendations = self.stream_structured_reply(response, emit)
+            else:
+                content = openai_client.chat.completions.create(**request).choices[0].message.content
+            
+            turn = json.loads(content)
+            profile, reply = turn.get("profile"), turn.get("reply")
+            if not isinstance(profile, dict) or not isinstance(reply, str) or not reply.strip():
+                raise ValueError("completion is missing profile or reply")
+            
+        except Exception as e:
+            print(f"Error generating single-call response: {e}")
+            if not streamed:
+                return None
+            # Subscribers already showed or spoke part of this reply, and a fallback
+            # reply would be appended to it, so the turn ends with what was sent
+            recommendations = (
+                self.generate_recommendations(self.user_profile) if self.has_recommendation_inputs() else []
             )
+            return self.record_turn(user_input, "".join(streamed), recommendations)
+        
+        # Recommendation lookup runs between parsing the completion and rendering the reply
+        self.update_profile(profile)
+        if recommendations is not None:
+            return self.record_turn(user_input, fill_recommendations(reply, recommendations), recommendations)
+        
+        recommendations = self.generate_recommendations(self.user_profile) if self.has_recommendation_inputs() else []
+        return self.record_turn(user_input, fill_recommendations(reply, recommendations), recommendations, on_token)
+    
+    def stream_structured_reply(self, response, on_token: Callable[[str], None]) -> tuple:
+        """
+        Pass the reply of a streamed structured completion on as it arrives. The
+        profile is applied and the recommendations looked up as soon as the
+        profile object is complete, so the placeholder can be filled mid-stream.
+        Returns the completion text and the recommendations, or None for them
+        when the profile couldn't be read early and nothing was streamed.
+        """
+        reader = StreamedReply()
+        recommendations = None
+        pending = ""  # reply text held back while it may be the start of the placeholder
+        
+        for token in iter_tokens(response):
+            text = reader.feed(token)
+            if not text or reader.profile is None:
+                continue
             
-            ai_response = response.choices[0].message.content
+            if recommendations is None:
+                self.update_profile(reader.profile)
+                recommendations = (
+                    self.generate_recommendations(self.user_profile) if self.has_recommendation_inputs() else []
+                )
             
-            # Add to conversation history
-            self.conversation_history.append({
-                "user": user_input,
-                "assistant": ai_response,
-                "recommendations": recommendations
-            })
+            pending = fill_recommendations(pending + text, recommendations)
+            split = placeholder_split(pending)
+            if split:
+                on_token(pending[:split])
+            pending = pending[split:]
+        
+        # Once the reply string is closed, held-back text can't become a placeholder any more.
+        # A stream cut off mid-reply keeps it back; the completion then fails to parse.
+        if pending and reader.done:
+            on_token(pending)
+        return reader.raw, recommendations
+    
+    def compose_reply(self, user_input: str, openai_client, recommendations: List[Any], extra_context: str,
+                      analysis: Dict[str, Any] = None, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Write the conversational reply for a turn from the profile and lookup
+        results, streaming it to on_token when given
+        """
+        analysis_context = f"Current Analysis: {json.dumps(analysis, indent=2)}" if analysis is not None else ""
+        conversation_context = f"""
+        User Profile: {json.dumps(self.user_profile, indent=2)}
+        {analysis_context}
+        Available Recommendations: {len(recommendations)} skis found
+        {extra_context}
+        {REPLY_GUIDELINES}
+        """
+        
+        response = openai_client.chat.completions.create(
+            model=Config.MODEL_NAME,
+            messages=[
+                {"role": "system", "content": CONCIERGE_PROMPT},
+                {"role": "user", "content": f"User said: '{user_input}'\n\nContext: {conversation_context}"}
+            ],
+            temperature=0.7,
+            max_tokens=500,
+            stream=bool(on_token)
+        )
+        if not on_token:
+            return response.choices[0].message.content
+        
+        tokens = []
+        for token in iter_tokens(response):
+            tokens.append(token)
+            on_token(token)
+        return "".join(tokens)
+    
+    def generate_two_call_response(self, user_input: str, openai_client, analysis: Dict[str, Any] = None,
+                                   on_token: Optional[Callable[[str], None]] = None):
+        """
+        Analyze the input with one completion, then write the reply with a second
+        one that sees the updated recommendations. A ready analysis (e.g. from the
+        local extractor) skips the first call.
+        """
+        # Analyze current input
+        if analysis is None:
+            analysis = self.analyze_user_input(user_input, openai_client)
+        
+        # Update user profile with new information
+        self.update_profile(analysis)
+        
+        recommendations, extra_context = self.build_reply_context()
+        
+        try:
+            ai_response = self.compose_reply(user_input, openai_client, recommendations, extra_context, analysis,
+                                             on_token)
+            return self.record_turn(user_input, ai_response, recommendations)
             
-            return ai_response, recommendations
+        except Exception as e:
+            print(f"Error generating response: {e}")
+            return "I'm having trouble processing that right now. Could you try rephrasing your question?", []
+    
+    def recommendation_inputs(self) -> tuple:
+        """
+        The normalized profile fields that decide which skis get recommended and
+        how they're sized: skill, terrain, budget, region, gender and height/weight
+        """
+        matcher = get_keyword_matcher()
+        region = str(self.user_profile.get('region', 'unknown'))
+        return (
+            matcher.match_field(str(self.user_profile.get('skill_level', '')), 'skill'),
+            matcher.match_field(str(self.user_profile.get('terrain_preference', '')), 'terrain'),
+            parse_budget(self.user_profile.get('budget')),
+            matcher.match_field(region, 'region') or region.lower(),
+            parse_gender(self.user_profile.get('gender')),
+            parse_physical_stats(self.user_profile.get('physical_stats')),
+        )
+    
+    def generate_speculative_response(self, user_input: str, openai_client,
+                                      on_token: Optional[Callable[[str], None]] = None):
+        """
+        Draft the reply from the current profile and its (cached) recommendations
+        while the analysis call runs in parallel. The draft is kept when the
+        analysis leaves the recommendation inputs unchanged; otherwise the reply
+        is written again against the updated recommendations. Only the reply
+        that's kept reaches on_token: a kept draft whole, a rewrite as it streams.
+        """
+        inputs_before = self.recommendation_inputs()
+        recommendations, extra_context = self.build_reply_context()
+        
+        analysis_future = run_in_thread(self.analyze_user_input, user_input, openai_client)
+        try:
+            draft = self.compose_reply(user_input, openai_client, recommendations, extra_context)
+        except Exception as e:
+            print(f"Error drafting response: {e}")
+            draft = None
+        analysis = analysis_future.result()
+        
+        self.update_profile(analysis)
+        if draft is not None and self.recommendation_inputs() == inputs_before:
+            return self.record_turn(user_input, draft, recommendations, on_token)
+        
+        # The profile moved, so the draft may describe the wrong skis
+        recommendations, extra_context = self.build_reply_context()
+        try:
+            ai_response = self.compose_reply(user_input, openai_client, recommendations, extra_context, analysis,
+                                             on_token)
+            return self.record_turn(user_input, ai_response, recommendations)
             
         except Exception as e:
             print(f"Error generating response: {e}")
@@ -4,16 +4,18 @@ from typing import Optional, List, Dict, Any
 from config.settings import Config
 
 class EnhancedTextInterface:
+    # Starter prompts; their replies are pre-warmed in the canned response cache
+    conversation_starters = [
+        "I'm a beginner looking for my first skis",
+        "I ski powder in Colorado 20+ days a year",
+        "I need carving skis under $600",
+        "What's the difference between all-mountain and powder skis?",
+        "I'm intermediate and want to progress to advanced terrain",
+        "I ski mostly groomed runs on the East Coast"
+    ]
+    
     def __init__(self, openai_client):
         self.client = openai_client
-        self.conversation_starters = [
-            "I'm a beginner looking for my first skis",
-            "I ski powder in Colorado 20+ days a year",
-            "I need carving skis under $600",
-            "What's the difference between all-mountain and powder skis?",
-            "I'm intermediate and want to progress to advanced terrain",
-            "I ski mostly groomed runs on the East Coast"
-        ]
     
     def render_conversation_interface(self) -> Optional[str]:
         """Render enhanced conversation interface with smart prompts"""
@@ -1,7 +1,18 @@
 import streamlit as st
 import plotly.graph_objects as go
+import sys
+import os
 from typing import List, Dict, Any
 
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.parsing import SPEC_UNITS, format_range
+from data.catalog_engine import SKILL_CODES, TERRAIN_CODES
+from data.facets import PRICE_BANDS, WAIST_BANDS
+from data.ski_database import count_skis, get_skis_by_facets
+from src.link_checker import LINK_HEALTH
+
 def render_ski_recommendations(recommendations: List[Dict[str, Any]]):
     """
     Render ski recommendations in an attractive format
@@ -21,14 +32,14 @@ def render_ski_recommendations(recommendations: List[Dict[str, Any]]):
                 st.markdown(f"💰 **Price:** {ski['price_range']}")
                 st.markdown(f"📝 **Why I recommend this:** {ski['description']}")
                 
-                # Specs if available
-                if 'specs' in ski:
-                    specs = ski['specs']
-                    st.markdown(f"📏 **Specs:** Length: {specs.get('length', 'N/A')}, Waist: {specs.get('waist', 'N/A')}, Radius: {specs.get('radius', 'N/A')}")
+                # Spec ranges were parsed and validated when the catalog was compiled
+                length, waist, radius = (format_range(getattr(ski, field), unit) for field, unit in SPEC_UNITS.items())
+                st.markdown(f"📏 **Specs:** Length: {length}, Waist: {waist}, Radius: {radius}")
             
             with col2:
                 st.markdown("**🛒 Where to Buy:**")
-                for retailer, link in ski['retailers'].items():
+                # Dead links are hidden and verified ones listed first, from cached checks only
+                for retailer, link in LINK_HEALTH.order_links(ski['retailers']):
                     st.markdown(f"[{retailer}]({link})")
             
             st.divider()
@@ -89,6 +100,45 @@ def render_user_profile(user_profile: Dict[str, Any]):
     if profile_details:
         st.markdown(" | ".join(profile_details))
 
+def render_catalog_explorer(region=None, tenant=None):
+    """
+    Let users narrow the catalog live, with counts from the precomputed facet bitmaps.
+    With regional shards, only the region's catalog is shown; with a tenant, the shop's view of it.
+    """
+    st.markdown("### 🔎 Explore the Catalog")
+    
+    cols = st.columns(4)
+    
+    with cols[0]:
+        terrain = st.selectbox("Terrain", ["Any"] + list(TERRAIN_CODES), key="facet_terrain",
+                               format_func=lambda t: t.replace("_", "-").title())
+    
+    with cols[1]:
+        skill_level = st.selectbox("Skill Level", ["Any"] + list(SKILL_CODES), key="facet_skill",
+                                   format_func=str.title)
+    
+    with cols[2]:
+        price_options = ["Any"] + [high for _, _, high in PRICE_BANDS[:-1]]
+        max_price = st.selectbox("Budget", price_options, key="facet_price",
+                                 format_func=lambda p: p if p == "Any" else f"Under ${p:,}")
+    
+    with cols[3]:
+        waist_band = st.selectbox("Waist Width", ["Any"] + [label for label, _, _ in WAIST_BANDS], key="facet_waist")
+    
+    filters = {
+        'terrain': None if terrain == "Any" else terrain,
+        'skill_level': None if skill_level == "Any" else skill_level,
+        'max_price': None if max_price == "Any" else max_price,
+        'waist_band': None if waist_band == "Any" else waist_band,
+    }
+    
+    count, summary = count_skis(region=region, tenant=tenant, **filters)
+    st.markdown(f"**{summary}**")
+    
+    if count:
+        for ski in get_skis_by_facets(limit=10, region=region, tenant=tenant, **filters):
+            st.write(f"• **{ski.name}** - {ski.price_range}")
+
 def create_skiing_terrain_chart():
     """
     Create an informative chart about different ski terrains
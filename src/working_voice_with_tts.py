@@ -3,11 +3,13 @@ import streamlit.components.v1 as components
 import tempfile
 import os
 import base64
-from typing import Callable
-from config.settings import Config
+from typing import Callable, Optional
+from src.canned_responses import CANNED_RESPONSES, synthesize_speech
+from src.reply_stream import SpeechStream
 
 class WorkingVoiceWithTTS:
-    def __init__(self, openai_client, on_voice_callback: Callable[[str], str]):
+    def __init__(self, openai_client, on_voice_callback: Callable[..., str]):
+        # on_voice_callback(transcript, on_token=...) shows the reply as it streams and returns it
         self.client = openai_client
         self.on_voice_callback = on_voice_callback
         
@@ -441,35 +443,35 @@ class WorkingVoiceWithTTS:
             if transcript and len(transcript.strip()) > 2:
                 st.info(f"🎤 **You said:** *\"{transcript}\"*")
                 
-                # Get AI response
-                with st.spinner("🧠 Processing your message..."):
-                    ai_response = self.on_voice_callback(transcript)
-                
-                # Display AI response
-                st.success(f"🎿 **Ski Expert:** {ai_response}")
+                # Get AI response; speech is synthesized sentence by sentence as it streams
+                speech = SpeechStream(self.client)
+                ai_response = self.on_voice_callback(transcript, on_token=speech)
                 
                 # Generate TTS and send to JavaScript
-                self._generate_and_send_tts(ai_response)
+                self._generate_and_send_tts(ai_response, speech)
                 
                 # Mark as processed
                 st.session_state[f"{key}_processed"] = True
     
-    def _generate_and_send_tts(self, text: str):
-        """Generate TTS audio and send to JavaScript"""
+    def _generate_and_send_tts(self, text: str, speech: Optional[SpeechStream] = None):
+        """Generate TTS audio (or finish what was made while the reply streamed) and send to JavaScript"""
         try:
             st.markdown("### 🔊 Generating Voice Response...")
             
-            with st.spinner("🎵 Creating voice response..."):
-                # Generate TTS
-                response = self.client.audio.speech.create(
-                    model=Config.TTS_MODEL,
-                    voice=Config.TTS_VOICE,
-                    input=text[:1200],  # Limit length
-                    response_format="mp3"
-                )
-                
-                # Convert to base64
-                audio_base64 = base64.b64encode(response.content).decode()
+            audio_bytes = None
+            if speech is not None:
+                with st.spinner("🎵 Finishing voice response..."):
+                    audio_bytes = speech.finish(text)
+            
+            # Replies to canned prompts were synthesized at server start
+            if audio_bytes is None:
+                audio_bytes = CANNED_RESPONSES.audio_for(text)
+            if audio_bytes is None:
+                with st.spinner("🎵 Creating voice response..."):
+                    audio_bytes = synthesize_speech(self.client, text)
+            
+            # Convert to base64
+            audio_base64 = base64.b64encode(audio_bytes).decode()
             
             # Send audio to JavaScript
             js_tts = f"""
@@ -484,7 +486,7 @@ class WorkingVoiceWithTTS:
             
             # Fallback audio player
             st.markdown("### 🎧 Fallback Audio Player:")
-            st.audio(response.content, format="audio/mp3")
+            st.audio(audio_bytes, format="audio/mp3")
             
             st.markdown("""
             <div style='background: linear-gradient(135deg, #e8f5e8, #f3e5f5); 
@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.ski_model import SkiModel
+from src.availability import AvailabilityCache, FakeRetailerAdapter, RetailerAdapter, describe_availability
+
+KORE = SkiModel.from_dict({
+    'name': "Head Kore 99", 'price_range': "$600-700", 'specs': {'length': "163-184cm"},
+    'retailers': {'evo': "https://www.evo.com/skis/head-kore-99", 'rei': "https://www.rei.com/product/kore-99"},
+}, "all_mountain", "advanced")
+WAILER = SkiModel.from_dict({
+    'name': "DPS Wailer 106", 'price_range': "$900-1100", 'specs': {'length': "171-189cm"},
+    'retailers': {'evo': "https://www.evo.com/skis/dps-wailer-106"},
+}, "powder", "expert")
+
+
+@pytest.fixture
+def cache():
+    # One worker runs refreshes in order, so waiting on a no-op means earlier refreshes are done
+    cache = AvailabilityCache([
+        FakeRetailerAdapter("evo", {("Head Kore 99", 170): (True, 649), ("Head Kore 99", 177): (False, 649),
+                                    ("DPS Wailer 106", 178): (True, 999)}),
+        FakeRetailerAdapter("rei", {("Head Kore 99", 170): (True, 599)}),
+    ], ttl=60, max_workers=1)
+    yield cache
+    cache.shutdown()
+
+
+def settle(cache):
+    cache._executor.submit(lambda: None).result()
+
+
+def test_lookup_serves_cached_data_and_refreshes_in_background(cache):
+    cache.adapters["evo"].delay = 0.2
+    assert cache.lookup(KORE) == []
+    settle(cache)
+
+    records = cache.lookup(KORE)
+    assert [(r.retailer, r.length, r.in_stock) for r in records] == [
+        ("evo", 170, True), ("evo", 177, False), ("rei", 170, True),
+    ]
+    assert records[0].url == "https://www.evo.com/skis/head-kore-99"
+
+    # Fresh entries aren't fetched again within the TTL
+    cache.lookup(KORE)
+    settle(cache)
+    assert cache.adapters["evo"].calls == 1
+
+
+def test_lookup_narrows_by_retailer_and_length(cache):
+    cache.prefetch([KORE, WAILER])
+    settle(cache)
+
+    assert [r.length for r in cache.lookup(KORE, length=172)] == [170, 170]
+    assert [r.retailer for r in cache.lookup(KORE, retailer="rei")] == ["rei"]
+    assert [r.ski for r in cache.lookup(WAILER)] == ["DPS Wailer 106"]
+
+
+def test_where_to_buy_and_description(cache):
+    cache.prefetch([KORE, WAILER])
+    settle(cache)
+
+    assert [(r.retailer, r.price) for r in cache.where_to_buy(KORE, 170)] == [("rei", 599), ("evo", 649)]
+    assert cache.where_to_buy(KORE, 177) == []
+    assert describe_availability(cache, [(KORE, [170, 177]), (WAILER, [])]) == (
+        "Head Kore 99 170cm in stock at rei ($599), evo ($649); DPS Wailer 106 in stock at evo ($999)"
+    )
+
+
+def test_failed_refresh_keeps_old_records(cache):
+    cache.prefetch([KORE])
+    settle(cache)
+
+    def fail(ski):
+        raise ConnectionError("retailer down")
+
+    cache.adapters["evo"].fetch = fail
+    cache.refresh(KORE, "evo")
+    assert len(cache.lookup(KORE, retailer="evo")) == 2
+
+
+def test_adapters_must_implement_fetch():
+    with pytest.raises(TypeError):
+        RetailerAdapter()
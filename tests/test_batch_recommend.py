@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.batch_recommend import batch_top_k
+from data.catalog_engine import SkiCatalog
+from data.keyword_matcher import get_keyword_matcher
+from data.parsing import parse_budget, parse_gender
+from data.ranking import rank_skis_scored, top_k_scored
+from data.synthetic_catalog import generate_profiles, generate_skis
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return SkiCatalog(generate_skis(5000, seed=7))
+
+
+def single_query(catalog, profile, k):
+    matcher = get_keyword_matcher()
+    return rank_skis_scored(
+        catalog,
+        matcher.match_field(str(profile['skill_level']), "skill"),
+        matcher.match_field(str(profile['terrain_preference']), "terrain") or "all_mountain",
+        parse_budget(profile.get('budget')),
+        parse_gender(profile.get('gender')),
+        k=k,
+    )
+
+
+@pytest.mark.parametrize("block_size", [1, 64, None])
+def test_batch_matches_single_queries(catalog, block_size):
+    profiles = generate_profiles(300, seed=3)
+    rows, scores = batch_top_k(catalog, profiles, k=3, block_size=block_size)
+
+    for profile, batch_rows, batch_scores in zip(profiles, rows, scores):
+        single_rows, single_scores = single_query(catalog, profile, k=3)
+        found = batch_rows >= 0
+        assert batch_rows[found].tolist() == single_rows.tolist()
+        np.testing.assert_allclose(batch_scores[found], single_scores, rtol=1e-6)
+
+
+def test_batch_pads_missing_candidates(catalog):
+    rows, scores = batch_top_k(catalog, [{'skill_level': "unknown", 'terrain_preference': "powder"}], k=3)
+    assert rows.tolist() == [[-1, -1, -1]]
+    assert np.isneginf(scores).all()
+
+
+def test_ties_go_to_earliest_rows():
+    scores = np.array([0.5, 1.0, 1.0, 0.9, 1.0, 1.0], dtype=np.float32)
+    rows = np.arange(len(scores))
+
+    best_rows, best_scores = top_k_scored(scores, rows, 3)
+    assert best_rows.tolist() == [1, 2, 4]
+    assert best_scores.tolist() == [1.0, 1.0, 1.0]
+
+    reversed_rows, _ = top_k_scored(scores[::-1].copy(), rows, 3)
+    assert reversed_rows.tolist() == [0, 1, 3]
+
+
+def test_a_wide_tie_keeps_only_k_rows():
+    scores = np.ones(10_000, dtype=np.float32)
+    scores[7_000] = 2.0
+    rows = np.arange(len(scores)) * 2
+
+    best_rows, best_scores = top_k_scored(scores, rows, 3)
+    assert best_rows.tolist() == [14_000, 0, 2]
+    assert best_scores.tolist() == [2.0, 1.0, 1.0]
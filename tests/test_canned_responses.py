@@ -0,0 +1,69 @@
+import os
+import sys
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.canned_responses as canned_responses
+from src.canned_responses import CannedResponseCache
+
+
+def test_publishes_coalesce_into_one_rewarm_at_a_time(monkeypatch):
+    listeners = []
+    monkeypatch.setattr(canned_responses, "add_catalog_listener", listeners.append)
+
+    cache = CannedResponseCache(rewarm_delay=0.2)
+    warms, running, overlapped = [], [], []
+    started = threading.Event()
+
+    def warm(prompts, expert_factory, openai_client, synthesize_audio):
+        overlapped.append(bool(running))
+        running.append(True)
+        started.set()
+        time.sleep(0.1)
+        warms.append(time.time())
+        running.pop()
+
+    cache.warm = warm
+    thread = cache.warm_in_background(["Hi"], object, None)
+    cache.warm_in_background(["Hi"], object, None)
+    assert len(listeners) == 1
+    started.wait(5)
+
+    # A feed publishing 100 batches in quick succession
+    for _ in range(100):
+        listeners[0](None)
+        time.sleep(0.002)
+    last_publish = time.time()
+
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert len(warms) == 2
+    assert warms[1] - last_publish >= 0.2
+    assert not any(overlapped)
+
+
+def test_a_publish_during_a_warm_up_warms_again_afterwards(monkeypatch):
+    listeners = []
+    monkeypatch.setattr(canned_responses, "add_catalog_listener", listeners.append)
+
+    cache = CannedResponseCache(rewarm_delay=0)
+    started, release = threading.Event(), threading.Event()
+    warms = []
+
+    def warm(*args):
+        warms.append(time.time())
+        started.set()
+        release.wait(5)
+
+    cache.warm = warm
+    thread = cache.warm_in_background(["Hi"], object, None)
+    started.wait(5)
+    listeners[0](None)
+    assert cache._schedule_warm(0, ()) is thread  # still the one warming thread
+    release.set()
+
+    thread.join(timeout=5)
+    assert len(warms) == 2
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.catalog_compiler import (CatalogValidationError, compile_catalog, compile_row, compile_rows, main,
+                                   normalize_price, normalize_spec)
+
+
+def good_row(**changes):
+    row = {
+        'name': "  Nordica   Enforcer 94 ",
+        'terrain': "All-Mountain",
+        'skill_level': "strong skier",
+        'price_range': "$600 - $700",
+        'description': "Stable\nand damp",
+        'specs': {'length': "165-186", 'waist': "94mm", 'radius': "17.5m"},
+        'retailers': {'REI': "https://www.rei.com/enforcer-94"},
+    }
+    row.update(changes)
+    return row
+
+
+def test_a_good_row_is_normalized():
+    ski, issues = compile_row(good_row(), 0)
+
+    assert issues == []
+    assert ski.name == "Nordica Enforcer 94"
+    assert (ski.terrain, ski.skill_level) == ("all_mountain", "advanced")
+    assert ski.price_range == "$600-700"
+    assert ski.description == "Stable and damp"
+    assert dict(ski.spec_text) == {'length': "165-186cm", 'waist': "94mm", 'radius': "17.5m"}
+    assert [link.retailer for link in ski.links] == ["REI"]
+
+
+@pytest.mark.parametrize("field, value", [
+    ('name', "  "),
+    ('terrain', "moguls"),
+    ('skill_level', "somewhere in between"),
+    ('price_range', "call for price"),
+])
+def test_errors_drop_the_row(field, value):
+    ski, issues = compile_row(good_row(**{field: value}), 3)
+
+    assert ski is None
+    assert [(issue.row, issue.field, issue.severity) for issue in issues] == [(3, field, "error")]
+
+
+def test_spec_and_link_problems_are_warnings():
+    row = good_row(specs={'length': "180", 'waist': "20mm", 'radius': "huge"},
+                   retailers={'REI': "not a url", '': "https://evo.com/x"})
+    ski, issues = compile_row(row, 0)
+
+    assert ski is not None and dict(ski.spec_text) == {'length': "180cm"}
+    assert {issue.severity for issue in issues} == {"warning"}
+    assert [issue.field for issue in issues] == [
+        "specs.waist", "specs.radius", "retailers", "retailers", "retailers",
+    ]
+    assert "outside 50-160mm" in issues[0].message
+    assert str(issues[-1]) == "row 0 (Nordica Enforcer 94) retailers: no retailer links [warning]"
+
+
+@pytest.mark.parametrize("field, value, expected", [
+    ("length", "70in", "177.8cm"),
+    ("length", "1780mm", "178cm"),
+    ("waist", "9.5cm", "95mm"),
+    ("radius", "55ft", "16.8m"),
+    ("radius", "16-18", "16-18m"),
+])
+def test_units_are_converted(field, value, expected):
+    assert normalize_spec(field, value) == (expected, None)
+
+
+def test_prices():
+    assert normalize_price("$450") == "$450"
+    assert normalize_price("$1,200 - $1,400") == "$1200-1400"
+    assert normalize_price("$0") is None
+    assert normalize_price(None) is None
+
+
+def test_compile_rows_drops_duplicates_and_non_objects():
+    skis, issues = compile_rows([good_row(), "oops", good_row(name="nordica enforcer 94"), good_row(terrain="powder")])
+
+    assert [(ski.name, ski.terrain) for ski in skis] == [("Nordica Enforcer 94", "all_mountain"),
+                                                         ("Nordica Enforcer 94", "powder")]
+    assert [(issue.row, issue.message) for issue in issues] == [(1, "not an object"),
+                                                                (2, "duplicate entry dropped")]
+
+
+def test_strict_compile_raises(tmp_path):
+    source = tmp_path / "catalog.json"
+    source.write_text(json.dumps([good_row(), good_row(price_range="")]), encoding="utf-8")
+
+    catalog, issues = compile_catalog(str(source))
+    assert len(catalog) == 1 and len(issues) == 1
+
+    with pytest.raises(CatalogValidationError) as raised:
+        compile_catalog(str(source), strict=True)
+    assert raised.value.issues == issues
+    assert "1 catalog errors" in str(raised.value)
+
+
+def test_command_line(tmp_path, capsys):
+    source = tmp_path / "catalog.json"
+    source.write_text(json.dumps([good_row(), good_row(terrain="moguls")]), encoding="utf-8")
+
+    assert main([str(source)]) == 0
+    assert os.path.exists(str(source) + ".snap")
+    assert "Compiled 1 skis (1 rows dropped, 0 warnings)" in capsys.readouterr().out
+
+    assert main([str(source), str(tmp_path / "out.snap"), "--strict"]) == 1
+    assert "Catalog compile failed" in capsys.readouterr().out
+    assert not os.path.exists(tmp_path / "out.snap")
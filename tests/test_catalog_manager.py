@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.catalog_engine import SkiCatalog
+from data.catalog_io import load_catalog
+from data.catalog_manager import CatalogManager
+from data.ski_model import SkiModel
+
+
+def catalog_of(*names):
+    return SkiCatalog([SkiModel.from_dict({'name': name, 'price_range': "$500"}, "powder", "advanced")
+                       for name in names])
+
+
+def test_publish_bumps_the_version_and_notifies_listeners():
+    manager = CatalogManager(lambda: catalog_of("Head Kore 99"))
+    published = []
+    manager.add_listener(published.append)
+
+    pinned = manager.current()
+    new = manager.publish(catalog_of("DPS Wailer 106"))
+
+    assert pinned.version == 1 and pinned.catalog.names() == ["Head Kore 99"]
+    assert new.version == 2 and manager.current() is new
+    assert published == [new]
+
+
+def test_compare_and_swap_rejects_a_stale_version():
+    manager = CatalogManager(lambda: catalog_of("Head Kore 99"))
+    manager.publish(catalog_of("DPS Wailer 106"))
+
+    assert manager.publish(catalog_of("Volkl Blaze 106"), expected_version=1) is None
+    assert manager.current().catalog.names() == ["DPS Wailer 106"]
+    assert manager.publish(catalog_of("Volkl Blaze 106"), expected_version=2).version == 3
+
+
+def test_a_failing_listener_doesnt_stop_the_publish():
+    manager = CatalogManager(lambda: catalog_of("Head Kore 99"))
+    manager.add_listener(lambda published: 1 / 0)
+    assert manager.publish(catalog_of("DPS Wailer 106")).version == 2
+
+
+def write_source(path, *names):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"powder": {"advanced": [{'name': name, 'price_range': "$500-600"} for name in names]}}, f)
+
+
+def test_reloads_when_the_source_changes(tmp_path):
+    source = str(tmp_path / "catalog.json")
+    write_source(source, "Head Kore 99")
+    manager = CatalogManager(lambda: load_catalog(source), source_path=source)
+
+    assert not manager.check_for_changes()
+
+    write_source(source, "Head Kore 99", "DPS Wailer 106")
+    os.utime(source, ns=(1, 1))
+    assert manager.check_for_changes()
+    assert manager.current().version == 2
+    assert manager.current().catalog.names() == ["Head Kore 99", "DPS Wailer 106"]
+
+
+def test_a_broken_source_keeps_the_old_version(tmp_path):
+    source = str(tmp_path / "catalog.json")
+    write_source(source, "Head Kore 99")
+    manager = CatalogManager(lambda: load_catalog(source), source_path=source)
+
+    with open(source, "w", encoding="utf-8") as f:
+        f.write('{"powder": ')
+    os.utime(source, ns=(1, 1))
+
+    assert not manager.check_for_changes()
+    assert manager.current().version == 1
+    assert manager.current().catalog.names() == ["Head Kore 99"]
@@ -0,0 +1,95 @@
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import ski_database
+from data.catalog_engine import SkiCatalog
+from data.catalog_shards import CatalogShard, ShardedCatalog
+from data.ski_model import SkiModel
+
+
+def shard(name, *ski_names):
+    skis = [SkiModel.from_dict({'name': ski_name, 'price_range': "$500-600"}, "powder", "advanced")
+            for ski_name in ski_names]
+    return CatalogShard(name, lambda: SkiCatalog(skis))
+
+
+def make_sharded():
+    return ShardedCatalog(
+        [shard("us", "Head Kore 99"), shard("eu", "Volkl Blaze 106"), shard("ca", "Faction Dancer 2")],
+        region_shards={"europe": ["eu"], "north_america": ["us", "ca"]},
+        default_region="us",
+    )
+
+
+def test_regions_without_shards_use_the_default_region():
+    sharded = make_sharded()
+
+    assert [s.name for s in sharded.shards_for("europe")] == ["eu"]
+    assert [s.name for s in sharded.shards_for("north_america")] == ["us", "ca"]
+    assert [s.name for s in sharded.shards_for("japan")] == ["us"]
+    assert [s.name for s in sharded.shards_for(None)] == ["us"]
+
+    names = [ski.name for ski in sharded.recommend("japan", "advanced", "powder")]
+    assert names == ["Head Kore 99"]
+    assert sharded.loaded_shards() == ["us"]
+
+
+def test_without_a_default_every_shard_serves():
+    sharded = ShardedCatalog([shard("us", "Head Kore 99"), shard("eu", "Volkl Blaze 106")])
+    assert [s.name for s in sharded.shards_for("japan")] == ["us", "eu"]
+
+
+def test_loaded_versions_load_nothing():
+    sharded = make_sharded()
+    assert sharded.loaded_versions() == []
+
+    sharded.shards_for("europe")[0].current()
+    assert [published.catalog.names() for published in sharded.loaded_versions()] == [["Volkl Blaze 106"]]
+
+
+def test_listeners_survive_eviction():
+    sharded = make_sharded()
+    published = []
+    sharded.add_listener(published.append)
+
+    eu = sharded.shards["eu"]
+    eu.current()
+    eu.evict()
+    manager_catalog = eu.current().catalog
+    eu._manager.publish(manager_catalog)
+
+    assert [version.version for version in published] == [3]
+
+
+def test_versions_keep_counting_across_evictions():
+    sharded = make_sharded()
+    eu = sharded.shards["eu"]
+
+    assert sharded.recommend("europe", "advanced", "powder").catalog_version == (("eu", 1),)
+    eu.evict()
+    assert eu.loaded_version() is None
+    assert eu.current().version == 2
+    assert sharded.recommend("europe", "advanced", "powder").catalog_version == (("eu", 2),)
+
+
+def test_regional_recommendations_are_memoized_per_shard_version(monkeypatch):
+    sharded = make_sharded()
+    monkeypatch.setattr(ski_database, "_SHARDED_CATALOG", sharded)
+    cache = ski_database.RECOMMENDATION_CACHE
+    cache.clear()
+
+    first = ski_database.get_regional_recommendations("the Alps", "advanced", "powder")
+    hits = cache.hits
+    again = ski_database.get_regional_recommendations("europe", "advanced", "deep snow")
+    assert cache.hits == hits + 1
+    assert [ski.name for ski in again] == [ski.name for ski in first] == ["Volkl Blaze 106"]
+    assert again.catalog_version == (("eu", 1),)
+
+    # After an eviction the shard reloads under a new version, so the old entry can't be served
+    sharded.shards["eu"].evict()
+    reloaded = ski_database.get_regional_recommendations("europe", "advanced", "powder")
+    assert cache.hits == hits + 1
+    assert reloaded.catalog_version == (("eu", 2),)
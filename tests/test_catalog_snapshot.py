@@ -0,0 +1,74 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.catalog_engine import SkiCatalog
+from data.catalog_io import load_catalog, write_catalog_csv
+from data.catalog_snapshot import open_snapshot, snapshot_fingerprint, write_snapshot
+from data.ranking import rank_skis
+from data.synthetic_catalog import generate_skis
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return SkiCatalog(generate_skis(1500, seed=21))
+
+
+@pytest.fixture
+def snapshot(catalog, tmp_path):
+    path = str(tmp_path / "catalog.snap")
+    write_snapshot(catalog, path, source_fingerprint=(123, 456))
+    return open_snapshot(path)
+
+
+def test_round_trip_keeps_records_and_columns(catalog, snapshot):
+    assert len(snapshot) == len(catalog)
+    for name, values in catalog.columns().items():
+        np.testing.assert_array_equal(snapshot.columns()[name], values, err_msg=name)
+
+    for row in (0, 1, 750, len(catalog) - 1):
+        original, mapped = catalog.skis[row], snapshot.skis[row]
+        assert (mapped.name, mapped.terrain, mapped.skill_level, mapped.price_range, mapped.description) == (
+            original.name, original.terrain, original.skill_level, original.price_range, original.description)
+        assert mapped.links == original.links
+        assert mapped.specs == original.specs
+
+
+def test_snapshot_answers_queries_like_the_source(catalog, snapshot):
+    for query in [("intermediate", "all_mountain", (400, 700)), ("expert", "powder", None)]:
+        assert rank_skis(snapshot, *query, k=5).tolist() == rank_skis(catalog, *query, k=5).tolist()
+
+    for low, high in [(None, 500), (600, 800)]:
+        assert np.array_equal(snapshot.price_index.overlap_mask(low, high),
+                              catalog.price_index.overlap_mask(low, high))
+
+
+def test_rows_decode_lazily(snapshot):
+    assert snapshot.names()
+    assert not snapshot.skis._cache
+    assert snapshot.skis[3] is snapshot.skis[3]
+
+
+def test_fingerprint_is_stored(snapshot):
+    assert snapshot_fingerprint(snapshot.snapshot_path) == (123, 456)
+
+
+def test_load_catalog_recompiles_a_stale_snapshot(catalog, tmp_path):
+    source = str(tmp_path / "catalog.csv")
+    snapshot_path = source + ".snap"
+    write_catalog_csv(catalog.skis[:20], source)
+
+    first = load_catalog(source, snapshot_path)
+    assert os.path.exists(snapshot_path)
+    reopened = load_catalog(source, snapshot_path)
+    assert reopened.snapshot_path == snapshot_path
+    assert reopened.names() == first.names()
+
+    write_catalog_csv(catalog.skis[20:25], source)
+    os.utime(source, ns=(1, 1))
+    assert load_catalog(source, snapshot_path).names() == [ski.name for ski in catalog.skis[20:25]]
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.catalog_engine import SKILL_CODES, TERRAIN_CODES, SkiCatalog
+from data.facets import FacetIndex, describe_count
+from data.synthetic_catalog import generate_skis
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return SkiCatalog(generate_skis(3000, seed=11))
+
+
+def scan_mask(catalog, terrain=None, skill=None, max_price=None):
+    mask = np.ones(len(catalog), dtype=bool)
+    if terrain:
+        mask &= catalog.terrain == TERRAIN_CODES[terrain]
+    if skill:
+        mask &= catalog.skill == SKILL_CODES[skill]
+    if max_price is not None:
+        mask &= catalog.price_low < max_price
+    return mask
+
+
+@pytest.mark.parametrize("max_price", [None, 500, 550, 700, 899.99, 5000])
+@pytest.mark.parametrize("terrain,skill", [(None, None), ("powder", None), ("carving", "advanced")])
+def test_counts_match_a_scan(catalog, terrain, skill, max_price):
+    index = FacetIndex(catalog)
+    expected = scan_mask(catalog, terrain, skill, max_price)
+
+    assert index.count(terrain=terrain, skill=skill, max_price=max_price) == expected.sum()
+    assert index.rows(terrain=terrain, skill=skill, max_price=max_price).tolist() == np.flatnonzero(expected).tolist()
+
+
+def test_updated_patches_only_changed_bits(catalog):
+    index = FacetIndex(catalog)
+    changed = {
+        0: catalog.skis[0].replace(price_range="$950-1000"),
+        9: catalog.skis[9].replace(price_range="$100-150"),
+        2047: catalog.skis[2047].replace(terrain="park"),
+    }
+    new_catalog = catalog.with_updates(changed)
+    patched = index.updated(new_catalog, changed)
+    rebuilt = FacetIndex(new_catalog)
+
+    for facet, values in rebuilt.bitmaps.items():
+        for value, bitmap in values.items():
+            assert np.array_equal(patched.bitmaps[facet][value], bitmap), (facet, value)
+
+    # Untouched bitmaps are shared with the old index rather than copied
+    assert patched.bitmaps['skill']['beginner'] is index.bitmaps['skill']['beginner']
+
+
+def test_describe_count():
+    assert describe_count(1, "all_mountain") == "1 all-mountain ski"
+    assert describe_count(14, "powder", "advanced", 700) == "14 powder skis under $700 for advanced skiers"
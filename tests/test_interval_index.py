@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.interval_index import IntervalIndex
+
+
+@pytest.fixture(scope="module")
+def intervals():
+    rng = np.random.default_rng(4)
+    lows = rng.uniform(0, 100, 2000).round()
+    highs = lows + rng.uniform(0, 20, 2000).round()
+    lows[::97] = np.nan  # Rows with a missing bound never match
+    return lows, highs
+
+
+def scan(lows, highs, low, high):
+    low = -np.inf if low is None else low
+    high = np.inf if high is None else high
+    return ~np.isnan(lows) & (lows <= high) & (highs >= low)
+
+
+@pytest.mark.parametrize("low,high", [(None, None), (None, 30), (50, None), (40, 60), (55, 55), (120, 130), (-5, 0)])
+def test_overlap_matches_a_scan(intervals, low, high):
+    index = IntervalIndex(*intervals)
+    expected = scan(*intervals, low, high)
+
+    assert np.array_equal(index.overlap_mask(low, high), expected)
+    assert index.count(low, high) == expected.sum()
+
+
+def test_stabbing_includes_both_ends():
+    index = IntervalIndex(np.array([160.0, 170.0, 180.0]), np.array([170.0, 180.0, 190.0]))
+    assert index.stabbing_mask(170).tolist() == [True, True, False]
+
+
+def test_saved_orders_rebuild_the_same_index(intervals):
+    index = IntervalIndex(*intervals)
+    rebuilt = IntervalIndex.from_orders(*intervals, *index.orders())
+
+    for low, high in [(None, None), (10, 20), (75, None)]:
+        assert np.array_equal(rebuilt.overlap_mask(low, high), index.overlap_mask(low, high))
+
+
+def test_patched_index_matches_a_rebuild(intervals):
+    lows, highs = (values.copy() for values in intervals)
+    index = IntervalIndex(lows, highs)
+
+    rows = np.array([0, 5, 97, 500, 1999])
+    lows[rows] = [np.nan, 42.0, 10.0, 42.0, 99.0]
+    highs[rows] = [5.0, 42.0, 30.0, 60.0, 150.0]
+    patched = index.with_updates(lows, highs, rows)
+
+    for low, high in [(None, None), (None, 30), (42, 42), (40, 60), (100, None), (-5, 0)]:
+        expected = scan(lows, highs, low, high)
+        assert np.array_equal(patched.overlap_mask(low, high), expected)
+        assert patched.count(low, high) == expected.sum()
@@ -0,0 +1,58 @@
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from data.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+SYNONYMS = {
+    "terrain": {"all_mountain": ["all mountain", "everything"], "powder": ["pow", "deep snow"]},
+    "skill": {"advanced": ["black", "blacks"], "expert": ["double black"]},
+}
+
+
+def test_longest_phrase_wins():
+    matcher = KeywordMatcher(SYNONYMS)
+    assert matcher.match("I ski double black all day") == {"skill": "expert"}
+    assert matcher.match("mostly blacks") == {"skill": "advanced"}
+
+
+@pytest.mark.parametrize("text", ["all mountain", "All-Mountain", "all_mountain", "ALL  mountain"])
+def test_separators_and_case_are_normalized(text):
+    assert KeywordMatcher(SYNONYMS).match_field(text, "terrain") == "all_mountain"
+
+
+def test_matches_whole_words_only():
+    matcher = KeywordMatcher(SYNONYMS)
+    assert matcher.match("a powerful ski") == {}
+    assert matcher.match("spoon") == {}
+
+
+def test_first_mention_of_each_field_wins():
+    matcher = KeywordMatcher(SYNONYMS)
+    text = "Deep snow on blacks, but sometimes everything"
+
+    assert matcher.find_all(text) == [
+        ("terrain", "powder", "Deep snow"),
+        ("skill", "advanced", "blacks"),
+        ("terrain", "all_mountain", "everything"),
+    ]
+    assert matcher.match(text) == {"terrain": "powder", "skill": "advanced"}
+
+
+@pytest.mark.parametrize("text", [None, "", 42])
+def test_non_text_matches_nothing(text):
+    matcher = KeywordMatcher(SYNONYMS)
+    assert matcher.find_all(text) == []
+    assert matcher.match_field(text, "terrain") is None
+
+
+def test_shared_matcher_uses_the_config_tables():
+    matcher = get_keyword_matcher()
+    assert matcher is get_keyword_matcher()
+    assert matcher.match("a freeride ski for Whistler, I'm very advanced") == {
+        "terrain": "powder", "region": "canada", "skill": "expert",
+    }
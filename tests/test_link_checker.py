@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.catalog_engine import SkiCatalog
+from data.catalog_snapshot import open_snapshot, write_snapshot
+from data.synthetic_catalog import generate_skis
+from src.link_checker import LinkChecker, LinkHealthCache, LinkStatus, catalog_urls
+
+# Path -> status code for HEAD; GET always answers 200 so the HEAD fallback is visible
+ROUTES = {'/ok': 200, '/gone': 404, '/removed': 410, '/no-head': 405, '/blocked': 403, '/error': 503}
+
+
+class StubRetailer(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.send_response(ROUTES.get(self.path, 404))
+        self.end_headers()
+
+    def do_GET(self):
+        self.send_response(200 if self.path in ('/no-head', '/blocked') else ROUTES.get(self.path, 404))
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def retailer():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRetailer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_states_from_a_stub_retailer(retailer):
+    results = LinkChecker(timeout=2).check(f"{retailer}{path}" for path in ROUTES)
+    states = {url[len(retailer):]: result.state for url, result in results.items()}
+
+    assert states == {'/ok': "ok", '/gone': "dead", '/removed': "dead", '/no-head': "ok",
+                      '/blocked': "ok", '/error': "unknown"}
+
+
+def test_unreachable_host_is_unknown():
+    result = LinkChecker(timeout=0.5).check(["http://127.0.0.1:1/ski"])["http://127.0.0.1:1/ski"]
+    assert result.state == "unknown"
+    assert result.status_code is None
+    assert result.error
+
+
+def test_order_links_drops_dead_and_puts_verified_first():
+    cache = LinkHealthCache(ttl=60)
+    now = time.time()
+    cache.update({
+        "https://a.example/ski": LinkStatus("https://a.example/ski", "dead", 404, now),
+        "https://c.example/ski": LinkStatus("https://c.example/ski", "ok", 200, now),
+        "https://d.example/ski": LinkStatus("https://d.example/ski", "ok", 200, now - 120),
+    })
+    retailers = {"a": "https://a.example/ski", "b": "https://b.example/ski",
+                 "c": "https://c.example/ski", "d": "https://d.example/ski"}
+
+    assert cache.order_links(retailers) == [
+        ("c", "https://c.example/ski"), ("b", "https://b.example/ski"), ("d", "https://d.example/ski"),
+    ]
+
+
+def test_snapshot_urls_without_decoding_rows(tmp_path):
+    catalog = SkiCatalog(generate_skis(500, seed=5))
+    path = str(tmp_path / "catalog.snapshot")
+    write_snapshot(catalog, path)
+    snapshot = open_snapshot(path)
+
+    expected = list(dict.fromkeys(link.url for ski in catalog.skis for link in ski.links))
+    assert catalog_urls(catalog) == expected
+    assert catalog_urls(snapshot) == expected
+    assert not snapshot.skis._cache
+
+    # A patched row's own links replace the snapshot's
+    patched = snapshot.with_updates({0: snapshot.skis[0].replace(links=())})
+    assert set(catalog_urls(patched)) == {link.url for ski in patched.skis for link in ski.links}
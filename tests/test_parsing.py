@@ -0,0 +1,63 @@
+import math
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.parsing import parse_budget, parse_range
+from data.ski_database import get_ski_recommendations
+
+
+@pytest.mark.parametrize("text,bounds", [
+    ("under $500", (0, 500)),
+    ("$500 max", (0, 500)),
+    ("$500", (0, 500)),
+    ("no more than $500", (0, 500)),
+    ("not more than 700", (0, 700)),
+    ("not over $600", (0, 600)),
+    ("at most $700", (0, 700)),
+    ("up to 1k", (0, 1000)),
+    ("over $600", (600, math.inf)),
+    ("at least 400", (400, math.inf)),
+    ("$600+", (600, math.inf)),
+    ("$500 or more", (500, math.inf)),
+    ("$800 and up", (800, math.inf)),
+    ("from $600", (600, math.inf)),
+    ("$600-800", (600, 800)),
+    ("$1,200 to $1,500", (1200, 1500)),
+    ("between $600 and $800", (600, 800)),
+])
+def test_budget_text(text, bounds):
+    assert parse_budget(text) == bounds
+
+
+def test_approximate_budgets_get_a_window():
+    low, high = parse_budget("around $700")
+    assert low == pytest.approx(595) and high == pytest.approx(805)
+
+
+@pytest.mark.parametrize("budget", [None, "", "unknown", "no idea", True, 0])
+def test_no_usable_budget(budget):
+    assert parse_budget(budget) is None
+
+
+def test_structured_budgets():
+    assert parse_budget(650) == (0, 650)
+    assert parse_budget({'min': "$400", 'max': "$700"}) == (400, 700)
+    assert parse_budget({'min': "$400"}) == (400, math.inf)
+
+
+def test_ranges():
+    assert parse_range("$400-500") == (400, 500)
+    assert parse_range("180-150cm") == (150, 180)
+    assert parse_range("80mm") == (80, 80)
+    assert parse_range("n/a") is None
+
+
+def test_ceiling_budgets_filter_recommendations():
+    skis = get_ski_recommendations("intermediate", "all-mountain", "no more than $500")
+    assert skis
+    assert all(parse_range(ski.price_range)[0] <= 500 for ski in skis)
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.catalog_engine import SkiCatalog
+from data.catalog_manager import CatalogManager
+from data.price_feed import FeedIngestor, iter_feed
+from data.ski_model import SkiModel
+
+
+def ski(name, terrain, skill_level, price_range):
+    return SkiModel.from_dict({'name': name, 'price_range': price_range}, terrain, skill_level)
+
+
+def make_manager():
+    skis = [
+        ski("Head Kore 85", "all_mountain", "intermediate", "$550-650"),
+        ski("Head Kore 85", "powder", "advanced", "$550-650"),
+        ski("DPS Wailer 106", "powder", "advanced", "$900-1100"),
+    ]
+    return CatalogManager(lambda: SkiCatalog(skis))
+
+
+def test_bad_rows_are_counted_and_skipped(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text(
+        '{"name": "DPS Wailer 106", "price_low": "not a price"}\n'
+        '{not json\n'
+        '{"name": "Nobody Skis 1", "price_low": 100}\n'
+        '{"name": "DPS Wailer 106", "price_low": "$850", "price_high": "1,050"}\n'
+    )
+    manager = make_manager()
+
+    stats = FeedIngestor(manager, batch_size=2).ingest(iter_feed(str(feed)))
+
+    assert stats['rows_read'] == 4
+    assert stats['rows_invalid'] == 2
+    assert stats['rows_unknown'] == 1
+    assert stats['rows_changed'] == 1
+    assert manager.current().catalog.skis[2].price_range == "$850-1050"
+
+
+def test_every_row_of_a_model_is_updated():
+    manager = make_manager()
+
+    FeedIngestor(manager).apply_batch([{'name': "head kore 85", 'price_low': 499}])
+
+    catalog = manager.current().catalog
+    assert [ski.price_range for ski in catalog.skis[:2]] == ["$499", "$499"]
+    assert catalog.price_low[:2].tolist() == [499, 499]
+
+
+def test_batch_is_rebuilt_on_a_concurrent_publish():
+    manager = make_manager()
+    ingestor = FeedIngestor(manager)
+    reloaded = SkiCatalog([ski("DPS Wailer 106", "powder", "expert", "$900-1100")])
+
+    # A hot reload lands between the batch reading the catalog and publishing it
+    build_updates = ingestor._build_updates
+
+    def reload_first(catalog, rows, counts):
+        if manager.current().catalog is not reloaded:
+            manager.publish(reloaded)
+        return build_updates(catalog, rows, counts)
+
+    ingestor._build_updates = reload_first
+    ingestor.apply_batch([{'name': "DPS Wailer 106", 'price': "$800-950"}])
+
+    catalog = manager.current().catalog
+    assert len(catalog) == 1
+    assert catalog.skis[0].skill_level == "expert"
+    assert catalog.skis[0].price_range == "$800-950"
+    assert ingestor.stats['rows_read'] == 1
+
+
+def test_updates_share_untouched_columns_and_indexes():
+    catalog = SkiCatalog([ski(f"Ski {i}", "powder", "advanced", f"${500 + i}-{600 + i}") for i in range(20)])
+
+    renamed = catalog.with_updates({3: catalog.skis[3].replace(description="New graphics")})
+    assert renamed.price_index is catalog.price_index
+    assert renamed.price_low is catalog.price_low
+
+    repriced = catalog.with_updates({3: catalog.skis[3].replace(price_range="$100-200")})
+    assert repriced.spec_indexes['waist'] is catalog.spec_indexes['waist']
+    assert repriced.price_index is not catalog.price_index
+    assert np.flatnonzero(repriced.mask(budget=(0, 300))).tolist() == [3]
+    assert np.flatnonzero(catalog.mask(budget=(0, 300))).tolist() == []
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.parsing import parse_budget
+from data.sizing import parse_physical_stats
+from src.profile_extractor import extract_confident_profile, extract_profile
+
+
+@pytest.mark.parametrize("text", [
+    "Do you have the Kore in 170cm for powder?",
+    "I want powder skis around 180cm long",
+])
+def test_ski_lengths_are_not_confident_heights(text):
+    assert extract_profile(text).fields['physical_stats'].confidence < 0.8
+    assert extract_confident_profile(text, threshold=0.8) is None
+
+
+@pytest.mark.parametrize("text,stats", [
+    ("I'm 180cm and advanced", "180cm"),
+    ("I am 5'10\" tall", "178cm"),
+    ("my height is 175cm", "175cm"),
+    ("6 foot tall intermediate", "183cm"),
+    ("175cm, 80kg", "175cm, 80kg"),
+])
+def test_heights_with_context_are_confident(text, stats):
+    field = extract_profile(text).fields['physical_stats']
+    assert (field.value, field.confidence) == (stats, 0.9)
+
+
+def test_snow_depth_is_not_a_height():
+    assert parse_physical_stats("We got 24 feet of snow") == (None, None)
+    assert 'physical_stats' not in extract_profile("We got 24 feet of snow").fields
+
+
+@pytest.mark.parametrize("text,bounds", [
+    ("between $600 and $800", (600, 800)),
+    ("between 1.2k and 1,500 dollars", (1200, 1500)),
+    ("$600-800", (600, 800)),
+    ("under $500", (0, 500)),
+])
+def test_budget_ranges(text, bounds):
+    assert parse_budget(text) == bounds
+
+
+def test_extracted_between_budget_parses_as_a_range():
+    field = extract_profile("Looking for powder skis between $600 and $800").fields['budget']
+    assert field.value == "between $600 and $800"
+    assert parse_budget(field.value) == (600, 800)
+
+
+@pytest.mark.parametrize("text,budget,bounds", [
+    ("carving skis, $500 or more", "$500 or more", (500, float("inf"))),
+    ("powder skis $800 and up", "$800 and up", (800, float("inf"))),
+    ("something from $600", "from $600", (600, float("inf"))),
+    ("park skis, not over $400", "not over $400", (0, 400)),
+    ("at most $700 for carving", "at most $700", (0, 700)),
+    ("no more than $500 please", "no more than $500", (0, 500)),
+])
+def test_budget_spans_keep_their_direction(text, budget, bounds):
+    field = extract_profile(text).fields['budget']
+    assert field.value == budget
+    assert parse_budget(field.value) == bounds
+
+
+@pytest.mark.parametrize("text,gender,confidence", [
+    ("I'm an intermediate woman looking for carving skis", "womens", 0.9),
+    ("women's powder skis under $800", "womens", 0.9),
+    ("I'm a guy, advanced, powder", "mens", 0.9),
+    ("oh man, I love powder", "mens", 0.5),
+])
+def test_gender(text, gender, confidence):
+    field = extract_profile(text).fields['gender']
+    assert (field.value, field.confidence) == (gender, confidence)
+
+
+def test_confident_gender_reaches_the_analysis():
+    analysis = extract_confident_profile("I'm an intermediate woman looking for carving skis", threshold=0.8)
+    assert analysis == {'skill_level': "intermediate", 'terrain_preference': "carving", 'gender': "womens"}
+
+
+@pytest.mark.parametrize("text", [
+    "Advanced powder skier with bad knees",
+    "Intermediate carving, recovering from an ACL injury",
+    "Something forgiving for groomers, I'm intermediate",
+    "Carving skis for my wife, she's intermediate",
+    "My husband and I ski blues, mostly groomers",
+    "I'm a woman but want men's carving skis, intermediate",
+])
+def test_needs_and_unmapped_gender_go_to_the_model(text):
+    extraction = extract_profile(text)
+    assert extraction.needs_model
+    assert extract_confident_profile(text, threshold=0.5) is None
@@ -0,0 +1,76 @@
+import os
+import sys
+import threading
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import ski_database
+from data.query_cache import RecommendationCache
+
+
+def test_hits_misses_and_lru_eviction():
+    cache = RecommendationCache(max_entries=2)
+    computed = []
+
+    def compute(value):
+        return lambda: computed.append(value) or value
+
+    assert cache.get_or_compute("a", compute(1)) == 1
+    assert cache.get_or_compute("b", compute(2)) == 2
+    assert cache.get_or_compute("a", compute(99)) == 1   # hit, and "a" becomes most recent
+    assert cache.get_or_compute("c", compute(3)) == 3    # evicts "b"
+    assert cache.get_or_compute("b", compute(4)) == 4
+
+    assert computed == [1, 2, 3, 4]
+    assert cache.stats() == {
+        'hits': 1, 'misses': 4, 'evictions': 2, 'size': 2, 'max_entries': 2, 'hit_rate': 0.2,
+    }
+
+
+def test_clear_drops_entries_but_keeps_counters():
+    cache = RecommendationCache()
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("a", lambda: 1)
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get_or_compute("a", lambda: 2) == 2
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_concurrent_lookups_agree():
+    cache = RecommendationCache(max_entries=8)
+    results = []
+
+    def worker():
+        for i in range(200):
+            results.append(cache.get_or_compute(i % 10, lambda i=i: (i % 10) * 2) == (i % 10) * 2)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(results) and len(cache) <= 8
+    assert cache.stats()['hits'] + cache.stats()['misses'] == 800
+
+
+def test_recommendations_are_memoized_until_the_catalog_is_republished():
+    manager = ski_database.get_catalog_manager()
+    cache = ski_database.RECOMMENDATION_CACHE
+    cache.clear()
+
+    first = ski_database.get_ski_recommendations("intermediate", "powder", "$400-800")
+    hits = cache.hits
+    again = ski_database.get_ski_recommendations("intermediate", "deep snow", "$400-800")
+    assert cache.hits == hits + 1
+    assert [ski.name for ski in again] == [ski.name for ski in first]
+
+    republished = manager.publish(manager.current().catalog)
+    assert len(cache) == 0
+
+    fresh = ski_database.get_ski_recommendations("intermediate", "powder", "$400-800")
+    assert fresh.catalog_version == republished.version
+    assert [ski.name for ski in fresh] == [ski.name for ski in first]
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.catalog_engine import SkiCatalog
+from data.similarity import KDTree, SimilarityIndex
+from data.ski_model import SkiModel
+from data.synthetic_catalog import generate_skis
+
+
+def brute_force(points, point, k, exclude=None):
+    distances = np.sqrt(((points - point) ** 2).sum(axis=1))
+    if exclude is not None:
+        distances[exclude] = np.inf
+    rows = np.argsort(distances, kind="stable")[:k]
+    return distances[rows]
+
+
+@pytest.mark.parametrize("leaf_size", [1, 16])
+def test_kd_tree_matches_brute_force(leaf_size):
+    rng = np.random.default_rng(8)
+    points = rng.normal(size=(1500, 4))
+    tree = KDTree(points, leaf_size=leaf_size)
+
+    for row in range(0, 1500, 50):
+        query = points[row] + rng.normal(scale=0.1, size=4)
+        found = tree.query(query, k=5)
+        np.testing.assert_allclose([distance for distance, _ in found], brute_force(points, query, 5))
+        assert [distance for distance, _ in found] == sorted(distance for distance, _ in found)
+
+        excluded = tree.query(points[row], k=3, exclude=row)
+        assert row not in [neighbour for _, neighbour in excluded]
+        np.testing.assert_allclose([distance for distance, _ in excluded],
+                                   brute_force(points, points[row], 3, exclude=row))
+
+
+def test_kd_tree_edge_cases():
+    assert KDTree(np.empty((0, 3))).query(np.zeros(3)) == []
+
+    # Identical points can't be split; the whole block stays one leaf
+    tree = KDTree(np.ones((40, 2)), leaf_size=4)
+    assert len(tree.query(np.ones(2), k=50)) == 40
+
+
+def test_resolves_names_and_finds_neighbours():
+    catalog = SkiCatalog(generate_skis(400, seed=2))
+    index = SimilarityIndex(catalog)
+    name = catalog.names()[123]
+
+    row = index.resolve(name.lower())
+    assert catalog.names()[row] == name
+    assert index.resolve("") is None
+
+    neighbours = index.nearest(row, k=3)
+    assert len(neighbours) == 3 and row not in neighbours
+
+
+def test_resolve_picks_the_best_of_many_shared_tokens():
+    skis = [{'name': f"Atomic Bent {waist}", 'price_range': "$600"} for waist in range(80, 120)]
+    skis.append({'name': "Atomic Maverick 95 Ti", 'price_range': "$700"})
+    catalog = SkiCatalog([SkiModel.from_dict(ski, "powder", "advanced") for ski in skis])
+    index = SimilarityIndex(catalog)
+
+    assert catalog.names()[index.resolve("my atomic maverick 95")] == "Atomic Maverick 95 Ti"
+    assert catalog.names()[index.resolve("Atomic Bent 110")] == "Atomic Bent 110"
+    assert index.resolve("Salomon QST") is None
+
+
+def test_resolve_remembers_each_mention():
+    index = SimilarityIndex(SkiCatalog(generate_skis(50, seed=4)))
+    name = index.catalog.names()[7]
+
+    assert index.resolve(name) == 7
+    index._names[7] = "renamed"
+    assert index.resolve(name.upper()) == 7
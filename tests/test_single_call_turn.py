@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from src.ski_expert import RECOMMENDATIONS_PLACEHOLDER, SkiExpert
+
+PROFILE = {'skill_level': "advanced", 'terrain_preference': "powder"}
+PREFIX = json.dumps({'profile': PROFILE, 'reply': "Great é! Try "}, ensure_ascii=False)[:-2]
+
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeClient:
+    """Answers the first completion from a script of chunks, and any later ones as a plain reply"""
+
+    def __init__(self, *chunks, error=None):
+        self.chunks, self.error = chunks, error
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, stream=False, **request):
+        self.calls += 1
+        if self.calls > 1:
+            if request.get('response_format'):
+                return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(PROFILE)))])
+            return iter([chunk("Two-call reply here.")]) if stream else SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="Two-call reply here."))])
+        return self.stream()
+
+    def stream(self):
+        for text in self.chunks:
+            yield chunk(text)
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture(autouse=True)
+def single_call_mode(monkeypatch):
+    monkeypatch.setattr(Config, "TURN_MODE", "single")
+    monkeypatch.setattr(Config, "LOCAL_PROFILE_EXTRACTION", False)
+
+
+def run_turn(client):
+    sent = []
+    reply, recommendations = SkiExpert().generate_response("Something deep and fun", client, sent.append)
+    return "".join(sent), reply, recommendations
+
+
+def test_complete_stream_fills_the_placeholder():
+    completion = json.dumps({'profile': PROFILE, 'reply': f"Try {RECOMMENDATIONS_PLACEHOLDER}!"})
+    client = FakeClient(*(completion[i:i + 3] for i in range(0, len(completion), 3)))
+
+    sent, reply, recommendations = run_turn(client)
+    assert sent == reply
+    assert RECOMMENDATIONS_PLACEHOLDER not in reply and recommendations
+    assert recommendations[0].name in reply
+    assert client.calls == 1
+
+
+def test_stream_cut_off_mid_placeholder_is_not_flushed_or_followed_by_a_fallback():
+    client = FakeClient(PREFIX, "[RECOMMENDATI")
+
+    sent, reply, recommendations = run_turn(client)
+    assert sent == reply == "Great é! Try "
+    assert recommendations
+    assert client.calls == 1
+
+
+def test_stream_failing_after_tokens_keeps_the_streamed_reply():
+    client = FakeClient(PREFIX, "we go", error=ConnectionError("stream dropped"))
+
+    sent, reply, _ = run_turn(client)
+    assert sent == reply == "Great é! Try we go"
+    assert client.calls == 1
+
+
+def test_stream_failing_before_any_token_falls_back_to_two_calls():
+    client = FakeClient('{"profile": {"skill', error=ConnectionError("stream dropped"))
+
+    sent, reply, _ = run_turn(client)
+    assert sent == reply == "Two-call reply here."
+    assert client.calls == 3
+
+
+def test_prompt_is_not_built_from_the_previous_profile(monkeypatch):
+    completion = json.dumps({'profile': PROFILE, 'reply': f"Try {RECOMMENDATIONS_PLACEHOLDER}!"})
+    client = FakeClient(completion)
+    expert = SkiExpert()
+    expert.user_profile = {'skill_level': "beginner", 'terrain_preference': "carving",
+                           'physical_stats': "170cm", 'current_skis': "Head Kore 99"}
+    monkeypatch.setattr(expert, "build_reply_context", lambda: pytest.fail("looked up the old profile's skis"))
+
+    sent = []
+    reply, recommendations = expert.generate_response("Actually I'm advanced and want powder", client, sent.append)
+    assert "".join(sent) == reply
+    assert recommendations and recommendations[0].name in reply
+    assert client.calls == 1
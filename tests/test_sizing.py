@@ -0,0 +1,74 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.ski_model import SkiModel
+from data.sizing import (describe_sizing, fit_lengths, parse_physical_stats, size_skis,
+                         target_length_for, target_length_window)
+
+
+@pytest.mark.parametrize("stats, height, weight", [
+    ("5'10\" and 170 lbs", 177.8, 77.1),
+    ("5 ft 10 in, 77kg", 177.8, 77.0),
+    ("178cm, 75kg", 178.0, 75.0),
+    ("1.78 m", 178.0, None),
+    ({'height': "6'", 'weight': "200 pounds"}, 182.9, 90.7),
+    ("about average", None, None),
+    (None, None, None),
+])
+def test_parse_physical_stats(stats, height, weight):
+    parsed_height, parsed_weight = parse_physical_stats(stats)
+    assert parsed_height == pytest.approx(height, abs=0.1) if height else parsed_height is None
+    assert parsed_weight == pytest.approx(weight, abs=0.1) if weight else parsed_weight is None
+
+
+def test_window_moves_with_skill_terrain_and_weight():
+    assert target_length_window(180) == (168, 178)
+    assert target_length_window(180, skill_level="expert") == (178, 190)
+    assert target_length_window(180, terrain="powder") == (173, 183)
+    assert target_length_window(180, weight_kg=100) == (173, 183)
+    assert target_length_window(180, weight_kg=60) == (163, 173)
+    assert target_length_window(180, weight_kg=80) == (168, 178)
+
+
+def test_target_length_needs_a_height():
+    assert target_length_for("180cm", "advanced") == 180
+    assert target_length_for("180 lbs") is None
+
+
+def test_fit_lengths_steps_through_each_range():
+    fits = fit_lengths(
+        np.array([160, 170, 150, np.nan]),
+        np.array([181, 177, 160, np.nan]),
+        (165, 180),
+    )
+    # 160, 167, 174, 181 / 170, 177 / 150, 157, 160 / unknown
+    assert fits == [[167, 174], [170, 177], [], []]
+
+
+def test_fit_lengths_edge_cases():
+    assert fit_lengths(np.array([]), np.array([]), (160, 170)) == []
+    assert fit_lengths(np.array([170]), np.array([170]), (160, 175)) == [[170]]
+    assert fit_lengths(np.array([np.nan]), np.array([np.nan]), (160, 175)) == [[]]
+
+
+def test_size_skis_and_describe():
+    skis = [
+        SkiModel.from_dict({'name': "Nordica Enforcer 94", 'specs': {'length': "165-186cm"}}, "all_mountain", "advanced"),
+        SkiModel.from_dict({'name': "Kids Ski", 'specs': {'length': "100-130cm"}}, "all_mountain", "beginner"),
+    ]
+    assert size_skis(skis, "no idea") is None
+
+    sizing = size_skis(skis, "180cm", "advanced")
+    assert sizing['window'] == (174, 185)
+    assert sizing['sizes'] == [(skis[0], [179]), (skis[1], [])]
+
+    text = describe_sizing(sizing)
+    assert "between 174 and 185cm" in text
+    assert "The Nordica Enforcer 94 comes in 179cm for you." in text
+    assert "The Kids Ski doesn't come in a length in that range." in text
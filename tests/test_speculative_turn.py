@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from src.ski_expert import SkiExpert
+
+PROFILE = {'skill_level': "advanced", 'terrain_preference': "powder"}
+
+
+def message(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeClient:
+    """
+    Answers analysis calls with a fixed profile and reply calls with numbered
+    drafts. The first reply waits until the analysis has been asked for, so the
+    test sees both calls in flight together.
+    """
+
+    def __init__(self, analysis, draft_error=None):
+        self.analysis = analysis
+        self.draft_error = draft_error
+        self.replies = []
+        self.analysis_started = threading.Event()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, stream=False, **request):
+        if request.get('response_format'):
+            self.analysis_started.set()
+            return message(json.dumps(self.analysis))
+
+        self.replies.append(request['messages'][1]['content'])
+        if len(self.replies) == 1:
+            assert self.analysis_started.wait(5)
+            if self.draft_error:
+                raise self.draft_error
+        text = f"Reply {len(self.replies)}."
+        return iter([chunk("Reply "), chunk(f"{len(self.replies)}.")]) if stream else message(text)
+
+
+@pytest.fixture(autouse=True)
+def speculative_mode(monkeypatch):
+    monkeypatch.setattr(Config, "TURN_MODE", "speculative")
+    monkeypatch.setattr(Config, "LOCAL_PROFILE_EXTRACTION", False)
+
+
+def expert_with(profile):
+    expert = SkiExpert()
+    expert.user_profile = dict(profile)
+    return expert
+
+
+def test_draft_is_kept_when_the_analysis_changes_nothing_that_matters():
+    expert = expert_with(PROFILE)
+    client = FakeClient({'skill_level': "advanced", 'terrain_preference': "deep snow", 'questions_to_ask': ["?"]})
+    sent = []
+
+    reply, recommendations = expert.generate_response("Tell me more", client, sent.append)
+    assert reply == "Reply 1." and sent == [reply]
+    assert len(client.replies) == 1
+    assert recommendations == expert.generate_recommendations(PROFILE)
+    assert expert.conversation_history[-1]['assistant'] == reply
+
+
+def test_reply_is_rewritten_when_the_recommendation_inputs_change():
+    expert = expert_with({'skill_level': "beginner", 'terrain_preference': "carving"})
+    client = FakeClient(PROFILE)
+    sent = []
+
+    reply, recommendations = expert.generate_response("I'm advanced and want powder", client, sent.append)
+    assert reply == "Reply 2." and "".join(sent) == reply
+    assert len(client.replies) == 2
+    assert '"skill_level": "beginner"' in client.replies[0]
+    assert '"skill_level": "advanced"' in client.replies[1]
+    assert recommendations == expert.generate_recommendations(PROFILE)
+
+
+def test_a_failed_draft_falls_back_to_the_full_reply():
+    expert = expert_with(PROFILE)
+    client = FakeClient(PROFILE, draft_error=ConnectionError("draft dropped"))
+
+    reply, recommendations = expert.generate_response("Tell me more", client)
+    assert reply == "Reply 2."
+    assert recommendations
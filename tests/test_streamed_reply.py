@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ski_expert import RECOMMENDATIONS_PLACEHOLDER, StreamedReply, placeholder_split
+
+COMPLETION = json.dumps({
+    'profile': {'skill_level': "intermediate", 'terrain_preference': "powder"},
+    'reply': 'Great "powder" day! Café ☃ 🎿\nTry these: ' + RECOMMENDATIONS_PLACEHOLDER,
+    'trailing': "ignored",
+})
+
+
+def stream(text, chunk_size):
+    reply = StreamedReply()
+    decoded = "".join(reply.feed(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size))
+    return reply, decoded
+
+
+@pytest.mark.parametrize("ascii_only", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_reply_decodes_across_any_chunking(chunk_size, ascii_only):
+    text = json.dumps(json.loads(COMPLETION), ensure_ascii=ascii_only)
+    reply, decoded = stream(text, chunk_size)
+
+    assert decoded == json.loads(text)['reply']
+    assert reply.done
+    assert reply.profile == {'skill_level': "intermediate", 'terrain_preference': "powder"}
+
+
+def test_no_reply_key_yet():
+    reply = StreamedReply()
+    assert reply.feed('{"profile": {"skill_level": "beg') == ""
+    assert reply.profile is None and not reply.done
+
+
+def test_placeholder_split_holds_back_partial_placeholders():
+    assert placeholder_split("Try these: [RECOMM") == len("Try these: ")
+    assert placeholder_split("Try these: [") == len("Try these: ")
+    assert placeholder_split("Prices in [brackets]") == len("Prices in [brackets]")
+    assert placeholder_split("") == 0
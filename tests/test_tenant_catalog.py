@@ -0,0 +1,71 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import ski_database
+from data.catalog_engine import SkiCatalog
+from data.facets import FacetIndex
+from data.parsing import parse_range
+from data.synthetic_catalog import generate_skis
+from data.tenant_catalog import TenantCatalog, TenantOverlay, TenantRegistry
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    skis = generate_skis(2000, seed=13)
+    # The same model listed again under another terrain and skill level
+    skis.append(skis[5].replace(terrain="powder", skill_level="expert"))
+    skis.append(skis[6].replace(terrain="park", skill_level="beginner"))
+    return SkiCatalog(skis)
+
+
+@pytest.fixture(scope="module")
+def view(catalog):
+    names = catalog.names()
+    overlay = TenantOverlay(
+        "shop",
+        prices={names[5]: "$199", names[40]: "$1500-1600", names[41]: "call us"},
+        excluded=[names[6], names[77]],
+        links={names[5]: {"Shop": "https://shop.example/skis/five"}},
+    )
+    return TenantCatalog(catalog, overlay)
+
+
+def test_overlays_apply_to_every_row_of_a_model(catalog, view):
+    assert view.skis[5].price_range == view.skis[2000].price_range == "$199"
+    assert view.skis[2000].retailers == {"Shop": "https://shop.example/skis/five"}
+    assert view.excluded_rows.tolist() == [6, 77, 2001]
+    assert view.visible_rows([2001, 3, 6, 4]).tolist() == [3, 4]
+
+
+@pytest.mark.parametrize("max_price", [None, 500, 700, 1550, 5000])
+@pytest.mark.parametrize("filters", [{}, {'terrain': "powder"}, {'skill': "advanced", 'waist_band': "90-99mm"}])
+def test_facet_bitmap_matches_a_scan_of_the_tenant_view(catalog, view, max_price, filters):
+    facets = FacetIndex(catalog)
+    rows = facets.bitmap_rows(view.facet_bitmap(facets, max_price=max_price, **filters))
+
+    base_rows = set(facets.rows(**filters).tolist())
+    expected = [
+        row for row in range(len(catalog))
+        if row in base_rows and row not in view.excluded_rows
+        and (max_price is None or (parse_range(view.skis[row].price_range) or (np.nan,))[0] < max_price)
+    ]
+    assert rows.tolist() == expected
+
+
+def test_replacing_an_overlay_invalidates_memoized_recommendations(monkeypatch):
+    monkeypatch.setattr(ski_database, "_TENANT_REGISTRY", TenantRegistry())
+    registry = ski_database.get_tenant_registry()
+
+    registry.add(TenantOverlay("shop"))
+    before = ski_database.get_ski_recommendations("intermediate", "all-mountain", tenant="shop")
+    assert before
+
+    registry.add(TenantOverlay("shop", excluded=[before[0].name]))
+    after = ski_database.get_ski_recommendations("intermediate", "all-mountain", tenant="shop")
+    assert before[0].name not in [ski.name for ski in after]